@@ -4,7 +4,14 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 from pathlib import Path
+from urllib.parse import quote
 
+from kit.auth.hashers import get_password_hashers
+from kit.conf.database import (
+    get_databases,
+    get_module_databases,
+    get_replica_aliases,
+)
 from kit.conf.environ import get_environ
 from kit.conf.parser import ConfigParser
 
@@ -37,6 +44,11 @@ THIRD_PARTY_APPS = [
 ]
 
 MIDDLEWARE = [
+    "kit.middleware.request_id.RequestIDMiddleware",
+    "kit.middleware.replicas.ReplicaRoutingMiddleware",
+    "kit.middleware.queries.QueryInstrumentationMiddleware",
+    "kit.middleware.metrics.MetricsMiddleware",
+    "kit.middleware.profiler.SamplingProfilerMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -47,6 +59,43 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Repetitions of a query shape in a single request, after which it is reported as N+1 candidate
+QUERY_N_PLUS_ONE_THRESHOLD = 3
+
+# Expose query stats as response headers, instead of logging them
+QUERY_STATS_HEADERS = DEBUG
+
+# Folder shared by all worker processes to aggregate metrics
+METRICS_DIR = BASE_DIR / "logs" / "metrics"
+
+# Minimum seconds between two dumps of a worker's metrics
+METRICS_FLUSH_INTERVAL = 5.0
+
+# Addresses or networks allowed to scrape `/metrics/`
+METRICS_ALLOWED_IPS = env.METRICS_ALLOWED_IPS
+
+# Sampling profiler for slow requests, see `kit.middleware.profiler`
+PROFILER_ENABLED = False
+PROFILER_THRESHOLD_MS = 1000
+PROFILER_SAMPLE_RATE = 0.0
+PROFILER_ROUTES: list[str] = []
+PROFILER_INTERVAL_MS = 5
+PROFILER_DIR = BASE_DIR / "logs" / "profiles"
+
+# Query params used by `kit.views.serializers` for pagination, search & sort
+PAGE_LIMIT_PARAM = "limit"
+PAGE_NUMBER_PARAM = "page"
+SEARCH_FIELD_PARAM = "search_field"
+SEARCH_QUERY_PARAM = "search"
+SORT_QUERY_PARAM = "sort"
+
+# Streaming exports of `kit.views.export`, `?export=csv|ndjson|json`
+EXPORT_FORMAT_PARAM = "export"
+EXPORT_CHUNK_SIZE = 2000
+
+# Rows validated and created together by `kit.views.imports.BulkImporter`
+IMPORT_CHUNK_SIZE = 1000
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -67,18 +116,81 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "config.wsgi.application"
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": env.DATABASE_NAME,
-        "USER": env.DATABASE_USER,
-        "PASSWORD": env.DATABASE_PASS,
-        "HOST": env.DATABASE_HOST,
-        "PORT": str(env.DATABASE_PORT),
-        "AUTO_CREATE": True,
-    }
+# Persistent connections (or a pool) & health checks, see `kit.conf.database.get_connection_options`
+DATABASES = get_databases(env, parser.parsed_yaml_config)
+
+# Modules with their own database (`database` of the module `settings` in `berserk-config.yaml`)
+DATABASE_MODULES = get_module_databases(parser.parsed_yaml_config)
+
+# Reads of `GET` handlers go to the replicas, clients that wrote stick to the primary for a few seconds
+DATABASE_REPLICAS = get_replica_aliases(env)
+DATABASE_REPLICA_PIN_SECONDS = env.DATABASE_REPLICA_PIN_SECONDS
+DATABASE_ROUTERS = ["kit.db.routers.ModuleRouter", "kit.db.routers.ReplicaRouter"]
+
+# Shared cache (e.g. second tier of `modules.core.services.dropdown.DropdownService`), per process if not configured
+CACHES = {
+    "default": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": env.CACHE_URL,
+        }
+        if env.CACHE_URL
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    )
 }
 
+SESSION_ENGINE = "django.contrib.sessions.backends.%s" % env.SESSION_BACKEND
+
+# Authenticated users are cached per session by `kit.auth.authentication.CachedSessionAuthentication`
+USER_CACHE_TTL = 30
+USER_CACHE_MAX_SIZE = 10000
+
+# Circle roles of users, cached per process by `modules.circle.cache.CircleAccessCache`
+CIRCLE_ACCESS_CACHE_TTL = 30
+CIRCLE_ACCESS_CACHE_MAX_SIZE = 10000
+
+# Lifetime (in seconds) of the signed tokens of `kit.auth.tokens`
+TOKEN_ACCESS_TTL = 15 * 60
+TOKEN_REFRESH_TTL = 7 * 24 * 60 * 60
+
+# Counters of `kit.views.throttling`, per process unless shared through `CACHES`
+THROTTLE_BACKEND = "cache" if env.CACHE_URL else "memory"
+
+# Pending OTPs of `modules.core.services.otp.OTPService`, `memory` is only suitable for a single process
+OTP_STORE = "redis" if env.CACHE_URL else "database"
+OTP_STORE_URL = env.CACHE_URL
+
+# Background tasks of `kit.tasks`, run inline unless a worker (`manage.py runworker`) consumes them from rabbitmq
+TASK_BROKER = env.TASK_BROKER
+TASK_BROKER_URL = "amqp://%s:%s@%s:%s/%%2F" % (
+    quote(env.RABBITMQ_USER, safe=""),
+    quote(env.RABBITMQ_PASS, safe=""),
+    env.RABBITMQ_HOST,
+    env.RABBITMQ_PORT,
+)
+TASK_QUEUE = "berserk"
+TASK_PREFETCH = 10
+TASK_RESULT_TTL = 60 * 60
+# Relay outbox rows right after their transaction commits, `manage.py relayoutbox` picks up rows whose relay failed
+OUTBOX_DISPATCH_ON_COMMIT = True
+
+# Change counters of `kit.cache.lookup.LookupTableCache`s
+LOOKUP_CACHE_VERSION_MODEL = "core.CacheVersion"
+
+# Preferred hasher first, existing hashes of the others are upgraded on login by `kit.auth.backends.PooledModelBackend`
+PASSWORD_HASHERS = get_password_hashers(env.PASSWORD_HASHER)
+PASSWORD_HASHING_POLICY = {
+    "argon2": {"time_cost": 2, "memory_cost": 64 * 1024, "parallelism": 1},
+    "scrypt": {"work_factor": 2**14, "block_size": 8, "parallelism": 1},
+    "pbkdf2": {"iterations": 870000},
+}
+# Size of the process pool hashing passwords (`kit.auth.hashing.PasswordHashingPool`), per worker, 0 hashes inline
+PASSWORD_HASHING_WORKERS = env.PASSWORD_HASHING_WORKERS
+
+AUTHENTICATION_BACKENDS = ["kit.auth.backends.PooledModelBackend"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -98,8 +210,11 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "kit.views.openapi.BaseSchema",
     "EXCEPTION_HANDLER": "kit.views.exceptions.exception_handler",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.SessionAuthentication",
+        "kit.auth.authentication.TokenAuthentication",
+        "kit.auth.authentication.CachedSessionAuthentication",
     ],
+    # `X-Forwarded-For` is only trusted for the proxies in front of the app, the client address otherwise
+    "NUM_PROXIES": env.NUM_PROXIES,
 }
 
 SPECTACULAR_SETTINGS = {
@@ -127,6 +242,40 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Uploads, see `kit.storage.backends`. With nginx, `MEDIA_URL` must be an `internal` location aliased to `MEDIA_ROOT`
+MEDIA_ROOT = BASE_DIR / "media"
+MEDIA_URL = "/media/"
+
+STORAGES = {
+    "default": (
+        {
+            "BACKEND": "kit.storage.backends.S3Storage",
+            "OPTIONS": {
+                "bucket": env.STORAGE_BUCKET,
+                "endpoint_url": env.STORAGE_ENDPOINT_URL,
+                "region": env.STORAGE_REGION,
+                "access_key": env.STORAGE_ACCESS_KEY,
+                "secret_key": env.STORAGE_SECRET_KEY,
+            },
+        }
+        if env.STORAGE_BACKEND == "s3"
+        else {
+            "BACKEND": "kit.storage.backends.LocalStorage",
+            "OPTIONS": {"sendfile": env.STORAGE_SENDFILE},
+        }
+    ),
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# Lifetime (in seconds) of download URLs, presigned by s3 or signed for `STORAGE_DOWNLOAD_URL` by the local storage
+STORAGE_URL_TTL = 60 * 60
+STORAGE_DOWNLOAD_URL = "/v1/core/download/"
+
+# Largest file accepted by `modules.core.services.upload.UploadService`, uploads above 2.5MB are spooled to disk by django
+UPLOAD_MAX_SIZE = 50 * 1024 * 1024
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "core.User"
@@ -4,18 +4,33 @@ NON_PROD_APPS = [
 
 ALLOWED_HOSTS = ["*"]
 
+# emails (e.g. OTPs) are printed instead of sent
+EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        "request_id": {
+            "()": "kit.log.filters.RequestIDFilter",
+        },
+        "debug_sampling": {
+            "()": "kit.log.filters.DebugSamplingFilter",
+            "rate": 1.0,
+        },
+    },
     "formatters": {
         "simple": {
             "format": "{levelname} {message}",
             "style": "{",
         },
         "verbose": {
-            "format": "{levelname} {asctime} {module} {message}",
+            "format": "{levelname} {asctime} {module} {request_id} {message}",
             "style": "{",
         },
+        "json": {
+            "()": "kit.log.formatters.JSONFormatter",
+        },
     },
     "handlers": {
         "console": {
@@ -24,13 +39,17 @@ LOGGING = {
         },
         "error_file": {
             "level": "ERROR",
-            "class": "logging.FileHandler",
+            "()": "kit.log.handlers.QueuedRotatingFileHandler",
             "filename": "logs/errors.log",
+            "formatter": "json",
+            "filters": ["request_id"],
         },
         "debug_file": {
             "level": "DEBUG",
-            "class": "logging.FileHandler",
+            "()": "kit.log.handlers.QueuedRotatingFileHandler",
             "filename": "logs/debug.log",
+            "formatter": "json",
+            "filters": ["request_id", "debug_sampling"],
         },
     },
     "loggers": {
@@ -39,6 +58,11 @@ LOGGING = {
             "level": "DEBUG",
             "propagate": True,
         },
+        "kit": {
+            "handlers": ["console", "debug_file"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
@@ -1 +1,52 @@
 ALLOWED_HOSTS: list[str] = []
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "filters": {
+        "request_id": {
+            "()": "kit.log.filters.RequestIDFilter",
+        },
+        "debug_sampling": {
+            "()": "kit.log.filters.DebugSamplingFilter",
+            "rate": 0.01,
+        },
+    },
+    "formatters": {
+        "json": {
+            "()": "kit.log.formatters.JSONFormatter",
+        },
+    },
+    # every worker process writes and rotates its own files (`%(pid)s`), as rollovers are not coordinated
+    # across processes. Ship them with a collector matching `logs/*.log`, which also removes the ones of old pids.
+    "handlers": {
+        "error_file": {
+            "level": "ERROR",
+            "()": "kit.log.handlers.QueuedRotatingFileHandler",
+            "filename": "logs/errors.%(pid)s.log",
+            "formatter": "json",
+            "filters": ["request_id"],
+        },
+        "app_file": {
+            "level": "INFO",
+            "()": "kit.log.handlers.QueuedRotatingFileHandler",
+            "filename": "logs/app.%(pid)s.log",
+            "maxBytes": 50 * 1024 * 1024,
+            "backupCount": 10,
+            "formatter": "json",
+            "filters": ["request_id", "debug_sampling"],
+        },
+    },
+    "loggers": {
+        "django.request": {
+            "handlers": ["error_file", "app_file"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        "kit": {
+            "handlers": ["error_file", "app_file"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
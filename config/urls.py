@@ -5,7 +5,10 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from kit.metrics.views import metrics_view
+
 urlpatterns = [
+    path("metrics/", metrics_view, name="metrics"),
     path("schema/", SpectacularAPIView.as_view(), name="schema"),
     path("schema/redoc/", SpectacularRedocView.as_view(url_name="schema")),
     path("schema/swagger/", SpectacularSwaggerView.as_view()),
@@ -0,0 +1,34 @@
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+
+from .hashing import PasswordHashingPool
+
+
+class PooledModelBackend(ModelBackend):
+    """`django.contrib.auth.backends.ModelBackend`, verifying passwords in `kit.auth.hashing.PasswordHashingPool`.
+    Hashes not matching the current hasher policy are transparently upgraded on a successful login.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # hash anyway, so that response times do not reveal existing users
+            PasswordHashingPool.make_password(password)
+            return None
+
+        is_correct, must_update = PasswordHashingPool.verify_password(
+            password, user.password
+        )
+        if not is_correct or not self.user_can_authenticate(user):
+            return None
+        if must_update:
+            user.password = PasswordHashingPool.make_password(password)
+            user.save(update_fields=["password"])
+        return user
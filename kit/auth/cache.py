@@ -0,0 +1,94 @@
+import copy
+import time
+from threading import Lock
+from typing import Any, Dict, Set, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal
+
+
+class UserCache:
+    """Short TTL, per process cache of authenticated users keyed by session key.
+    Used by `kit.auth.authentication.CachedSessionAuthentication`, so the hot path does not fetch the user.
+    - Entries of a user are dropped on save and delete, all entries are dropped on bulk writes (e.g. soft delete).
+    - Other processes pick up changes within `USER_CACHE_TTL` seconds.
+    """
+
+    _lock = Lock()
+    _entries: Dict[str, Tuple[float, Any]] = {}
+    _sessions: Dict[Any, Set[str]] = {}
+
+    @classmethod
+    def get(cls, session_key: str) -> Any | None:
+        entry = cls._entries.get(session_key)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            cls.discard(session_key)
+            return None
+        # handlers may mutate `request.user`, never share the cached instance
+        return copy.copy(user)
+
+    @classmethod
+    def set(cls, session_key: str, user: Any) -> None:
+        ttl = getattr(settings, "USER_CACHE_TTL", 30)
+        max_size = getattr(settings, "USER_CACHE_MAX_SIZE", 10000)
+        with cls._lock:
+            if len(cls._entries) >= max_size:
+                # oldest first, dicts preserve insertion order
+                oldest = next(iter(cls._entries))
+                cls._discard(oldest)
+            cls._entries[session_key] = (time.monotonic() + ttl, copy.copy(user))
+            cls._sessions.setdefault(user.pk, set()).add(session_key)
+
+    @classmethod
+    def discard(cls, session_key: str) -> None:
+        with cls._lock:
+            cls._discard(session_key)
+
+    @classmethod
+    def _discard(cls, session_key: str) -> None:
+        entry = cls._entries.pop(session_key, None)
+        if entry is not None:
+            sessions = cls._sessions.get(entry[1].pk, set())
+            sessions.discard(session_key)
+            if not sessions:
+                cls._sessions.pop(entry[1].pk, None)
+
+    @classmethod
+    def invalidate_user(cls, instance=None, **kwargs) -> None:
+        if instance is None:
+            return
+        with cls._lock:
+            for session_key in list(cls._sessions.get(instance.pk, ())):
+                cls._discard(session_key)
+
+    @classmethod
+    def invalidate_session(cls, request=None, **kwargs) -> None:
+        session = getattr(request, "session", None)
+        if session is not None and session.session_key is not None:
+            cls.discard(session.session_key)
+
+    @classmethod
+    def clear(cls, **kwargs) -> None:
+        with cls._lock:
+            cls._entries.clear()
+            cls._sessions.clear()
+
+    @classmethod
+    def connect(cls, *bulk_signals: Signal) -> None:
+        "Connect the invalidation receivers, `bulk_signals` are signals of bulk writes to the user model. Called from `ready`."
+        user_model = apps.get_model(settings.AUTH_USER_MODEL)
+        post_save.connect(
+            cls.invalidate_user, sender=user_model, dispatch_uid="kit:user_cache"
+        )
+        post_delete.connect(
+            cls.invalidate_user, sender=user_model, dispatch_uid="kit:user_cache"
+        )
+        user_logged_out.connect(cls.invalidate_session, dispatch_uid="kit:user_cache")
+        for signal in bulk_signals:
+            signal.connect(cls.clear, sender=user_model, dispatch_uid="kit:user_cache")
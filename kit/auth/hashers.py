@@ -0,0 +1,62 @@
+from importlib.util import find_spec
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+from .types import PasswordHasherType
+
+
+def get_policy(name: PasswordHasherType) -> Dict[str, Any]:
+    "Parameters of a hasher, from the `PASSWORD_HASHING_POLICY` setting. Read once, when django loads the hashers."
+    return getattr(settings, "PASSWORD_HASHING_POLICY", {}).get(name, {})
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    "`django.contrib.auth.hashers.PBKDF2PasswordHasher`, with `iterations` from the policy."
+
+    def __init__(self) -> None:
+        policy = get_policy("pbkdf2")
+        self.iterations = policy.get("iterations", self.iterations)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):  # type: ignore[name-defined]
+    "`django.contrib.auth.hashers.ScryptPasswordHasher`, with `work_factor`, `block_size` & `parallelism` from the policy."
+
+    def __init__(self) -> None:
+        policy = get_policy("scrypt")
+        self.work_factor: int = policy.get("work_factor", self.work_factor)
+        self.block_size: int = policy.get("block_size", self.block_size)
+        self.parallelism: int = policy.get("parallelism", self.parallelism)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    "`django.contrib.auth.hashers.Argon2PasswordHasher`, with `time_cost`, `memory_cost` & `parallelism` from the policy."
+
+    def __init__(self) -> None:
+        policy = get_policy("argon2")
+        self.time_cost = policy.get("time_cost", self.time_cost)
+        self.memory_cost = policy.get("memory_cost", self.memory_cost)
+        self.parallelism = policy.get("parallelism", self.parallelism)
+
+
+HASHERS: Dict[PasswordHasherType, str] = {
+    "argon2": "kit.auth.hashers.Argon2PasswordHasher",
+    "scrypt": "kit.auth.hashers.ScryptPasswordHasher",
+    "pbkdf2": "kit.auth.hashers.PBKDF2PasswordHasher",
+}
+
+
+def get_password_hashers(preferred: PasswordHasherType) -> List[str]:
+    """`PASSWORD_HASHERS` setting, with `preferred` first.
+    The other hashers still verify existing passwords, which get rehashed with `preferred` on the next login.
+    Argon2 is left out, if `argon2-cffi` is not installed.
+    """
+    available = [
+        name for name in HASHERS if name != "argon2" or find_spec("argon2") is not None
+    ]
+    if preferred not in available:
+        preferred = "scrypt"
+    return [HASHERS[preferred]] + [
+        HASHERS[name] for name in available if name != preferred
+    ]
@@ -0,0 +1,126 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import Callable, List, Tuple, TypeVar
+
+import django
+from django.conf import settings
+from django.contrib.auth import hashers
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _initialize_worker() -> None:
+    # workers start from a fresh interpreter, and load `DJANGO_SETTINGS_MODULE`
+    if not settings.configured:
+        django.setup()
+
+
+def _make_password(password: str) -> str:
+    return hashers.make_password(password)
+
+
+def _verify_password(password: str, encoded: str) -> Tuple[bool, bool]:
+    "Same as `django.contrib.auth.hashers.check_password`, returning whether the hash must be upgraded instead of calling a setter."
+    if password is None or not hashers.is_password_usable(encoded):
+        return False, False
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False, False
+
+    preferred = hashers.get_hasher("default")
+    hasher_changed = hasher.algorithm != preferred.algorithm
+    must_update = hasher_changed or preferred.must_update(encoded)
+    is_correct = hasher.verify(password, encoded)
+    # same amount of work for correct and incorrect passwords, if the work factor changed
+    if not is_correct and not hasher_changed and must_update:
+        hasher.harden_runtime(password, encoded)
+    return is_correct, is_correct and must_update
+
+
+class PasswordHashingPool:
+    """Process pool for password hashing, so that the (deliberately expensive) hashing does not hold the GIL of a worker
+    and concurrent logins are spread over all cores.
+    - Sized by the `PASSWORD_HASHING_WORKERS` setting, `0` hashes inline.
+    - Created lazily per process, and recreated after a fork or a crash of the pool.
+    - Workers are started by a fork server (spawned where it is unavailable), forking a threaded web worker
+      could deadlock the child on a lock held by another thread.
+    """
+
+    _lock = Lock()
+    _executor: ProcessPoolExecutor | None = None
+    _pid: int | None = None
+
+    @classmethod
+    def get_executor(cls) -> ProcessPoolExecutor | None:
+        workers = getattr(settings, "PASSWORD_HASHING_WORKERS", 0)
+        if not workers:
+            return None
+        if cls._executor is None or cls._pid != os.getpid():
+            with cls._lock:
+                if cls._executor is None or cls._pid != os.getpid():
+                    cls._executor = ProcessPoolExecutor(
+                        max_workers=workers,
+                        mp_context=cls.get_context(),
+                        initializer=_initialize_worker,
+                    )
+                    cls._pid = os.getpid()
+        return cls._executor
+
+    @staticmethod
+    def get_context():
+        methods = multiprocessing.get_all_start_methods()
+        return multiprocessing.get_context(
+            "forkserver" if "forkserver" in methods else "spawn"
+        )
+
+    @classmethod
+    def _run(cls, func: Callable[..., T], *args) -> T:
+        executor = cls.get_executor()
+        if executor is None:
+            return func(*args)
+        try:
+            return executor.submit(func, *args).result()
+        except BrokenProcessPool:
+            logger.warning("Password hashing pool crashed, hashing inline.")
+            cls.shutdown()
+            return func(*args)
+
+    @classmethod
+    def make_password(cls, password: str) -> str:
+        return cls._run(_make_password, password)
+
+    @classmethod
+    def make_passwords(cls, passwords: List[str]) -> List[str]:
+        "Hash many passwords (e.g. of fixtures) over all the workers of the pool."
+        executor = cls.get_executor()
+        if executor is None:
+            return [_make_password(password) for password in passwords]
+        try:
+            return list(executor.map(_make_password, passwords, chunksize=16))
+        except BrokenProcessPool:
+            logger.warning("Password hashing pool crashed, hashing inline.")
+            cls.shutdown()
+            return [_make_password(password) for password in passwords]
+
+    @classmethod
+    def verify_password(cls, password: str, encoded: str) -> Tuple[bool, bool]:
+        """
+        Returns:
+            Tuple[bool, bool]: whether the password is correct, and whether its hash must be upgraded to the current policy
+        """
+        return cls._run(_verify_password, password, encoded)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls._lock:
+            if cls._executor is not None and cls._pid == os.getpid():
+                cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+            cls._pid = None
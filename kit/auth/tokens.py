@@ -0,0 +1,112 @@
+import time
+from typing import Any
+
+from django.apps import apps
+from django.conf import settings
+from django.core import signing
+from django.utils.crypto import constant_time_compare, salted_hmac
+from rest_framework.exceptions import AuthenticationFailed
+
+from .types import TokenKindType, TokenPairType, TokenPayloadType
+
+SALT = "kit.auth.tokens.%s"
+
+
+class InvalidToken(Exception):
+    "Raised when a token is malformed, tampered, expired or of the wrong kind."
+
+
+def password_fingerprint(user) -> str:
+    "Short digest of the password hash, so that a password change revokes refresh tokens."
+    return salted_hmac(SALT % "fingerprint", user.password).hexdigest()[:16]
+
+
+def issue_token(user, kind: TokenKindType) -> str:
+    ttl = (
+        getattr(settings, "TOKEN_ACCESS_TTL", 15 * 60)
+        if kind == "access"
+        else getattr(settings, "TOKEN_REFRESH_TTL", 7 * 24 * 60 * 60)
+    )
+    payload: TokenPayloadType = {
+        "uid": user.pk,
+        "typ": getattr(user, "type", 0),
+        "kind": kind,
+        "exp": int(time.time()) + ttl,
+        "fp": password_fingerprint(user) if kind == "refresh" else "",
+    }
+    # HMAC-SHA256 signed with `SECRET_KEY`, the salt separates access from refresh tokens
+    return signing.dumps(payload, salt=SALT % kind, compress=True)
+
+
+def issue_token_pair(user) -> TokenPairType:
+    return {
+        "access": issue_token(user, "access"),
+        "refresh": issue_token(user, "refresh"),
+        "expires_in": getattr(settings, "TOKEN_ACCESS_TTL", 15 * 60),
+    }
+
+
+def verify_token(token: str, kind: TokenKindType) -> TokenPayloadType:
+    """Verify the signature and expiry of a token, without any db hit.
+
+    Raises:
+        InvalidToken: if the token can not be trusted
+    """
+    try:
+        payload: TokenPayloadType = signing.loads(token, salt=SALT % kind)
+    except signing.BadSignature:
+        raise InvalidToken("Token is invalid!")
+    if payload.get("kind") != kind:
+        raise InvalidToken("Token is invalid!")
+    if payload["exp"] < time.time():
+        raise InvalidToken("Token has expired!")
+    return payload
+
+
+def refresh_token_pair(token: str) -> TokenPairType:
+    """Issue a new pair for a refresh token.
+    Unlike access tokens, this loads the user, to honour deletion and password changes.
+
+    Raises:
+        InvalidToken: if the token can not be trusted, or its user no longer exists
+    """
+    payload = verify_token(token, "refresh")
+    user_model = apps.get_model(settings.AUTH_USER_MODEL)
+    user = user_model._default_manager.filter(pk=payload["uid"]).first()
+    if user is None or not constant_time_compare(
+        payload["fp"], password_fingerprint(user)
+    ):
+        raise InvalidToken("Token is invalid!")
+    return issue_token_pair(user)
+
+
+class TokenUser:
+    """User of a verified access token, built from its payload only.
+    `pk`, `id` and `type` are available without any query, other attributes lazily load the actual user.
+
+    Raises:
+        AuthenticationFailed: on attribute access, if the user was deleted since the token was issued
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, payload: TokenPayloadType) -> None:
+        self.pk = self.id = payload["uid"]
+        self.type = payload["typ"]
+        self._user: Any | None = None
+
+    def __getattr__(self, name: str):
+        if name.startswith("__") or name == "_user":
+            raise AttributeError(name)
+        if self._user is None:
+            user_model = apps.get_model(settings.AUTH_USER_MODEL)
+            try:
+                self._user = user_model._default_manager.get(pk=self.pk)
+            except user_model.DoesNotExist:
+                raise AuthenticationFailed("User no longer exists!")
+        return getattr(self._user, name)
+
+    def __str__(self) -> str:
+        return "TokenUser(%s)" % self.pk
@@ -0,0 +1,19 @@
+from typing import Literal, TypedDict
+
+TokenKindType = Literal["access", "refresh"]
+
+PasswordHasherType = Literal["argon2", "scrypt", "pbkdf2"]
+
+
+class TokenPayloadType(TypedDict):
+    uid: int
+    typ: int
+    kind: TokenKindType
+    exp: int
+    fp: str  # password fingerprint, checked on refresh only
+
+
+class TokenPairType(TypedDict):
+    access: str
+    refresh: str
+    expires_in: int
@@ -0,0 +1,168 @@
+import fnmatch
+import statistics
+import subprocess
+import time
+from abc import ABC, abstractmethod
+from importlib import import_module
+from typing import Dict, List, Type
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import module_has_submodule
+
+from kit.middleware.queries import QueryStats
+
+from .types import (
+    BenchmarkOptionsType,
+    BenchmarkRegressionType,
+    BenchmarkReportType,
+    BenchmarkResultType,
+)
+
+BENCHMARKS_MODULE_NAME = "benchmarks"
+
+# metrics of a result, compared across reports (lower is better)
+COMPARED_METRICS = ("median_ms", "p95_ms", "queries_per_op")
+
+
+class BenchmarkCase(ABC):
+    """This class is used as a blueprint for a single benchmark of a framework hot path.
+    Modules export their cases as a `benchmarks` list in their `benchmarks.py`.
+
+    Attributes:
+    - `name`: unique name of the benchmark, used for comparing reports
+    - `iterations`: number of timed runs, can be overridden by `BenchmarkOptionsType.iterations`
+    - `options`: dataset options shared by all the cases
+    - `extra`: additional case specific figures, reported along with the timings
+    """
+
+    name: str = ""
+    iterations: int = 20
+    options: BenchmarkOptionsType
+    extra: Dict[str, float]
+
+    def __init__(self, options: BenchmarkOptionsType) -> None:
+        self.options = options
+        self.extra = {}
+
+    def setup(self) -> None:
+        "Seed the dataset. Runs inside a transaction which is rolled back after the case."
+        pass
+
+    @abstractmethod
+    def run(self) -> None:
+        "A single timed iteration."
+
+    def teardown(self, timings: List[float]) -> None:
+        "Runs after the timed iterations, with the timings (in seconds) of each iteration."
+        pass
+
+
+class BenchmarkRunner:
+    """Discovers and runs `BenchmarkCase`s of all installed modules.
+
+    Attributes:
+    - `options`: dataset options passed to every case
+    - `pattern`: optional glob pattern to select cases by name
+    """
+
+    options: BenchmarkOptionsType
+    pattern: str | None
+
+    def __init__(self, options: BenchmarkOptionsType, pattern: str | None = None):
+        self.options = options
+        self.pattern = pattern
+
+    def discover(self) -> List[Type[BenchmarkCase]]:
+        cases: List[Type[BenchmarkCase]] = []
+        for app_config in apps.get_app_configs():
+            if not module_has_submodule(app_config.module, BENCHMARKS_MODULE_NAME):
+                continue
+            module = import_module("%s.%s" % (app_config.name, BENCHMARKS_MODULE_NAME))
+            for case in getattr(module, "benchmarks", []):
+                if self.pattern is None or fnmatch.fnmatch(case.name, self.pattern):
+                    cases.append(case)
+        return cases
+
+    def run(self) -> BenchmarkReportType:
+        return {
+            "commit": get_commit(),
+            "created_at": timezone.now().isoformat(),
+            "options": self.options,
+            "results": [self.run_case(case) for case in self.discover()],
+        }
+
+    def run_case(self, case_class: Type[BenchmarkCase]) -> BenchmarkResultType:
+        case = case_class(self.options)
+        iterations = self.options["iterations"] or case.iterations
+        timings: List[float] = []
+        stats = QueryStats(threshold=0)
+
+        with transaction.atomic():
+            case.setup()
+            for _ in range(self.options["warmup"]):
+                case.run()
+            with connection.execute_wrapper(stats):
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    case.run()
+                    timings.append(time.perf_counter() - start)
+            case.teardown(timings)
+            transaction.set_rollback(True)
+
+        ordered = sorted(timings)
+        return {
+            "name": case.name,
+            "iterations": iterations,
+            "min_ms": ordered[0] * 1000,
+            "mean_ms": statistics.fmean(ordered) * 1000,
+            "median_ms": statistics.median(ordered) * 1000,
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+            "max_ms": ordered[-1] * 1000,
+            "ops_per_sec": len(ordered) / sum(ordered) if sum(ordered) else 0.0,
+            "queries_per_op": stats.count / iterations,
+            "db_ms_per_op": stats.duration * 1000 / iterations,
+            "extra": case.extra,
+        }
+
+
+def compare(
+    previous: BenchmarkReportType, current: BenchmarkReportType, threshold: float
+) -> List[BenchmarkRegressionType]:
+    """Compare two reports and list the metrics which got worse by more than `threshold` (a ratio, e.g. 0.1 for 10%).
+
+    Returns:
+        List[BenchmarkRegressionType]: regressions of the current report
+    """
+    previous_results = {result["name"]: result for result in previous["results"]}
+    regressions: List[BenchmarkRegressionType] = []
+    for result in current["results"]:
+        baseline = previous_results.get(result["name"])
+        if baseline is None:
+            continue
+        for metric in COMPARED_METRICS:
+            before, after = baseline[metric], result[metric]  # type: ignore[literal-required]
+            if before <= 0:
+                continue
+            change = (after - before) / before
+            if change > threshold:
+                regressions.append(
+                    {
+                        "name": result["name"],
+                        "metric": metric,
+                        "previous": before,
+                        "current": after,
+                        "change": change,
+                    }
+                )
+    return regressions
+
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
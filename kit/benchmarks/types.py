@@ -0,0 +1,38 @@
+from typing import Dict, List, TypedDict
+
+
+class BenchmarkOptionsType(TypedDict):
+    size: int
+    depth: int
+    fan_out: int
+    iterations: int | None
+    warmup: int
+
+
+class BenchmarkResultType(TypedDict):
+    name: str
+    iterations: int
+    min_ms: float
+    mean_ms: float
+    median_ms: float
+    p95_ms: float
+    max_ms: float
+    ops_per_sec: float
+    queries_per_op: float
+    db_ms_per_op: float
+    extra: Dict[str, float]
+
+
+class BenchmarkReportType(TypedDict):
+    commit: str | None
+    created_at: str
+    options: BenchmarkOptionsType
+    results: List[BenchmarkResultType]
+
+
+class BenchmarkRegressionType(TypedDict):
+    name: str
+    metric: str
+    previous: float
+    current: float
+    change: float
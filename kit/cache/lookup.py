@@ -0,0 +1,148 @@
+import logging
+import time
+from collections.abc import Mapping
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Iterator, Sequence
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal
+
+logger = logging.getLogger(__name__)
+
+
+def get_version_model():
+    "Model holding the change counters, `LOOKUP_CACHE_VERSION_MODEL` setting (like `AUTH_USER_MODEL`)."
+    return apps.get_model(
+        getattr(settings, "LOOKUP_CACHE_VERSION_MODEL", "core.CacheVersion")
+    )
+
+
+class LookupTableCache(Mapping):
+    """Read only, per process mapping of a small reference table (roles, types, statuses etc.).
+    - Loaded lazily on first use, never at import time.
+    - Versioned by a db side change counter, bumped in the same transaction as the change.
+      Workers check the counter (a single indexed row) at most every `check_interval` seconds, and reload only if it moved.
+    - Falls back to an empty mapping, if the model is not installed or its table does not exist yet (e.g. before migrations),
+      and retries on the next check.
+
+    Attributes:
+    - `model`: "app_label.ModelName" of the reference table
+    - `name`: name of the change counter, defaults to `model`
+    - `fields`: fields fetched for every row
+    - `key`: builds the key of a row
+    - `value`: builds the value of a row
+    - `check_interval`: maximum staleness (in seconds) of a worker, after a change in another worker
+    """
+
+    model: str
+    name: str
+    fields: Sequence[str]
+    key: Callable[[Dict[str, Any]], Hashable]
+    value: Callable[[Dict[str, Any]], Any]
+    check_interval: float
+
+    def __init__(
+        self,
+        model: str,
+        *,
+        fields: Sequence[str],
+        key: Callable[[Dict[str, Any]], Hashable],
+        value: Callable[[Dict[str, Any]], Any],
+        name: str | None = None,
+        check_interval: float = 5.0,
+    ) -> None:
+        self.model = model
+        self.name = name or model
+        self.fields = fields
+        self.key = key
+        self.value = value
+        self.check_interval = check_interval
+
+        self._lock = Lock()
+        self._table: Dict[Hashable, Any] | None = None
+        self._version: int | None = None
+        self._checked_at = 0.0
+
+    @property
+    def table(self) -> Dict[Hashable, Any]:
+        if (
+            self._table is not None
+            and time.monotonic() - self._checked_at < self.check_interval
+        ):
+            return self._table
+
+        with self._lock:
+            self._checked_at = time.monotonic()
+            version = self._get_version()
+            # without a counter, fall back to reloading on every check
+            if self._table is None or version is None or version != self._version:
+                table = self._load()
+                # the fallback is not versioned, so that the next check retries
+                self._table = table if table is not None else {}
+                self._version = version if table is not None else None
+            return self._table
+
+    def _get_version(self) -> int | None:
+        try:
+            # savepoint, so a missing table does not abort the surrounding transaction
+            with transaction.atomic():
+                return (
+                    get_version_model()
+                    .objects.filter(name=self.name)
+                    .values_list("version", flat=True)
+                    .first()
+                ) or 0
+        except (LookupError, DatabaseError) as exc:
+            logger.warning("Change counter for %s is unavailable: %s", self.name, exc)
+            return None
+
+    def _load(self) -> Dict[Hashable, Any] | None:
+        try:
+            with transaction.atomic():
+                rows = apps.get_model(self.model).objects.values(*self.fields)
+                return {self.key(row): self.value(row) for row in rows}
+        except (LookupError, DatabaseError) as exc:
+            logger.warning("Lookup table %s is unavailable: %s", self.model, exc)
+            return None
+
+    def refresh(self) -> None:
+        "Force a version check on the next access."
+        self._checked_at = 0.0
+
+    def bump(self, **kwargs) -> None:
+        "Increment the change counter, in the transaction of the change itself. Can be used as a signal receiver."
+        model = get_version_model()
+        try:
+            with transaction.atomic():
+                updated = model.objects.filter(name=self.name).update(
+                    version=F("version") + 1
+                )
+                if not updated:
+                    model.objects.create(name=self.name, version=1)
+        except IntegrityError:  # created concurrently
+            model.objects.filter(name=self.name).update(version=F("version") + 1)
+        self.refresh()
+
+    def connect(self, *signals: Signal) -> None:
+        "Bump the counter on `post_save`, `post_delete` and any additional `signals` of the model."
+        try:
+            sender = apps.get_model(self.model)
+        except LookupError:  # not installed, nothing can change
+            return
+        for signal in (post_save, post_delete, *signals):
+            signal.connect(
+                self.bump, sender=sender, dispatch_uid="lookup:%s" % self.name
+            )
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self.table[key]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.table)
+
+    def __len__(self) -> int:
+        return len(self.table)
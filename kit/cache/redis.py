@@ -0,0 +1,88 @@
+import time
+from threading import Lock
+from typing import Any, Dict, Tuple
+
+FAKE_SCHEME = "fake://"
+
+_clients: Dict[str, Any] = {}
+_lock = Lock()
+
+
+class FakeRedis:
+    """In process stand in for the subset of `redis.Redis` used by the kit, for tests and local development.
+    Values are returned as bytes and expire lazily, like redis.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._data: Dict[str, Tuple[bytes, float | None]] = {}
+
+    def _get(self, name: str) -> bytes | None:
+        entry = self._data.get(name)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[name]
+            return None
+        return entry[0]
+
+    def get(self, name: str) -> bytes | None:
+        with self._lock:
+            return self._get(name)
+
+    def set(
+        self,
+        name: str,
+        value: Any,
+        ex: int | None = None,
+        px: int | None = None,
+        nx: bool = False,
+    ) -> bool | None:
+        with self._lock:
+            if nx and self._get(name) is not None:
+                return None
+            expires_at = None
+            if ex is not None:
+                expires_at = time.monotonic() + ex
+            elif px is not None:
+                expires_at = time.monotonic() + px / 1000
+            if not isinstance(value, bytes):
+                value = str(value).encode()
+            self._data[name] = (value, expires_at)
+            return True
+
+    def getdel(self, name: str) -> bytes | None:
+        with self._lock:
+            value = self._get(name)
+            self._data.pop(name, None)
+            return value
+
+    def delete(self, *names: str) -> int:
+        deleted = 0
+        with self._lock:
+            for name in names:
+                if self._get(name) is not None:
+                    del self._data[name]
+                    deleted += 1
+        return deleted
+
+    def flushdb(self) -> bool:
+        with self._lock:
+            self._data.clear()
+            return True
+
+
+def get_redis_client(url: str):
+    """Shared client of a redis url, `fake://<name>` returns a `FakeRedis`.
+    `redis` is an optional dependency (also needed by django's `RedisCache`), imported only for real urls.
+    """
+    if url not in _clients:
+        with _lock:
+            if url not in _clients:
+                if url.startswith(FAKE_SCHEME):
+                    _clients[url] = FakeRedis()
+                else:
+                    import redis
+
+                    _clients[url] = redis.Redis.from_url(url)
+    return _clients[url]
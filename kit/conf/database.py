@@ -0,0 +1,120 @@
+from importlib.util import find_spec
+from typing import Any, Dict, List
+
+import django
+from django.core.exceptions import ImproperlyConfigured
+
+from .environ import BaseEnviron
+from .types import ModuleConfig
+
+
+def get_connection_options(env: BaseEnviron) -> Dict[str, Any]:
+    """Connection reuse settings of a database.
+    - `db_pool`: a psycopg3 connection pool per process (django 5.1+), sized by `db_pool_min_size` / `db_pool_max_size`,
+      requests wait up to `db_pool_timeout` seconds for a free connection.
+    - otherwise: persistent connections, kept for `db_conn_max_age` seconds (`0` closes them after every request).
+    - `db_conn_health_checks`: check reused connections before a request, instead of failing it.
+    """
+    if not env.DATABASE_POOL:
+        return {
+            "CONN_MAX_AGE": env.DATABASE_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": env.DATABASE_CONN_HEALTH_CHECKS,
+            "OPTIONS": {},
+        }
+
+    if django.VERSION < (5, 1) or find_spec("psycopg_pool") is None:
+        raise ImproperlyConfigured(
+            "`db_pool` requires django 5.1+ with `psycopg[pool]` installed."
+        )
+    return {
+        # pooled connections are returned to the pool at the end of every request
+        "CONN_MAX_AGE": 0,
+        "CONN_HEALTH_CHECKS": env.DATABASE_CONN_HEALTH_CHECKS,
+        "OPTIONS": {
+            "pool": {
+                "min_size": env.DATABASE_POOL_MIN_SIZE,
+                "max_size": env.DATABASE_POOL_MAX_SIZE,
+                "timeout": env.DATABASE_POOL_TIMEOUT,
+            }
+        },
+    }
+
+
+def get_replica_aliases(env: BaseEnviron) -> List[str]:
+    return ["replica_%s" % index for index in range(len(env.DATABASE_REPLICAS))]
+
+
+def get_module_databases(config: dict) -> Dict[str, str]:
+    """`DATABASE_MODULES` setting, module path -> database alias of every module with its own `database`.
+    The alias is the name of the module.
+    """
+    modules = ModuleConfig.validate_python(config.get("modules", {}))
+    return {
+        "modules.%s" % name: name
+        for name, module in modules.items()
+        if "database" in module.get("settings", {})
+    }
+
+
+def get_databases(env: BaseEnviron, config: dict) -> Dict[str, Dict[str, Any]]:
+    """`DATABASES` setting, built from `berserk-config.yaml`.
+    - `default`: the primary database, from the global `settings`
+    - `replica_<index>`: read replicas of the primary, `db_replicas` of the global `settings`
+    - `<module>`: own database of a module, `database` of the module `settings`
+
+    Raises:
+        ImproperlyConfigured: if the database of a module is not the primary one (e.g. another `name` or `host`).
+            Every model relates to `core.User` (`ModelBase.added_by`), foreign keys can not cross databases,
+            so modules can only live in their own `schema` of the primary database.
+    """
+    default = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": env.DATABASE_NAME,
+        "USER": env.DATABASE_USER,
+        "PASSWORD": env.DATABASE_PASS,
+        "HOST": env.DATABASE_HOST,
+        "PORT": str(env.DATABASE_PORT),
+        "AUTO_CREATE": True,
+        **get_connection_options(env),
+    }
+    databases = {"default": default}
+    for alias, replica in zip(get_replica_aliases(env), env.DATABASE_REPLICAS):
+        databases[alias] = {
+            **default,
+            "NAME": replica.NAME or env.DATABASE_NAME,
+            "USER": replica.USER or env.DATABASE_USER,
+            "PASSWORD": replica.PASS or env.DATABASE_PASS,
+            "HOST": replica.HOST,
+            "PORT": str(replica.PORT),
+            # created & migrated through the primary, tests read the primary as well
+            "AUTO_CREATE": False,
+            "TEST": {"MIRROR": "default"},
+        }
+
+    modules = ModuleConfig.validate_python(config.get("modules", {}))
+    for module_path, alias in get_module_databases(config).items():
+        database = modules[alias]["settings"]["database"]
+        if (
+            database.get("name", env.DATABASE_NAME) != env.DATABASE_NAME
+            or database.get("host", env.DATABASE_HOST) != env.DATABASE_HOST
+            or database.get("port", env.DATABASE_PORT) != env.DATABASE_PORT
+        ):
+            raise ImproperlyConfigured(
+                "`database` of module `%s` must be a `schema` of the primary database, "
+                "its models have foreign keys to other modules." % alias
+            )
+        options = dict(default["OPTIONS"])
+        if "schema" in database:
+            # `public` keeps the tables of other modules reachable, for relations
+            options["options"] = "-c search_path=%s,public" % database["schema"]
+        databases[alias] = {
+            **default,
+            "NAME": database.get("name", env.DATABASE_NAME),
+            "HOST": database.get("host", env.DATABASE_HOST),
+            "PORT": str(database.get("port", env.DATABASE_PORT)),
+            "USER": database.get("user", env.DATABASE_USER),
+            "PASSWORD": database.get("password", env.DATABASE_PASS),
+            "SCHEMA": database.get("schema"),
+            "OPTIONS": options,
+        }
+    return databases
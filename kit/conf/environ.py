@@ -1,5 +1,11 @@
+import importlib.util
+from typing import List, Literal, Self
+
 from django.conf import settings
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from kit.auth.types import PasswordHasherType
+from kit.storage.types import SendfileType
 
 REPLACEMENTS = {"DATABASE": "DB", "RABBITMQ": "rmq"}
 
@@ -12,6 +18,18 @@ def alias_generator(string: str) -> str:
     return alias
 
 
+class ReplicaEnviron(BaseModel):
+    """A read replica of the primary database, `name`, `user` & `pass` default to the primary ones."""
+
+    model_config = ConfigDict(alias_generator=alias_generator)
+
+    HOST: str
+    PORT: int = 5432
+    NAME: str | None = None
+    USER: str | None = None
+    PASS: str | None = None
+
+
 class BaseEnviron(BaseModel):
     model_config = ConfigDict(alias_generator=alias_generator)
 
@@ -22,10 +40,46 @@ class BaseEnviron(BaseModel):
     DATABASE_PASS: str
     DATABASE_HOST: str
     DATABASE_PORT: int
+    DATABASE_CONN_MAX_AGE: int = 60
+    DATABASE_CONN_HEALTH_CHECKS: bool = True
+    DATABASE_POOL: bool = False
+    DATABASE_POOL_MIN_SIZE: int = 2
+    DATABASE_POOL_MAX_SIZE: int = 10
+    DATABASE_POOL_TIMEOUT: float = 10.0
+    DATABASE_REPLICAS: List[ReplicaEnviron] = []
+    DATABASE_REPLICA_PIN_SECONDS: int = 5
     RABBITMQ_HOST: str
     RABBITMQ_PORT: int
     RABBITMQ_USER: str
     RABBITMQ_PASS: str
+    CACHE_URL: str | None = None
+    NUM_PROXIES: int = 0
+    METRICS_ALLOWED_IPS: List[str] = ["127.0.0.1", "::1"]
+    TASK_BROKER: Literal["eager", "amqp"] = "eager"
+    SESSION_BACKEND: Literal["db", "cached_db", "signed_cookies"] = "cached_db"
+    PASSWORD_HASHER: PasswordHasherType = "pbkdf2"
+    PASSWORD_HASHING_WORKERS: int = 2
+    STORAGE_BACKEND: Literal["local", "s3"] = "local"
+    STORAGE_SENDFILE: SendfileType | None = None
+    STORAGE_BUCKET: str | None = None
+    STORAGE_ENDPOINT_URL: str | None = None
+    STORAGE_REGION: str | None = None
+    STORAGE_ACCESS_KEY: str | None = None
+    STORAGE_SECRET_KEY: str | None = None
+
+    @model_validator(mode="after")
+    def check_task_broker(self) -> Self:
+        "The amqp broker runs tasks in other processes, results are only visible to the web processes through a shared cache."
+        if self.TASK_BROKER == "amqp":
+            if importlib.util.find_spec("pika") is None:
+                raise ValueError(
+                    "`pika` must be installed to use the amqp task broker."
+                )
+            if self.CACHE_URL is None:
+                raise ValueError(
+                    "The amqp task broker needs a shared cache (`cache_url`) to track task results."
+                )
+        return self
 
 
 def get_environ(config: dict[str, str] | None) -> BaseEnviron:
@@ -10,8 +10,23 @@ class SubModuleType(TypedDict):
     api_versions: NotRequired[APIVersionsType]
 
 
+class ModuleDatabaseType(TypedDict):
+    """Own database of a module, missing keys default to the primary database.
+    Only a `schema` of the primary database is supported (`name`, `host` & `port` must be the primary ones),
+    models of all modules relate to `core.User`, and foreign keys can not cross databases.
+    """
+
+    name: NotRequired[str]
+    host: NotRequired[str]
+    port: NotRequired[int]
+    user: NotRequired[str]
+    password: NotRequired[str]
+    schema: NotRequired[str]
+
+
 class ModuleSettings(TypedDict):
     standalone: NotRequired[bool]
+    database: NotRequired[ModuleDatabaseType]
 
 
 class ModuleType(TypedDict):
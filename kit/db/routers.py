@@ -0,0 +1,125 @@
+import random
+from contextvars import ContextVar
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class ReplicaState:
+    """Routing state of a single request, set by `kit.middleware.replicas.ReplicaRoutingMiddleware`.
+
+    Attributes:
+    - `reads`: reads may go to a replica, enabled by `kit.views.views.BaseAPIView` for `GET` handlers
+    - `pinned`: reads must stay on the primary, because this client (or this request) has just written
+    - `wrote`: this request has written, so the client gets pinned for `DATABASE_REPLICA_PIN_SECONDS`
+    - `replica`: replica picked for the reads of this request, so that they see a single state of the data
+    """
+
+    reads: bool
+    pinned: bool
+    wrote: bool
+    replica: str | None
+
+    def __init__(self, pinned: bool = False) -> None:
+        self.reads = False
+        self.pinned = pinned
+        self.wrote = False
+        self.replica = None
+
+
+replica_state: ContextVar[ReplicaState | None] = ContextVar(
+    "replica_state", default=None
+)
+
+
+class ReplicaRouter:
+    """Sends the reads of `GET` handlers to a random replica of `DATABASE_REPLICAS` (one per request), everything else to the primary.
+    Returns `None` whenever it has no opinion, so that routers after it can still decide.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = replica_state.get()
+        replicas = getattr(settings, "DATABASE_REPLICAS", [])
+        if (
+            state is None
+            or not state.reads
+            or state.pinned
+            or not replicas
+            # reads inside a transaction must see its writes
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return None
+        if state.replica is None:
+            state.replica = random.choice(replicas)
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = replica_state.get()
+        if state is not None:
+            state.wrote = True
+            state.pinned = True
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        replicas = getattr(settings, "DATABASE_REPLICAS", [])
+        databases = {obj1._state.db, obj2._state.db}
+        if databases <= {DEFAULT_DB_ALIAS, *replicas}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in getattr(settings, "DATABASE_REPLICAS", []):
+            return False
+        return None
+
+
+def get_physical_database(alias: str):
+    "Databases of the aliases that share a server & database (e.g. schemas of the primary) can relate to each other."
+    config = settings.DATABASES.get(alias, {})
+    return (config.get("HOST"), config.get("PORT"), config.get("NAME"))
+
+
+class ModuleRouter:
+    """Sends the models of modules with their own `database` (`DATABASE_MODULES`) to it, reads and writes alike.
+    Returns `None` for the other models, so that `ReplicaRouter` can decide.
+
+    The alias of a module is a schema of the primary database (see `kit.conf.database.get_databases`),
+    but a separate connection: its writes are not part of transactions of the `default` alias.
+    - `transaction.atomic()` without `using` does not cover them, use `router.db_for_write(Model)`.
+    - `Outbox` rows (`default`) are not written atomically with the rows of the module.
+    - `kit.auth.cache.UserCache` only follows the users of `default`, and `transaction.on_commit` callbacks run
+      on the commit of the alias they were registered on (e.g. `router.db_for_write(CircleMember)`).
+    """
+
+    def get_module_database(self, app_label: str) -> str | None:
+        try:
+            name = apps.get_app_config(app_label).name
+        except LookupError:
+            return None
+        for module_path, alias in getattr(settings, "DATABASE_MODULES", {}).items():
+            if name == module_path or name.startswith(module_path + "."):
+                return alias
+        return None
+
+    def db_for_read(self, model, **hints):
+        return self.get_module_database(model._meta.app_label)
+
+    def db_for_write(self, model, **hints):
+        return self.get_module_database(model._meta.app_label)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {obj1._state.db, obj2._state.db}
+        modules = getattr(settings, "DATABASE_MODULES", {}).values()
+        if len(databases) == 1 or not databases & set(modules):
+            return None
+        # schemas share the physical database, separate databases can not have foreign keys between them
+        return len({get_physical_database(alias) for alias in databases}) == 1
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        alias = self.get_module_database(app_label)
+        if alias is not None:
+            return db == alias
+        if db in getattr(settings, "DATABASE_MODULES", {}).values():
+            return False
+        return None
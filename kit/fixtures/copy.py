@@ -0,0 +1,128 @@
+import io
+import itertools
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Type, cast
+
+from django.core.management.color import no_style
+from django.db import connections, models, router, transaction
+
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value: Any) -> str:
+    "Value in the text format of `COPY`."
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value).translate(COPY_ESCAPES)
+
+
+def _chunks(rows: Iterable[Any], size: int) -> Iterable[List[Any]]:
+    iterator = iter(rows)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+class RowWriter:
+    """Writes generated rows of a model, with `COPY ... FROM STDIN` on PostgreSQL (psycopg 2 or 3),
+    and batched `INSERT`s elsewhere (e.g. sqlite in local runs).
+    Rows are dicts of column values (`attname`s), missing columns get the default of their field.
+    Signals are not sent, and `auto_now` fields and primary keys must be given.
+
+    Attributes:
+    - `model`: model of the rows
+    - `using`: database alias, defaults to the one routed for writes of the model
+    - `chunk_size`: rows sent per `COPY` or `INSERT` statement
+    """
+
+    model: Type[models.Model]
+    using: str
+    chunk_size: int
+
+    def __init__(
+        self,
+        model: Type[models.Model],
+        using: str | None = None,
+        chunk_size: int = 50000,
+    ) -> None:
+        self.model = model
+        self.using = using or router.db_for_write(model)
+        self.chunk_size = chunk_size
+        self.fields = [field for field in model._meta.fields if field.concrete]
+        # static defaults, evaluated once. Callable ones (e.g. uuids) must be given by rows
+        self.defaults: Dict[str, Any] = {
+            field.attname: field.get_default() for field in self.fields
+        }
+
+    def _values(self, row: Dict[str, Any]) -> List[Any]:
+        return [
+            row[field.attname] if field.attname in row else self.defaults[field.attname]
+            for field in self.fields
+        ]
+
+    def write(self, rows: Iterable[Dict[str, Any]]) -> int:
+        "Write the rows, returns their number."
+        connection = connections[self.using]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        columns = ", ".join(
+            # concrete fields always have a column
+            connection.ops.quote_name(cast(str, field.column))
+            for field in self.fields
+        )
+        total = 0
+        with transaction.atomic(using=self.using), connection.cursor() as cursor:
+            for chunk in _chunks(rows, self.chunk_size):
+                if connection.vendor == "postgresql":
+                    self._copy(cursor, table, columns, chunk)
+                else:
+                    self._insert(connection, cursor, table, columns, chunk)
+                total += len(chunk)
+        return total
+
+    def _copy(self, cursor, table: str, columns: str, chunk: List[Dict[str, Any]]):
+        sql = "COPY %s (%s) FROM STDIN" % (table, columns)
+        buffer = io.StringIO()
+        for row in chunk:
+            buffer.write("\t".join(_copy_value(value) for value in self._values(row)))
+            buffer.write("\n")
+        raw = cursor.cursor
+        if hasattr(raw, "copy_expert"):  # psycopg2
+            buffer.seek(0)
+            raw.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with raw.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+    def _insert(
+        self, connection, cursor, table: str, columns: str, chunk: List[Dict[str, Any]]
+    ):
+        placeholders = ", ".join(["%s"] * len(self.fields))
+        sql = "INSERT INTO %s (%s) VALUES (%s)" % (table, columns, placeholders)
+        cursor.executemany(
+            sql,
+            [
+                [
+                    field.get_db_prep_save(value, connection)
+                    for field, value in zip(self.fields, self._values(row))
+                ]
+                for row in chunk
+            ],
+        )
+
+    def next_id(self) -> int:
+        "First free primary key, rows are written with explicit keys so that related rows can point to them."
+        last = self.model._base_manager.using(self.using).aggregate(
+            last=models.Max("pk")
+        )["last"]
+        return (last or 0) + 1
+
+    def reset_sequence(self) -> None:
+        "Move the primary key sequence past the written keys."
+        connection = connections[self.using]
+        statements = connection.ops.sequence_reset_sql(no_style(), [self.model])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
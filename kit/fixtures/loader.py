@@ -0,0 +1,177 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from .types import FixtureReportType
+
+M = TypeVar("M", bound=models.Model)
+N = TypeVar("N")
+
+RowType = Tuple[Hashable, Dict[str, Any]]
+
+
+def _empty_report() -> FixtureReportType:
+    return {"created": 0, "updated": 0, "unchanged": 0}
+
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _sync(
+    model: Type[M],
+    rows: List[RowType],
+    existing: Dict[Hashable, M],
+    update_fields: Sequence[str],
+    before_create: Callable[[List[M]], None] | None,
+    batch_size: int,
+    report: FixtureReportType,
+) -> Dict[Hashable, M]:
+    """Create the missing rows and update the changed `update_fields` of the existing ones, in bulk.
+
+    Returns:
+        Dict[Hashable, M]: instance of every row, by identity
+    """
+    objects: Dict[Hashable, M] = {}
+    created: List[M] = []
+    changed: List[M] = []
+    for identity, values in rows:
+        if identity in objects:
+            raise ValueError("Duplicate fixture %r of %s." % (identity, model.__name__))
+        obj = existing.get(identity)
+        if obj is None:
+            obj = model(**values)
+            created.append(obj)
+        elif any(getattr(obj, field) != values[field] for field in update_fields):
+            for field in update_fields:
+                setattr(obj, field, values[field])
+            changed.append(obj)
+        else:
+            report["unchanged"] += 1
+        objects[identity] = obj
+
+    if created:
+        if before_create is not None:
+            before_create(created)
+        model._default_manager.bulk_create(created, batch_size=batch_size)
+        report["created"] += len(created)
+    if changed:
+        # `bulk_update` skips `pre_save`, so `auto_now` fields are set here
+        auto_now = [
+            field.name
+            for field in model._meta.fields
+            if getattr(field, "auto_now", False)
+        ]
+        now = timezone.now()
+        for obj in changed:
+            for field in auto_now:
+                setattr(obj, field, now)
+        model._default_manager.bulk_update(
+            changed, [*update_fields, *auto_now], batch_size=batch_size
+        )
+        report["updated"] += len(changed)
+    return objects
+
+
+def load_rows(
+    model: Type[M],
+    rows: Iterable[Dict[str, Any]],
+    *,
+    key: str,
+    update_fields: Sequence[str] = (),
+    before_create: Callable[[List[M]], None] | None = None,
+    batch_size: int = 1000,
+) -> FixtureReportType:
+    """Idempotently load flat fixtures, matched to the existing rows by the unique `key` field.
+    Runs in a single transaction, with one query per `batch_size` rows to fetch, create and update.
+
+    Args:
+    - `rows`: field values of each row
+    - `update_fields`: fields brought in line with the fixtures for existing rows, others are left as they are
+    - `before_create`: called with the unsaved new instances, e.g. to hash their passwords in bulk
+    """
+    identified: List[RowType] = [(values[key], values) for values in rows]
+    report = _empty_report()
+    with transaction.atomic():
+        for chunk in _chunks(identified, batch_size):
+            existing = model._default_manager.in_bulk(
+                [identity for identity, _ in chunk], field_name=key
+            )
+            _sync(
+                model,
+                chunk,
+                existing,
+                update_fields,
+                before_create,
+                batch_size,
+                report,
+            )
+    return report
+
+
+def load_tree(
+    model: Type[M],
+    nodes: Iterable[N],
+    *,
+    key: str,
+    values: Callable[[N, M | None], Dict[str, Any]],
+    children: Callable[[N], Iterable[N]],
+    parent_field: str = "parent",
+    update_fields: Sequence[str] = (),
+    batch_size: int = 1000,
+) -> FixtureReportType:
+    """Idempotently load a tree of fixtures, matched to the existing rows by parent and `key` field.
+    Runs in a single transaction, level by level: per level, one query per `batch_size` nodes fetches the
+    existing rows, and the missing and changed ones are written with `bulk_create` and `bulk_update`.
+
+    Args:
+    - `values`: field values of a node, given its parent instance (`None` for roots)
+    - `children`: children of a node
+    - `update_fields`: fields brought in line with the fixtures for existing rows, others are left as they are
+    """
+    parent_attname = cast(models.Field, model._meta.get_field(parent_field)).attname
+    report = _empty_report()
+    with transaction.atomic():
+        level: List[Tuple[M | None, N]] = [(None, node) for node in nodes]
+        while level:
+            next_level: List[Tuple[M | None, N]] = []
+            for chunk in _chunks(level, batch_size):
+                rows: List[RowType] = []
+                for parent, node in chunk:
+                    row = {**values(node, parent), parent_field: parent}
+                    rows.append(((parent.pk if parent else None, row[key]), row))
+
+                parent_ids = {parent.pk for parent, _ in chunk if parent is not None}
+                in_level = models.Q(**{"%s__in" % parent_attname: parent_ids})
+                if any(parent is None for parent, _ in chunk):
+                    in_level |= models.Q(**{"%s__isnull" % parent_attname: True})
+                existing: Dict[Hashable, M] = {
+                    (getattr(obj, parent_attname), getattr(obj, key)): obj
+                    for obj in model._default_manager.filter(
+                        in_level, **{"%s__in" % key: {row[key] for _, row in rows}}
+                    )
+                }
+
+                objects = _sync(
+                    model, rows, existing, update_fields, None, batch_size, report
+                )
+                for (identity, _), (_, node) in zip(rows, chunk):
+                    next_level.extend(
+                        (objects[identity], child) for child in children(node)
+                    )
+            level = next_level
+    return report
@@ -0,0 +1,28 @@
+import pkgutil
+from importlib import import_module
+from typing import Callable, Dict, List
+
+from django.apps import apps
+from django.utils.module_loading import module_has_submodule
+
+from .types import FixtureReportType
+
+FIXTURES_MODULE_NAME = "fixtures"
+
+FixtureLoaderType = Callable[[], FixtureReportType]
+
+
+def discover() -> Dict[str, List[FixtureLoaderType]]:
+    """Fixture loaders of all installed modules, by `<app label>.<fixture module>` (e.g. `core.dropdown`), in app order.
+    Modules export their loaders as a `fixtures` list in the modules of their `fixtures` package.
+    """
+    loaders: Dict[str, List[FixtureLoaderType]] = {}
+    for app_config in apps.get_app_configs():
+        if not module_has_submodule(app_config.module, FIXTURES_MODULE_NAME):
+            continue
+        package = import_module("%s.%s" % (app_config.name, FIXTURES_MODULE_NAME))
+        for info in pkgutil.iter_modules(getattr(package, "__path__", [])):
+            module = import_module("%s.%s" % (package.__name__, info.name))
+            if getattr(module, "fixtures", None):
+                loaders["%s.%s" % (app_config.label, info.name)] = module.fixtures
+    return loaders
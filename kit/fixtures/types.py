@@ -0,0 +1,7 @@
+from typing import TypedDict
+
+
+class FixtureReportType(TypedDict):
+    created: int
+    updated: int
+    unchanged: int
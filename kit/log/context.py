@@ -0,0 +1,4 @@
+from contextvars import ContextVar
+
+# id of the request being processed, set by `kit.middleware.request_id.RequestIDMiddleware`
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
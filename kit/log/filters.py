@@ -0,0 +1,31 @@
+import logging
+import random
+
+from .context import request_id
+
+
+class RequestIDFilter(logging.Filter):
+    "Attach the id of the current request to every record."
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Only let a `rate` fraction of `DEBUG` records through, records of higher levels always pass.
+
+    Attributes:
+    - `rate`: fraction of debug records to keep, between 0 and 1
+    """
+
+    rate: float
+
+    def __init__(self, rate: float = 1.0) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        return self.rate >= 1 or random.random() < self.rate
@@ -0,0 +1,37 @@
+import json
+import logging
+from datetime import datetime, timezone
+
+# attributes of every `logging.LogRecord`, anything else was passed as `extra`
+RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__.keys()
+) | {"message", "asctime", "request_id"}
+
+
+class JSONFormatter(logging.Formatter):
+    "Format records as a single line of json, including the request id and `extra` fields."
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        data.update(
+            {
+                key: value
+                for key, value in record.__dict__.items()
+                if key not in RECORD_ATTRIBUTES
+            }
+        )
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            data["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(data, default=str)
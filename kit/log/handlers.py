@@ -0,0 +1,107 @@
+import atexit
+import copy
+import logging
+import os
+import queue
+from logging.handlers import QueueListener, RotatingFileHandler
+
+
+class QueuedRotatingFileHandler(logging.Handler):
+    """Buffers records in a bounded queue, and writes them to a size rotated file from a background thread.
+    The request thread only pays for putting the record in the queue, records are dropped if the queue is full.
+    The thread is started by the first record of each process, so that workers forked after the configuration
+    (e.g. `gunicorn --preload`) run their own, threads do not survive a fork.
+    Rollovers are not coordinated across processes, so with several workers the `filename` must contain `%(pid)s`,
+    giving every process its own file, e.g. `logs/app.%(pid)s.log`.
+
+    Attributes:
+    - `queue`: buffer shared with the background listener
+    - `target`: `logging.handlers.RotatingFileHandler` of the current process, which actually writes the records
+    - `listener`: `logging.handlers.QueueListener`, which drains the queue into `target`, `None` until started
+    - `dropped`: number of records dropped because the queue was full
+    """
+
+    queue: queue.Queue
+    target: RotatingFileHandler
+    listener: QueueListener | None
+    dropped: int
+
+    def __init__(
+        self,
+        filename: str,
+        maxBytes: int = 10 * 1024 * 1024,
+        backupCount: int = 5,
+        queueSize: int = 10000,
+        level: int | str = logging.NOTSET,
+    ) -> None:
+        super().__init__(level)
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.filename = filename
+        self.max_bytes = maxBytes
+        self.backup_count = backupCount
+        self.queue_size = queueSize
+        self.queue = queue.Queue(maxsize=queueSize)
+        self.target = self.get_target()
+        self.listener = None
+        self._pid: int | None = None
+        self.dropped = 0
+        atexit.register(self.close)
+
+    def get_target(self) -> RotatingFileHandler:
+        "File handler of the current process, opened on the first record."
+        target = RotatingFileHandler(
+            self.filename % {"pid": os.getpid()},
+            maxBytes=self.max_bytes,
+            backupCount=self.backup_count,
+            encoding="utf-8",
+            delay=True,
+        )
+        target.setFormatter(self.formatter)
+        return target
+
+    def start(self) -> None:
+        "Start the background thread of the current process, with a new queue and file after a fork."
+        if self._pid is not None:
+            # the queue may be locked by the thread of the parent, which is gone
+            self.queue = queue.Queue(maxsize=self.queue_size)
+        # the file of the parent is left as is, its handler may be locked as well
+        self.target = self.get_target()
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+        self._pid = os.getpid()
+
+    def setFormatter(self, fmt: logging.Formatter | None) -> None:
+        # formatting is done by the background thread
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        "Resolve the message in the calling thread, as `args` may be mutated after the call."
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # called with the lock of the handler held, the thread is started once
+        if self._pid != os.getpid():
+            self.start()
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        "Flush the buffered records and stop the background thread."
+        if (
+            self.listener is not None
+            and self._pid == os.getpid()
+            and self.listener._thread is not None
+        ):
+            self.listener.stop()
+        self.target.close()
+        super().close()
@@ -0,0 +1,218 @@
+import atexit
+import json
+import os
+import time
+from bisect import bisect_left
+from threading import Lock
+from typing import Dict, Iterable, List, Literal, Tuple, TypeAlias
+
+from django.conf import settings
+
+LabelsType: TypeAlias = Tuple[Tuple[str, str], ...]
+MetricKindType: TypeAlias = Literal["counter", "histogram"]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# name: (kind, help, buckets)
+METRICS: Dict[str, Tuple[MetricKindType, str, Tuple[float, ...]]] = {
+    "kit_http_requests_total": (
+        "counter",
+        "Responses by route template, method and status code.",
+        (),
+    ),
+    "kit_http_request_duration_seconds": (
+        "histogram",
+        "Request latency by route template and method.",
+        LATENCY_BUCKETS,
+    ),
+    "kit_http_response_size_bytes": (
+        "histogram",
+        "Response payload size by route template and method.",
+        SIZE_BUCKETS,
+    ),
+    "kit_serializer_duration_seconds": (
+        "histogram",
+        "Time spent rendering serializers by route template and method.",
+        LATENCY_BUCKETS,
+    ),
+    "kit_db_duration_seconds": (
+        "histogram",
+        "Time spent in the database by route template and method.",
+        LATENCY_BUCKETS,
+    ),
+    "kit_db_queries_total": (
+        "counter",
+        "Executed queries by route template and method.",
+        (),
+    ),
+    "kit_db_n_plus_one_total": (
+        "counter",
+        "Requests with N+1 query candidates by route template and method.",
+        (),
+    ),
+}
+
+
+class MetricsRegistry:
+    """Low overhead, in-process aggregation of `METRICS`.
+    Every process periodically dumps its own state to `<directory>/<pid>.json`,
+    and `collect` merges the dumps of all the live worker processes of the host.
+    Dumps of exited processes are removed, so their counters reset like those of a restarted worker.
+
+    Attributes:
+    - `directory`: folder shared by all the worker processes
+    - `flush_interval`: minimum seconds between two dumps of the current process
+    """
+
+    directory: str
+    flush_interval: float
+
+    def __init__(self, directory: str, flush_interval: float = 5.0) -> None:
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._lock = Lock()
+        self._values: Dict[Tuple[str, LabelsType], List[float]] = {}
+        self._pid = os.getpid()
+        self._last_flush = 0.0
+        os.makedirs(self.directory, exist_ok=True)
+        atexit.register(self.flush)
+
+    def _check_fork(self) -> None:
+        "Forked workers inherit the state of the parent, which would otherwise be counted twice."
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._values = {}
+            self._last_flush = 0.0
+
+    def _slot(self, name: str, labels: LabelsType) -> List[float]:
+        value = self._values.get((name, labels))
+        if value is None:
+            kind, _, buckets = METRICS[name]
+            # histograms: one slot per bucket, +Inf, sum
+            value = [0.0] * (len(buckets) + 2) if kind == "histogram" else [0.0]
+            self._values[(name, labels)] = value
+        return value
+
+    def inc(self, name: str, labels: LabelsType, amount: float = 1) -> None:
+        with self._lock:
+            self._check_fork()
+            self._slot(name, labels)[0] += amount
+
+    def observe(self, name: str, labels: LabelsType, value: float) -> None:
+        buckets = METRICS[name][2]
+        with self._lock:
+            self._check_fork()
+            slot = self._slot(name, labels)
+            slot[bisect_left(buckets, value)] += 1
+            slot[-1] += value
+
+    def maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._check_fork()
+            self._last_flush = time.monotonic()
+            dump = [
+                {"name": name, "labels": list(labels), "value": value}
+                for (name, labels), value in self._values.items()
+            ]
+        path = os.path.join(self.directory, "%s.json" % self._pid)
+        with open("%s.tmp" % path, "w") as file:
+            json.dump(dump, file)
+        os.replace("%s.tmp" % path, path)
+
+    def collect(self) -> Dict[Tuple[str, LabelsType], List[float]]:
+        "Merge the dumps of every process, after flushing the current one."
+        self.flush()
+        merged: Dict[Tuple[str, LabelsType], List[float]] = {}
+        for item in os.listdir(self.directory):
+            if not item.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, item)
+            if not _is_alive(item[: -len(".json")]):
+                # left behind by a worker that exited, or by a previous run
+                try:
+                    os.remove(path)
+                except OSError:  # removed by a concurrent `collect`
+                    pass
+                continue
+            try:
+                with open(path, "r") as file:
+                    dump = json.load(file)
+            except (OSError, ValueError):  # partially written by a dying worker
+                continue
+            for entry in dump:
+                if entry["name"] not in METRICS:
+                    continue
+                key = (entry["name"], tuple(tuple(label) for label in entry["labels"]))
+                value = merged.setdefault(key, [0.0] * len(entry["value"]))
+                for index, amount in enumerate(entry["value"]):
+                    value[index] += amount
+        return merged
+
+    def render(self) -> str:
+        "Render the merged metrics in the prometheus text exposition format."
+        merged = self.collect()
+        lines: List[str] = []
+        for name, (kind, help, buckets) in METRICS.items():
+            lines.append("# HELP %s %s" % (name, help))
+            lines.append("# TYPE %s %s" % (name, kind))
+            for (_name, labels), value in sorted(merged.items()):
+                if _name != name:
+                    continue
+                if kind == "counter":
+                    lines.append("%s%s %s" % (name, _format_labels(labels), value[0]))
+                    continue
+                cumulative = 0.0
+                for bound, count in zip((*buckets, "+Inf"), value[:-1]):
+                    cumulative += count
+                    lines.append(
+                        "%s_bucket%s %s"
+                        % (name, _format_labels(labels, ("le", str(bound))), cumulative)
+                    )
+                lines.append("%s_sum%s %s" % (name, _format_labels(labels), value[-1]))
+                lines.append(
+                    "%s_count%s %s" % (name, _format_labels(labels), cumulative)
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _is_alive(pid: str) -> bool:
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:  # owned by another user
+        return True
+    return True
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]], *extra: Tuple[str, str]) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{%s}" % ",".join(
+        '%s="%s"'
+        % (
+            key,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in pairs
+    )
+
+
+_registry: MetricsRegistry | None = None
+
+
+def get_registry() -> MetricsRegistry:
+    "Lazily build the process wide `MetricsRegistry` from settings."
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry(
+            getattr(settings, "METRICS_DIR", os.path.join("logs", "metrics")),
+            getattr(settings, "METRICS_FLUSH_INTERVAL", 5.0),
+        )
+    return _registry
@@ -0,0 +1,23 @@
+import ipaddress
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+
+from .registry import get_registry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Expose the metrics of all the worker processes in prometheus text format.
+    Only to the addresses or networks of the `METRICS_ALLOWED_IPS` setting, local ones by default.
+    `REMOTE_ADDR` is used as is, the scraper must reach the workers directly.
+    """
+    allowed = getattr(settings, "METRICS_ALLOWED_IPS", ["127.0.0.1", "::1"])
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return HttpResponseForbidden()
+    if not any(address in ipaddress.ip_network(network) for network in allowed):
+        return HttpResponseForbidden()
+    return HttpResponse(get_registry().render(), content_type=CONTENT_TYPE)
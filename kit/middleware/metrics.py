@@ -0,0 +1,51 @@
+import time
+
+from kit.metrics.registry import get_registry
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Records latency, status codes, payload size, serializer and db time of every request.
+    - Requests are labelled by their route template (not the actual path), in order to keep cardinality bounded.
+    - Serializer time is reported by `kit.views.views.BaseAPIView.finalize_response`.
+    - DB time is reported by `kit.middleware.queries.QueryInstrumentationMiddleware`, which must be placed before.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.registry = get_registry()
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else UNMATCHED_ROUTE
+        labels = (("route", route), ("method", request.method))
+
+        registry = self.registry
+        registry.inc(
+            "kit_http_requests_total",
+            labels + (("status", str(response.status_code)),),
+        )
+        registry.observe("kit_http_request_duration_seconds", labels, duration)
+        if not response.streaming:
+            registry.observe(
+                "kit_http_response_size_bytes", labels, len(response.content)
+            )
+
+        serializer_time = getattr(request, "serializer_time", None)
+        if serializer_time is not None:
+            registry.observe("kit_serializer_duration_seconds", labels, serializer_time)
+
+        query_stats = getattr(request, "query_stats", None)
+        if query_stats is not None:
+            registry.observe("kit_db_duration_seconds", labels, query_stats.duration)
+            registry.inc("kit_db_queries_total", labels, query_stats.count)
+            if query_stats.n_plus_one:
+                registry.inc("kit_db_n_plus_one_total", labels)
+
+        registry.maybe_flush()
+        return response
@@ -0,0 +1,146 @@
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict
+
+from django.conf import settings
+from django.utils import timezone
+
+from .queries import get_endpoint
+
+
+def collapse_stack(frame) -> str:
+    "Collapse a frame in the folded format (root first, `;` separated) used by flame graph tools."
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(
+            "%s (%s:%d)"
+            % (
+                code.co_name,
+                os.path.relpath(code.co_filename, settings.BASE_DIR),
+                code.co_firstlineno,
+            )
+        )
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+class StackSampler:
+    """A single background thread, which periodically samples the stacks of all the registered threads.
+    Sampling is done with `sys._current_frames`, so the profiled code is not instrumented at all.
+
+    Attributes:
+    - `interval`: seconds between two samples
+    """
+
+    interval: float
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._active: Dict[int, Counter] = {}
+        self._thread: threading.Thread | None = None
+
+    def start(self, thread_id: int) -> None:
+        with self._lock:
+            self._active[thread_id] = Counter()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="kit-stack-sampler", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, thread_id: int) -> Counter:
+        with self._lock:
+            return self._active.pop(thread_id, Counter())
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    continue
+                frames = sys._current_frames()
+                for thread_id, samples in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        samples[collapse_stack(frame)] += 1
+
+
+class SamplingProfilerMiddleware:
+    """Opt-in (`PROFILER_ENABLED`) sampling profiler, which stores the stacks of:
+    - every request slower than `PROFILER_THRESHOLD_MS`.
+    - a `PROFILER_SAMPLE_RATE` fraction of requests on `PROFILER_ROUTES` (route templates, all routes if empty).
+
+    Profiles are written as json to `PROFILER_DIR`, along with route, user and query stats.
+    Use `manage.py aggregateprofiles` to merge them into flame graph ready output.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "PROFILER_ENABLED", False)
+        self.threshold = getattr(settings, "PROFILER_THRESHOLD_MS", 1000) / 1000
+        self.sample_rate = getattr(settings, "PROFILER_SAMPLE_RATE", 0.0)
+        self.routes = set(getattr(settings, "PROFILER_ROUTES", []))
+        self.directory = getattr(
+            settings, "PROFILER_DIR", os.path.join("logs", "profiles")
+        )
+        self.sampler = StackSampler(getattr(settings, "PROFILER_INTERVAL_MS", 5) / 1000)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        thread_id = threading.get_ident()
+        self.sampler.start(thread_id)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            duration = time.perf_counter() - start
+            samples = self.sampler.stop(thread_id)
+
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else None
+        if duration >= self.threshold or (
+            (not self.routes or route in self.routes)
+            and random.random() < self.sample_rate
+        ):
+            self.save(request, response, route, duration, samples)
+        return response
+
+    def save(self, request, response, route: str | None, duration: float, samples):
+        user = getattr(request, "user", None)
+        query_stats = getattr(request, "query_stats", None)
+        profile = {
+            "meta": {
+                "endpoint": get_endpoint(request),
+                "route": route,
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "user": (
+                    user.pk if user is not None and user.is_authenticated else None
+                ),
+                "duration_ms": round(duration * 1000, 3),
+                "interval_ms": self.sampler.interval * 1000,
+                "created_at": timezone.now().isoformat(),
+                "query_stats": (
+                    query_stats.as_dict() if query_stats is not None else None
+                ),
+            },
+            "stacks": dict(samples),
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(
+            self.directory,
+            "%s-%s.json" % (time.strftime("%Y%m%d%H%M%S"), uuid.uuid4().hex[:8]),
+        )
+        with open(path, "w") as file:
+            json.dump(profile, file)
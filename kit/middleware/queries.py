@@ -0,0 +1,142 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from typing import Dict
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import UNMATCHED_ROUTE
+
+logger = logging.getLogger("kit.queries")
+
+# literals are stripped from the sql, so that queries differing only by their parameters share a shape
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMERIC_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+current_query_stats: ContextVar["QueryStats | None"] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def normalize_sql(sql: str) -> str:
+    """Reduce a sql statement to its shape, i.e. without literals and variable length `IN` lists."""
+    shape = _STRING_LITERAL.sub("?", sql)
+    shape = _NUMERIC_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape.replace("%s", "?"))
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Collects the queries executed during a single request.
+    Installed as a `django.db.backends.base.base.BaseDatabaseWrapper.execute_wrapper` on every connection.
+
+    Attributes:
+    - `count`: number of executed queries
+    - `duration`: total time (in seconds) spent in the database
+    - `shapes`: a counter of normalized sql statements
+    - `threshold`: number of repetitions of a shape after which it is flagged as an N+1 candidate
+    """
+
+    count: int
+    duration: float
+    shapes: Counter
+    threshold: int
+
+    def __init__(self, threshold: int) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.threshold = threshold
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[normalize_sql(sql)] += 1
+
+    @property
+    def n_plus_one(self) -> Dict[str, int]:
+        "Shapes which were repeated at least `threshold` times."
+        return {
+            shape: count
+            for shape, count in self.shapes.items()
+            if count >= self.threshold
+        }
+
+    @property
+    def duplicates(self) -> int:
+        "Number of queries which were a repetition of an already executed shape."
+        return self.count - len(self.shapes)
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "duration_ms": round(self.duration * 1000, 3),
+            "duplicates": self.duplicates,
+            "n_plus_one": self.n_plus_one,
+        }
+
+
+def get_endpoint(request) -> str:
+    "Identify the endpoint of a request by its method and route template, unresolved paths share a single one."
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "%s %s" % (request.method, UNMATCHED_ROUTE)
+    return "%s /%s" % (request.method, match.route.lstrip("/"))
+
+
+class QueryInstrumentationMiddleware:
+    """Counts the queries, total db time and repeated query shapes of every request.
+    - Views can tune the N+1 threshold by setting `n_plus_one_threshold` on `kit.views.views.BaseAPIView`.
+    - Results are exposed as `X-Query-*` response headers when `QUERY_STATS_HEADERS` is set (defaults to `DEBUG`).
+    - Otherwise they are written as structured records to the `kit.queries` logger.
+    - Aggregates per route are exposed by `kit.middleware.metrics.MetricsMiddleware` (`kit_db_*` metrics).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = getattr(settings, "QUERY_N_PLUS_ONE_THRESHOLD", 3)
+        self.expose_headers = getattr(settings, "QUERY_STATS_HEADERS", settings.DEBUG)
+
+    def __call__(self, request):
+        stats = QueryStats(self.threshold)
+        request.query_stats = stats
+        token = current_query_stats.set(stats)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            current_query_stats.reset(token)
+
+        endpoint = get_endpoint(request)
+
+        if stats.n_plus_one:
+            logger.warning(
+                "N+1 query candidates on %s",
+                endpoint,
+                extra={"endpoint": endpoint, "query_stats": stats.as_dict()},
+            )
+
+        if self.expose_headers:
+            response["X-Query-Count"] = str(stats.count)
+            response["X-Query-Time"] = "%.3f" % (stats.duration * 1000)
+            response["X-Query-Duplicates"] = str(stats.duplicates)
+            response["X-Query-N-Plus-One"] = str(len(stats.n_plus_one))
+        else:
+            logger.info(
+                "Query stats for %s",
+                endpoint,
+                extra={"endpoint": endpoint, "query_stats": stats.as_dict()},
+            )
+        return response
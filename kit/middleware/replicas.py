@@ -0,0 +1,59 @@
+import time
+from typing import Iterable, Iterator
+
+from django.conf import settings
+
+from kit.db.routers import ReplicaState, replica_state
+
+PIN_COOKIE = "db_pin"
+
+
+class ReplicaRoutingMiddleware:
+    """Per request state of `kit.db.routers.ReplicaRouter`, with read your writes consistency.
+    A client that wrote gets a cookie keeping its reads on the primary for `DATABASE_REPLICA_PIN_SECONDS`,
+    long enough for the replicas to catch up.
+    The state also covers the body of streaming responses (e.g. `kit.views.export`), whose queries run after the view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, "DATABASE_REPLICA_PIN_SECONDS", 5)
+        self.replicas = getattr(settings, "DATABASE_REPLICAS", [])
+
+    def __call__(self, request):
+        try:
+            pinned = float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            pinned = False
+
+        state = ReplicaState(pinned=pinned)
+        token = replica_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_state.reset(token)
+
+        if response.streaming and not getattr(response, "is_async", False):
+            response.streaming_content = self.stream(state, response.streaming_content)
+        # without replicas, reads stay on the primary anyway
+        if state.wrote and self.replicas:
+            response.set_cookie(
+                PIN_COOKIE,
+                str(time.time() + self.pin_seconds),
+                max_age=self.pin_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def stream(self, state: ReplicaState, content: Iterable[bytes]) -> Iterator[bytes]:
+        iterator = iter(content)
+        while True:
+            token = replica_state.set(state)
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                replica_state.reset(token)
+            yield chunk
@@ -0,0 +1,30 @@
+import re
+import uuid
+
+from kit.log.context import request_id
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# only trust well formed ids from upstream proxies
+VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestIDMiddleware:
+    """Assign an id to every request, attached to all log records emitted while processing it.
+    Reuses the `X-Request-ID` header set by an upstream proxy when present, and echoes it back in the response.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        incoming = request.headers.get(REQUEST_ID_HEADER, "")
+        current = incoming if VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+        request.request_id = current
+        token = request_id.set(current)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id.reset(token)
+        response[REQUEST_ID_HEADER] = current
+        return response
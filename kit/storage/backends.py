@@ -0,0 +1,335 @@
+import hashlib
+import mimetypes
+import os
+import posixpath
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from tempfile import SpooledTemporaryFile
+from threading import Lock
+from typing import Dict, Iterable, List, Tuple
+from urllib.parse import quote, urlencode
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import File
+from django.core.files.storage import FileSystemStorage, Storage, storages
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect
+from django.http.response import HttpResponseBase
+from django.utils.http import content_disposition_header
+
+from .types import FileRefType, SendfileType, StoredFileType
+
+SIGNING_SALT = "kit.storage.download"
+
+
+class HashingReader:
+    "File like reader over chunks, hashing and counting what is read. Lets `boto3` stream multipart uploads."
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def _fill(self, size: int) -> None:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return
+            self.hash.update(chunk)
+            self.size += len(chunk)
+            self._buffer += chunk
+
+    def read(self, size: int = -1) -> bytes:
+        self._fill(size)
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        return data
+
+
+class StorageMixin(ABC):
+    """Streaming saves and signed, batch computed download URLs, shared by the kit storages.
+
+    Attributes:
+    - `url_ttl`: seconds a download URL stays valid, signed URLs are reused for half of it
+    """
+
+    url_ttl: int
+    max_cached_urls = 10000
+
+    def __init__(self, *args, url_ttl: int | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.url_ttl = (
+            url_ttl
+            if url_ttl is not None
+            else int(getattr(settings, "STORAGE_URL_TTL", 60 * 60))
+        )
+        self._url_lock = Lock()
+        self._urls: Dict[FileRefType, Tuple[float, str]] = {}
+
+    @abstractmethod
+    def save_stream(self, name: str, content: File) -> StoredFileType:
+        "Write `content` chunk by chunk under `name` (overwriting it), hashing it on the way."
+
+    @abstractmethod
+    def move(self, name: str, new_name: str) -> None:
+        "Rename a file, overwriting `new_name`. Lets content addressed names be set once the content was hashed."
+
+    @abstractmethod
+    def sign_url(self, name: str, filename: str | None = None) -> str:
+        "Download URL of a file, valid for `url_ttl` seconds, downloaded as `filename`."
+
+    @abstractmethod
+    def download_response(
+        self, name: str, filename: str | None = None
+    ) -> HttpResponseBase:
+        "Response of a signed download URL."
+
+    def url(self, name: str | None) -> str:
+        return self.urls([(name, None)])[(name, None)] if name else ""
+
+    def urls(self, files: Iterable[FileRefType]) -> Dict[FileRefType, str]:
+        "Download URLs of many files at once (e.g. a page of rows), without signing a URL twice within half its lifetime."
+        now = time.monotonic()
+        urls: Dict[FileRefType, str] = {}
+        with self._url_lock:
+            for file in files:
+                if not file[0] or file in urls:
+                    continue
+                entry = self._urls.get(file)
+                if entry is None or entry[0] <= now:
+                    if len(self._urls) >= self.max_cached_urls:
+                        # oldest first, dicts preserve insertion order
+                        self._urls.pop(next(iter(self._urls)))
+                    entry = (now + self.url_ttl / 2, self.sign_url(*file))
+                    self._urls[file] = entry
+                urls[file] = entry[1]
+        return urls
+
+    def get_download_filename(self, name: str, filename: str | None = None) -> str:
+        return filename or posixpath.basename(name)
+
+
+class LocalStorage(StorageMixin, FileSystemStorage):
+    """Files on disk under `MEDIA_ROOT`. Also the local stand in for `S3Storage`: URLs are signed and expire the same way,
+    and point to `STORAGE_DOWNLOAD_URL`, which serves them with `download_response`.
+    - `sendfile`: `nginx` hands the file over to nginx with `X-Accel-Redirect` (`MEDIA_URL` must be an `internal` location
+      aliased to `MEDIA_ROOT`), `apache` with `X-Sendfile`, `None` streams it from django.
+    """
+
+    def __init__(
+        self,
+        *args,
+        sendfile: SendfileType | None = None,
+        download_url: str | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.sendfile = sendfile
+        self.download_url = download_url or getattr(
+            settings, "STORAGE_DOWNLOAD_URL", "/download/"
+        )
+
+    def save_stream(self, name: str, content: File) -> StoredFileType:
+        path = self.path(name)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        if self.directory_permissions_mode is not None:
+            os.chmod(directory, self.directory_permissions_mode)
+
+        digest = hashlib.sha256()
+        size = 0
+        # written next to the target and renamed, readers never see a partial file
+        handle, temporary = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        try:
+            with os.fdopen(handle, "wb") as destination:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    size += len(chunk)
+                    destination.write(chunk)
+            if self.file_permissions_mode is not None:
+                os.chmod(temporary, self.file_permissions_mode)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return {"name": name, "size": size, "sha256": digest.hexdigest()}
+
+    def move(self, name: str, new_name: str) -> None:
+        path = self.path(new_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(self.path(name), path)
+        try:
+            # the folder of a random upload name holds that single file
+            os.rmdir(os.path.dirname(self.path(name)))
+        except OSError:
+            pass
+
+    def sign_url(self, name: str, filename: str | None = None) -> str:
+        token = signing.dumps([name, filename], salt=SIGNING_SALT, compress=True)
+        return "%s?%s" % (self.download_url, urlencode({"token": token}))
+
+    def verify_token(self, token: str) -> FileRefType:
+        """Name and download filename of the file of a signed URL.
+
+        Raises:
+            signing.BadSignature: if the token is invalid or expired (`signing.SignatureExpired`)
+        """
+        name, filename = signing.loads(token, salt=SIGNING_SALT, max_age=self.url_ttl)
+        return name, filename
+
+    def download_response(
+        self, name: str, filename: str | None = None
+    ) -> HttpResponseBase:
+        filename = self.get_download_filename(name, filename)
+        if self.sendfile is None:
+            return FileResponse(self.open(name, "rb"), filename=filename)
+
+        response = HttpResponse()
+        if self.sendfile == "nginx":
+            response["X-Accel-Redirect"] = quote(self.base_url + name)
+        else:
+            response["X-Sendfile"] = self.path(name)
+        # set by the web server from the file otherwise
+        del response["Content-Type"]
+        content_type, _ = mimetypes.guess_type(filename)
+        if content_type is not None:
+            response["Content-Type"] = content_type
+        disposition = content_disposition_header(False, filename)
+        if disposition is not None:
+            response["Content-Disposition"] = disposition
+        return response
+
+
+class S3Storage(StorageMixin, Storage):
+    """Files in a bucket of S3 or a compatible service (e.g. MinIO, with `endpoint_url`), `boto3` is an optional dependency.
+    - Uploads are streamed with multipart uploads, never held in memory or on disk as a whole.
+    - Downloads go straight to the bucket through presigned URLs.
+    """
+
+    def __init__(
+        self,
+        bucket: str | None = None,
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        access_key: str | None = None,
+        secret_key: str | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError:
+            raise ImproperlyConfigured(
+                "`boto3` must be installed to use the s3 storage."
+            )
+        if not bucket:
+            raise ImproperlyConfigured("The s3 storage needs a `bucket`.")
+        self.bucket = bucket
+        self.ClientError = ClientError
+        # clients are thread safe, and reuse their connections
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+        )
+
+    def save_stream(self, name: str, content: File) -> StoredFileType:
+        reader = HashingReader(content.chunks())
+        content_type, _ = mimetypes.guess_type(name)
+        self.client.upload_fileobj(
+            reader,
+            self.bucket,
+            name,
+            ExtraArgs={"ContentType": content_type or "application/octet-stream"},
+        )
+        return {"name": name, "size": reader.size, "sha256": reader.hash.hexdigest()}
+
+    def _save(self, name: str, content: File) -> str:
+        return self.save_stream(name, content)["name"]
+
+    def _open(self, name: str, mode: str = "rb") -> File:
+        body = self.client.get_object(Bucket=self.bucket, Key=name)["Body"]
+        # small files stay in memory, large ones spill to disk
+        spooled = SpooledTemporaryFile(max_size=File.DEFAULT_CHUNK_SIZE * 16)
+        for chunk in body.iter_chunks(File.DEFAULT_CHUNK_SIZE):
+            spooled.write(chunk)
+        spooled.seek(0)
+        return File(spooled, name)
+
+    def get_available_name(self, name: str, max_length: int | None = None) -> str:
+        # names are random (or content addressed), checking for a clash would cost a request per upload
+        return self.get_valid_name(name)
+
+    def _head(self, name: str) -> dict | None:
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=name)
+        except self.ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return None
+            raise
+
+    def exists(self, name: str) -> bool:
+        return self._head(name) is not None
+
+    def size(self, name: str) -> int:
+        head = self._head(name)
+        if head is None:
+            raise FileNotFoundError(name)
+        return head["ContentLength"]
+
+    def delete(self, name: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=name)
+
+    def move(self, name: str, new_name: str) -> None:
+        # copied within the bucket, the content is not downloaded
+        self.client.copy({"Bucket": self.bucket, "Key": name}, self.bucket, new_name)
+        self.delete(name)
+
+    def sign_url(self, name: str, filename: str | None = None) -> str:
+        filename = self.get_download_filename(name, filename)
+        content_type, _ = mimetypes.guess_type(filename)
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": name,
+                "ResponseContentDisposition": content_disposition_header(
+                    False, filename
+                ),
+                "ResponseContentType": content_type or "application/octet-stream",
+            },
+            ExpiresIn=self.url_ttl,
+        )
+
+    def download_response(
+        self, name: str, filename: str | None = None
+    ) -> HttpResponseBase:
+        return HttpResponseRedirect(self.urls([(name, filename)])[(name, filename)])
+
+
+def get_storage() -> LocalStorage | S3Storage:
+    "The `default` storage of `STORAGES`, which must be one of the kit storages."
+    storage = storages["default"]
+    if not isinstance(storage, (LocalStorage, S3Storage)):
+        raise ImproperlyConfigured(
+            "The default storage must be `kit.storage.backends.LocalStorage` or `S3Storage`."
+        )
+    return storage
+
+
+def get_urls(storage: Storage, files: List[FileRefType]) -> Dict[FileRefType, str]:
+    "Download URLs of files of any storage, in one batch for the kit storages."
+    if isinstance(storage, StorageMixin):
+        return storage.urls(files)
+    return {file: storage.url(file[0]) for file in files if file[0]}
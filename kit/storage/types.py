@@ -0,0 +1,18 @@
+from typing import Literal, Tuple, TypeAlias, TypedDict
+
+SendfileType: TypeAlias = Literal["nginx", "apache"]
+
+# (name in the storage, filename of downloads), the filename defaults to the last part of the name
+FileRefType: TypeAlias = Tuple[str, str | None]
+
+
+class StoredFileType(TypedDict):
+    """A file written by `kit.storage.backends`.
+    - `name`: name in the storage
+    - `size`: bytes
+    - `sha256`: hex digest of the content, computed while writing
+    """
+
+    name: str
+    size: int
+    sha256: str
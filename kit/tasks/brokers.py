@@ -0,0 +1,154 @@
+import heapq
+import itertools
+import json
+import logging
+import threading
+import time
+from typing import Callable, List, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .types import TaskMessageType
+
+logger = logging.getLogger(__name__)
+
+HandlerType = Callable[[TaskMessageType], None]
+
+
+class EagerBroker:
+    "Runs tasks in process as soon as they are published, retries are run right away. For tests and local development."
+
+    def publish(self, message: TaskMessageType, countdown: float = 0) -> None:
+        from .worker import execute
+
+        execute(message)
+
+    def consume(self, handler: HandlerType, burst: bool = False) -> None:
+        raise ImproperlyConfigured("Eager tasks are run on publish, there is no queue.")
+
+
+class LocalBroker:
+    """In process queue, consumed explicitly (e.g. `consume(execute, burst=True)` in a test).
+    Messages published with a `countdown` become available once it has passed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._queue: List[Tuple[float, int, TaskMessageType]] = []
+
+    def publish(self, message: TaskMessageType, countdown: float = 0) -> None:
+        with self._lock:
+            heapq.heappush(
+                self._queue,
+                (time.monotonic() + countdown, next(self._counter), message),
+            )
+
+    def _pop(self) -> TaskMessageType | None:
+        with self._lock:
+            if self._queue and self._queue[0][0] <= time.monotonic():
+                return heapq.heappop(self._queue)[2]
+            return None
+
+    def consume(self, handler: HandlerType, burst: bool = False) -> None:
+        "Handle the available messages, `burst` returns once none is available."
+        while True:
+            message = self._pop()
+            if message is not None:
+                handler(message)
+            elif burst:
+                return
+            else:
+                time.sleep(0.1)
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+class AMQPBroker:
+    """RabbitMQ broker, `pika` is an optional dependency, needed only by this broker.
+    - Messages are persistent and acknowledged after they are handled, so delivery is at least once.
+    - Delayed messages (retries) wait in a `<queue>.delay` queue, and are dead lettered back to the queue when they expire.
+    - Publishing connections are per thread, as `pika` connections are not thread safe.
+    """
+
+    def __init__(self, url: str, queue: str, prefetch: int) -> None:
+        try:
+            import pika
+        except ImportError:
+            raise ImproperlyConfigured(
+                "`pika` must be installed to use the amqp task broker."
+            )
+        self.pika = pika
+        self.url = url
+        self.queue = queue
+        self.prefetch = prefetch
+        self._local = threading.local()
+
+    def _channel(self, reconnect: bool = False):
+        channel = getattr(self._local, "channel", None)
+        if channel is None or reconnect or not channel.is_open:
+            connection = self.pika.BlockingConnection(self.pika.URLParameters(self.url))
+            channel = connection.channel()
+            channel.queue_declare(queue=self.queue, durable=True)
+            channel.queue_declare(
+                queue="%s.delay" % self.queue,
+                durable=True,
+                arguments={
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": self.queue,
+                },
+            )
+            self._local.channel = channel
+        return channel
+
+    def publish(self, message: TaskMessageType, countdown: float = 0) -> None:
+        properties = self.pika.BasicProperties(
+            content_type="application/json",
+            delivery_mode=2,  # persistent
+            message_id=message["id"],
+            expiration=str(int(countdown * 1000)) if countdown else None,
+        )
+        routing_key = "%s.delay" % self.queue if countdown else self.queue
+        body = json.dumps(message)
+        try:
+            self._channel().basic_publish("", routing_key, body, properties)
+        except self.pika.exceptions.AMQPConnectionError:
+            # stale connection of an idle thread, retry once
+            self._channel(reconnect=True).basic_publish(
+                "", routing_key, body, properties
+            )
+
+    def consume(self, handler: HandlerType, burst: bool = False) -> None:
+        channel = self._channel()
+        channel.basic_qos(prefetch_count=self.prefetch)
+        for method, _, body in channel.consume(
+            self.queue, inactivity_timeout=1 if burst else None
+        ):
+            if method is None:  # inactive
+                break
+            handler(json.loads(body))
+            channel.basic_ack(method.delivery_tag)
+        channel.cancel()
+
+
+_broker: EagerBroker | LocalBroker | AMQPBroker | None = None
+
+
+def get_broker() -> EagerBroker | LocalBroker | AMQPBroker:
+    "Broker of the `TASK_BROKER` setting: `eager`, `local` or `amqp` (at `TASK_BROKER_URL`)."
+    global _broker
+    if _broker is None:
+        backend = getattr(settings, "TASK_BROKER", "eager")
+        if backend == "amqp":
+            _broker = AMQPBroker(
+                settings.TASK_BROKER_URL,
+                getattr(settings, "TASK_QUEUE", "tasks"),
+                getattr(settings, "TASK_PREFETCH", 10),
+            )
+        elif backend == "local":
+            _broker = LocalBroker()
+        else:
+            _broker = EagerBroker()
+    return _broker
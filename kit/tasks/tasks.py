@@ -0,0 +1,129 @@
+import time
+from functools import update_wrapper
+from typing import Any, Callable, Dict, Generic, ParamSpec, TypeVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .types import TaskMessageType, TaskStateType, TaskStatusType
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+RESULT_PREFIX = "task:result:"
+
+registry: Dict[str, "Task"] = {}
+
+
+class TaskFailed(Exception):
+    "Raised by `TaskResult.get`, when the task failed after all its retries."
+
+
+def store_state(
+    message: TaskMessageType,
+    status: TaskStatusType,
+    result: Any = None,
+    error: str | None = None,
+) -> None:
+    state: TaskStateType = {
+        "id": message["id"],
+        "name": message["name"],
+        "status": status,
+        "attempts": message["attempt"],
+        "result": result,
+        "error": error,
+    }
+    cache.set(
+        RESULT_PREFIX + message["id"],
+        state,
+        getattr(settings, "TASK_RESULT_TTL", 60 * 60),
+    )
+
+
+class TaskResult:
+    """Handle of an enqueued task, states are tracked in the django cache for `TASK_RESULT_TTL` seconds.
+    With a per process cache (e.g. `LocMemCache`), only states of tasks run by the same process are visible.
+    """
+
+    def __init__(self, id: str) -> None:
+        self.id = id
+
+    @property
+    def state(self) -> TaskStateType | None:
+        return cache.get(RESULT_PREFIX + self.id)
+
+    @property
+    def status(self) -> TaskStatusType | None:
+        state = self.state
+        return state["status"] if state is not None else None
+
+    def get(self, timeout: float = 10.0, interval: float = 0.1) -> Any:
+        """Wait for the result of the task.
+
+        Raises:
+            TaskFailed: if the task failed after all its retries
+            TimeoutError: if the task did not finish within `timeout` seconds
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            state = self.state
+            if state is not None and state["status"] == "success":
+                return state["result"]
+            if state is not None and state["status"] == "failure":
+                raise TaskFailed(state["error"])
+            if time.monotonic() >= deadline:
+                raise TimeoutError("Task %s did not finish in time." % self.id)
+            time.sleep(interval)
+
+
+class Task(Generic[P, R]):
+    """A function that can be run in a worker, created by the `task` decorator.
+    Calling it runs the function inline, messages of it are published to the `TASK_BROKER` through the outbox
+    (`modules.core.services.outbox.OutboxService.publish`), committed along with the rows they depend on.
+
+    Attributes:
+    - `name`: unique name, used by workers to find the function
+    - `max_retries`: number of retries after a failure
+    - `retry_delay`: seconds before the first retry, doubled on every retry
+    """
+
+    name: str
+    max_retries: int
+    retry_delay: float
+
+    def __init__(
+        self, func: Callable[P, R], name: str, max_retries: int, retry_delay: float
+    ) -> None:
+        self.func = func
+        self.name = name
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        update_wrapper(self, func)
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        return self.func(*args, **kwargs)
+
+    def get_retry_delay(self, attempt: int) -> float:
+        return self.retry_delay * 2 ** (attempt - 1)
+
+
+def task(
+    name: str | None = None, *, max_retries: int = 3, retry_delay: float = 10.0
+) -> Callable[[Callable[P, R]], Task[P, R]]:
+    """Register a function as a `Task`, modules define their tasks in a `tasks.py`.
+
+    Example:
+    ```
+    @task(max_retries=5)
+    def send_welcome_email(*, email: str, name: str): ...
+
+    OutboxService.publish(send_welcome_email, email=email, name=name)
+    ```
+    """
+
+    def decorator(func: Callable[P, R]) -> Task[P, R]:
+        task_name = name or "%s.%s" % (func.__module__, func.__qualname__)
+        registry[task_name] = Task(func, task_name, max_retries, retry_delay)
+        return registry[task_name]
+
+    return decorator
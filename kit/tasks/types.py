@@ -0,0 +1,20 @@
+from typing import Any, Dict, List, Literal, TypedDict
+
+TaskStatusType = Literal["pending", "running", "retry", "success", "failure"]
+
+
+class TaskMessageType(TypedDict):
+    id: str
+    name: str
+    args: List[Any]
+    kwargs: Dict[str, Any]
+    attempt: int
+
+
+class TaskStateType(TypedDict):
+    id: str
+    name: str
+    status: TaskStatusType
+    attempts: int
+    result: Any
+    error: str | None
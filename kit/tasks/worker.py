@@ -0,0 +1,57 @@
+import logging
+
+from django.db import close_old_connections
+from django.utils.module_loading import autodiscover_modules
+
+from .brokers import get_broker
+from .tasks import registry, store_state
+from .types import TaskMessageType
+
+logger = logging.getLogger(__name__)
+
+TASKS_MODULE_NAME = "tasks"
+
+
+def discover() -> None:
+    "Import the `tasks.py` of every installed module, registering their tasks."
+    autodiscover_modules(TASKS_MODULE_NAME)
+
+
+def execute(message: TaskMessageType) -> None:
+    """Run a single task message. Failures are retried with a backoff, until `max_retries` of the task.
+    Never raises, so that a failing task does not stop the worker.
+    """
+    if message["name"] not in registry:
+        discover()
+    task = registry.get(message["name"])
+    message = {**message, "attempt": message["attempt"] + 1}
+
+    if task is None:
+        logger.error("Unknown task %s, dropping %s.", message["name"], message["id"])
+        store_state(message, "failure", error="Unknown task.")
+        return
+
+    close_old_connections()
+    store_state(message, "running")
+    try:
+        result = task.func(*message["args"], **message["kwargs"])
+    except Exception as exc:
+        if message["attempt"] <= task.max_retries:
+            delay = task.get_retry_delay(message["attempt"])
+            logger.warning(
+                "Task %s (%s) failed, retrying in %ss.",
+                task.name,
+                message["id"],
+                delay,
+                exc_info=True,
+            )
+            store_state(message, "retry", error=repr(exc))
+            get_broker().publish(message, countdown=delay)
+        else:
+            logger.exception("Task %s (%s) failed.", task.name, message["id"])
+            store_state(message, "failure", error=repr(exc))
+        return
+    finally:
+        close_old_connections()
+
+    store_state(message, "success", result=result)
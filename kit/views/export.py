@@ -0,0 +1,155 @@
+import csv
+import itertools
+import json
+from typing import Any, Dict, Iterable, Iterator, List, cast
+
+from django.conf import settings
+from django.core.paginator import Page, Paginator
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+from .exceptions import CustomError
+from .types import ExportFormatType
+
+CONTENT_TYPES: Dict[ExportFormatType, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+# rendered rows are sent in blocks of about this size, instead of one write per row
+BLOCK_SIZE = 64 * 1024
+
+
+class _Echo:
+    "File like object for `csv.writer`, returning the written line instead of buffering it."
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, cls=JSONEncoder, ensure_ascii=False)
+
+
+def _cell(value: Any) -> Any:
+    "Nested values (e.g. file fields, cascaders) are written as JSON in a single CSV cell."
+    if isinstance(value, (dict, list)):
+        return _dumps(value)
+    return value
+
+
+def iter_rows(serializer, chunk_size: int | None = None) -> Iterator[Dict[str, Any]]:
+    """Representation of every row of the queryset of a `kit.views.serializers.BaseModelSerializer`,
+    fetched `chunk_size` rows at a time (a server side cursor on PostgreSQL), never holding the whole queryset.
+    The hooks of `pagination_config` run as for paginated responses, every chunk being a `Page`.
+    """
+    queryset = serializer.instance
+    pagination_config = getattr(serializer, "pagination_config", None) or {}
+    run_before = getattr(
+        serializer, pagination_config.get("run_before_pagination", ""), None
+    )
+    run_after = getattr(
+        serializer, pagination_config.get("run_after_pagination", ""), None
+    )
+    if run_before is not None:
+        run_before(queryset)
+
+    chunk_size = chunk_size or int(getattr(settings, "EXPORT_CHUNK_SIZE", 2000))
+    # only gives the pages their numbers, `count` is not queried unless a hook reads it
+    paginator = Paginator(queryset, chunk_size)
+    iterator = queryset.iterator(chunk_size=chunk_size)
+    for number in itertools.count(1):
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            break
+        if getattr(serializer, "file_fields", None):
+            serializer.prefetch_file_urls(chunk)
+        if run_after is not None:
+            run_after(Page(chunk, number, paginator))
+        for instance in chunk:
+            yield serializer.to_representation(instance)
+
+
+def iter_csv(columns: List[str], rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_cell(row.get(column)) for column in columns])
+
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield _dumps(row) + "\n"
+
+
+def iter_json(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    separator = "["
+    for row in rows:
+        yield separator + _dumps(row)
+        separator = ","
+    yield "[]" if separator == "[" else "]"
+
+
+def _blocks(chunks: Iterable[str]) -> Iterator[bytes]:
+    block: List[str] = []
+    size = 0
+    for chunk in chunks:
+        block.append(chunk)
+        size += len(chunk)
+        if size >= BLOCK_SIZE:
+            yield "".join(block).encode()
+            block, size = [], 0
+    if block:
+        yield "".join(block).encode()
+
+
+def get_export_format(value: str) -> ExportFormatType:
+    """Validate an export format, e.g. from the `EXPORT_FORMAT_PARAM` query param.
+
+    Raises:
+        CustomError: for an unknown format
+    """
+    if value not in CONTENT_TYPES:
+        raise CustomError(
+            "Unknown export format %s, expected one of %s."
+            % (value, ", ".join(CONTENT_TYPES))
+        )
+    return cast(ExportFormatType, value)
+
+
+def get_export_response(
+    serializer,
+    format: ExportFormatType,
+    filename: str | None = None,
+    chunk_size: int | None = None,
+) -> StreamingHttpResponse:
+    """Stream the whole queryset of a `kit.views.serializers.BaseModelSerializer` as CSV, NDJSON or a JSON array.
+    Rows are rendered by the serializer (dynamic keys, cascaders, file fields...), as in paginated responses,
+    and written as they are fetched, so that memory stays flat whatever the number of rows.
+    Queries run while the response is sent, after the view returned.
+
+    Raises:
+        CustomError: for an unknown `format`
+    """
+    format = get_export_format(format)
+    rows = iter_rows(serializer, chunk_size)
+    if format == "csv":
+        columns = [
+            name for name, field in serializer.fields.items() if not field.write_only
+        ]
+        chunks = iter_csv(columns, rows)
+    elif format == "ndjson":
+        chunks = iter_ndjson(rows)
+    else:
+        chunks = iter_json(rows)
+
+    response = StreamingHttpResponse(
+        _blocks(chunks), content_type=CONTENT_TYPES[format]
+    )
+    filename = filename or "%s.%s" % (
+        serializer.Meta.model._meta.model_name,
+        format,
+    )
+    response["Content-Disposition"] = 'attachment; filename="%s"' % filename
+    return response
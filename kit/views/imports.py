@@ -0,0 +1,278 @@
+import csv
+import io
+import itertools
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Type, cast
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, models, router, transaction
+from rest_framework import serializers
+from rest_framework.request import Request
+
+from .exceptions import CustomError, SerializerError
+from .serializers import BaseModelSerializer
+from .types import ImportErrorType, ImportFormatType, ImportReportType
+
+
+class _Rollback(Exception):
+    "Raised inside the transaction of an all or nothing import with errors."
+
+
+def iter_csv_rows(file) -> Iterator[Dict[str, Any]]:
+    "Rows of a CSV (binary) file with a header, read incrementally. Empty cells are missing values."
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        for row in csv.DictReader(text):
+            yield {key: value for key, value in row.items() if value != ""}
+    finally:
+        # the wrapper would close the file of the upload along with itself
+        text.detach()
+
+
+def iter_ndjson_rows(file) -> Iterator[Dict[str, Any] | None]:
+    "Rows of a newline delimited JSON (binary) file, read incrementally. Invalid lines are yielded as `None`."
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else None
+
+
+def iter_rows(file, format: ImportFormatType) -> Iterator[Dict[str, Any] | None]:
+    """Parse an uploaded file incrementally, large uploads are never read as a whole.
+
+    Raises:
+        CustomError: for an unknown `format`
+    """
+    if format == "csv":
+        return iter_csv_rows(file)
+    if format == "ndjson":
+        return iter_ndjson_rows(file)
+    raise CustomError("Unknown import format %s, expected csv or ndjson." % format)
+
+
+class BulkImporter:
+    """Validates rows through a `kit.views.serializers.BaseModelSerializer` in chunks, and creates the valid ones with `bulk_create`.
+    - Related fields (including `added_by`) are resolved with one query per field and chunk, instead of one per row.
+    - Rows are streamed, memory holds a single chunk (and the error report).
+    - With `all_or_nothing`, nothing is created if any row is invalid, otherwise valid rows are created regardless.
+    - Rows violating a database constraint (e.g. a unique one) are reported as invalid, like rows failing validation.
+    - Rows are created as plain instances with `bulk_create`, which bypasses `serializer.create`, `Model.save`,
+      manager helpers (e.g. `create_user` hashing passwords), `post_save` signals and services keeping derived data
+      in step (e.g. `CircleMembershipService` and `Circle.member_count`). Serializers overriding `create` are refused,
+      override `BulkImporter.create` to apply such logic in bulk.
+
+    Attributes:
+    - `serializer_class`: serializer of a single row, it must not have writable many to many or nested fields
+    - `model`: model of the serializer, rows are written to its database (`router.db_for_write`)
+    - `chunk_size`: rows validated and created together, defaults to `IMPORT_CHUNK_SIZE` setting
+    - `max_errors`: errors kept in the report, further invalid rows are only counted
+
+    Example:
+    ```
+    def post(self, request: Request):
+        rows = iter_rows(request.FILES["file"], "csv")
+        return (BulkImporter(MemberSerializer, request=request).run(rows),)
+    ```
+    """
+
+    serializer_class: Type[BaseModelSerializer]
+    model: Type[models.Model]
+    chunk_size: int
+    all_or_nothing: bool
+    max_errors: int
+
+    def __init__(
+        self,
+        serializer_class: Type[BaseModelSerializer],
+        *,
+        request: Request | None = None,
+        context: Dict[str, Any] | None = None,
+        chunk_size: int | None = None,
+        all_or_nothing: bool = False,
+        max_errors: int = 1000,
+    ) -> None:
+        self.serializer_class = serializer_class
+        self.model = cast(Type[models.Model], serializer_class.Meta.model)
+        self.request = request
+        self.context = context or {}
+        self.chunk_size = chunk_size or int(
+            getattr(settings, "IMPORT_CHUNK_SIZE", 1000)
+        )
+        self.all_or_nothing = all_or_nothing
+        self.max_errors = max_errors
+
+    def get_serializer(self) -> BaseModelSerializer:
+        if self.serializer_class.create is not serializers.ModelSerializer.create:
+            raise ImproperlyConfigured(
+                "%s overrides `create`, which bulk imports bypass."
+                % self.serializer_class.__name__
+            )
+        serializer = self.serializer_class(request=self.request, context=self.context)
+        for name, field in serializer.fields.items():
+            if not field.read_only and isinstance(
+                field, (serializers.ManyRelatedField, serializers.BaseSerializer)
+            ):
+                raise ImproperlyConfigured(
+                    "Field %s of %s can not be bulk imported."
+                    % (name, self.serializer_class.__name__)
+                )
+        return serializer
+
+    def run(self, rows: Iterable[Dict[str, Any] | None]) -> ImportReportType:
+        serializer = self.get_serializer()
+        report: ImportReportType = {"total": 0, "created": 0, "failed": 0, "errors": []}
+        if not self.all_or_nothing:
+            # every chunk is written on its own, a long import never holds a single long transaction
+            for chunk in self._chunks(enumerate(rows, start=1)):
+                instances = self.validate_chunk(serializer, chunk, report)
+                report["created"] += self.write(serializer, instances, report)
+            return report
+
+        try:
+            # on the database of the model, which `write` uses as well
+            with transaction.atomic(using=router.db_for_write(self.model)):
+                for chunk in self._chunks(enumerate(rows, start=1)):
+                    instances = self.validate_chunk(serializer, chunk, report)
+                    # once a row failed, the rest is only validated for the report
+                    if not report["failed"]:
+                        report["created"] += self.write(serializer, instances, report)
+                if report["failed"]:
+                    raise _Rollback()
+        except _Rollback:
+            report["created"] = 0
+        return report
+
+    def _chunks(
+        self, rows: Iterable[Tuple[int, Dict[str, Any] | None]]
+    ) -> Iterator[List[Tuple[int, Dict[str, Any] | None]]]:
+        iterator = iter(rows)
+        while chunk := list(itertools.islice(iterator, self.chunk_size)):
+            yield chunk
+
+    def validate_chunk(
+        self,
+        serializer: serializers.ModelSerializer,
+        chunk: List[Tuple[int, Dict[str, Any] | None]],
+        report: ImportReportType,
+    ) -> List[Tuple[int, models.Model]]:
+        "Validate the rows of a chunk, returning unsaved instances of the valid ones, along with their row number."
+        if "added_by" in serializer.fields and self.request is not None:
+            # set by `BaseModelSerializer.run_validation` for new rows, needed before prefetching
+            for _, row in chunk:
+                if row is not None:
+                    row["added_by"] = self.request.user.id
+        self.prefetch_related(serializer, [row for _, row in chunk if row])
+
+        instances = []
+        for number, row in chunk:
+            report["total"] += 1
+            try:
+                if row is None:
+                    raise serializers.ValidationError(
+                        {"non_field_errors": ["Invalid row."]}
+                    )
+                validated_data = serializer.run_validation(row)
+            except (serializers.ValidationError, SerializerError) as exc:
+                self.add_error(report, number, exc.detail)
+                continue
+            instances.append((number, self.model(**validated_data)))
+        return instances
+
+    def prefetch_related(
+        self, serializer: serializers.ModelSerializer, rows: List[Dict[str, Any]]
+    ) -> None:
+        "Resolve the primary keys of every related field of the chunk in one query per field."
+        for name, field in serializer.fields.items():
+            if field.read_only or not isinstance(
+                field, serializers.PrimaryKeyRelatedField
+            ):
+                continue
+            queryset = field.get_queryset()
+            keys = set()
+            for row in rows:
+                if row.get(name) is None:
+                    continue
+                try:
+                    keys.add(queryset.model._meta.pk.to_python(row[name]))
+                except (DjangoValidationError, TypeError):
+                    # malformed keys, reported per row by the field itself
+                    continue
+            lookup = {str(pk): obj for pk, obj in queryset.in_bulk(keys).items()}
+            setattr(field, "to_internal_value", self._lookup(field, lookup))
+
+    def _lookup(
+        self, field: serializers.PrimaryKeyRelatedField, lookup: Dict[str, Any]
+    ):
+        def to_internal_value(data):
+            if field.pk_field is not None:
+                data = field.pk_field.to_internal_value(data)
+            try:
+                if isinstance(data, bool):
+                    raise TypeError
+                key = field.get_queryset().model._meta.pk.to_python(data)
+            except (DjangoValidationError, TypeError):
+                field.fail("incorrect_type", data_type=type(data).__name__)
+            instance = lookup.get(str(key))
+            if instance is None:
+                field.fail("does_not_exist", pk_value=data)
+            return instance
+
+        return to_internal_value
+
+    def write(
+        self,
+        serializer: serializers.ModelSerializer,
+        instances: List[Tuple[int, models.Model]],
+        report: ImportReportType,
+    ) -> int:
+        """Create the valid rows of a chunk, returning the number of created rows.
+        If the chunk violates a database constraint, its rows are created one by one to report the offending ones.
+        """
+        if not instances:
+            return 0
+        using = router.db_for_write(self.model)
+        try:
+            # a savepoint, so that a failed chunk does not break the surrounding transaction
+            with transaction.atomic(using=using):
+                return len(self.create(serializer, [row for _, row in instances]))
+        except IntegrityError:
+            pass
+
+        created = 0
+        for number, instance in instances:
+            try:
+                with transaction.atomic(using=using):
+                    created += len(self.create(serializer, [instance]))
+            except IntegrityError as exc:
+                self.add_error(
+                    report,
+                    number,
+                    {
+                        "non_field_errors": [
+                            "Row conflicts with existing data: %s"
+                            % str(exc).splitlines()[0]
+                        ]
+                    },
+                )
+        return created
+
+    def create(
+        self, serializer: serializers.ModelSerializer, instances: List[models.Model]
+    ) -> List[models.Model]:
+        "Write the valid rows of a chunk, override to write differently (e.g. `ignore_conflicts`)."
+        if not instances:
+            return []
+        return self.model._default_manager.bulk_create(instances)
+
+    def add_error(self, report: ImportReportType, number: int, errors: Any) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < self.max_errors:
+            error: ImportErrorType = {"row": number, "errors": errors}
+            report["errors"].append(error)
@@ -6,42 +6,50 @@ from rest_framework.permissions import BasePermission
 from rest_framework.request import Request
 
 
+def is_authentication_required(view, request: Request) -> bool:
+    "Whether the `authentication` of a view requires an authenticated user for the method of the request."
+    authentication = getattr(view, "authentication", True)
+    method = cast(str, request.method).lower()
+    return (
+        authentication
+        if isinstance(authentication, bool)
+        else authentication.get(method, True)
+    )
+
+
 class APIAccessPermission(BasePermission):
     message = "You are not authorized to access this page!"
     code = status.HTTP_451_UNAVAILABLE_FOR_LEGAL_REASONS
 
     def has_permission(self, request: Request, view):
         if hasattr(view, "access_handler"):
-            authentication = getattr(view, "authentication", True)
             method = cast(str, request.method).lower()
             access_handler = getattr(view, "access_handler", None)
 
-            authentication_required = (
-                authentication
-                if isinstance(authentication, bool)
-                else authentication.get(method, True)
-            )
-
-            if not authentication_required:  # authentication permission is turned off
+            if not is_authentication_required(
+                view, request
+            ):  # authentication permission is turned off
                 return True
 
             if access_handler is None:  # access handler is turned off
                 return True
 
+            if type(access_handler) == dict:
+                access_handler = access_handler.get(method)
+                if access_handler is None:  # access handler is turned off
+                    return True
+
             if type(access_handler) == str:
-                handler = getattr(view, access_handler)
+                handler = getattr(view, access_handler, None)
                 if handler is None:
                     raise ImproperlyConfigured(
                         "Handler %s, does not exists on view %s"
                         "Make sure a valid handler is present on view."
                         % (access_handler, view.__str__())
                     )
-                return handler(view, request)
-            elif type(access_handler) == dict:
-                handler = getattr(access_handler, method)
-                if handler is None:  # access handler is turned off
-                    return True
                 return handler(request)
+            elif callable(access_handler):
+                return access_handler(request)
             else:
                 raise ImproperlyConfigured(
                     "Unknown access_handler type for %s" % (view.__str__())
@@ -54,14 +62,7 @@ class APIAuthenticationPermission(BasePermission):
     code = status.HTTP_401_UNAUTHORIZED
 
     def has_permission(self, request: Request, view):
-        authentication = getattr(view, "authentication", True)
-        method = cast(str, request.method).lower()
-
-        if not (
-            authentication
-            if isinstance(authentication, bool)
-            else authentication.get(method, True)
-        ):
+        if not is_authentication_required(view, request):
             return True
 
         return bool(request.user and request.user.is_authenticated)
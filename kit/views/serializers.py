@@ -1,8 +1,11 @@
+import logging
+from collections import defaultdict
 from functools import cached_property
-from typing import List, Literal, Union
+from typing import Any, Dict, Iterable, List, Literal, Union
 
 from django.conf import settings
 from django.core.paginator import InvalidPage, Page, Paginator
+from django.db.models import Manager
 from django.db.models.query import QuerySet
 from rest_framework import serializers
 from rest_framework.request import Request
@@ -12,10 +15,21 @@ from common.functions import (
     recursive_parent_list,
     recursive_parent_lookup,
 )
+from kit.storage.backends import get_urls
+from kit.storage.types import FileRefType
 
 from .constants import FIELDS_MAPPING
 from .exceptions import SerializerError
-from .types import CascaderType, DynamicKeysType, PaginationConfigType, RecursiveType
+from .export import get_export_format, get_export_response
+from .types import (
+    CascaderType,
+    DynamicKeysType,
+    ExportFormatType,
+    PaginationConfigType,
+    RecursiveType,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class BaseSerializer(serializers.BaseSerializer):
@@ -46,12 +60,14 @@ class BaseSerializer(serializers.BaseSerializer):
 
 
 class BaseModelListSerializer(BaseSerializer, serializers.ListSerializer):
-    """A customized `rest_framework.serializers.ListSerializer` with implemented `update` and `get_paginated_response` method.
+    """A customized `rest_framework.serializers.ListSerializer` with implemented `update`, `get_paginated_response` and `get_export_response` method.
     - `update`:
         - Call the method defined as `update_list_method` on child serializer.
         - If it is set as "default" then execute `update_list`.
     - `get_paginated_response`:
         - Generate paginated response based on child serializer
+    - `get_export_response`:
+        - Stream the whole (searched & sorted) queryset based on child serializer, see `kit.views.export`
     """
 
     def update(self, instance, validated_data):
@@ -66,7 +82,7 @@ class BaseModelListSerializer(BaseSerializer, serializers.ListSerializer):
     def update_list(self, instance, validated_data):
         # Get primary key field name.
         pk = self.child.Meta.model._meta.pk.name
-        print(validated_data)
+        logger.debug("Updating list of %d items", len(validated_data))
         # Maps for pk->instance and pk->data item.
         entry_mapping = {getattr(entry, pk): entry for entry in instance}
         data_mapping = {
@@ -77,19 +93,18 @@ class BaseModelListSerializer(BaseSerializer, serializers.ListSerializer):
         # Perform creations and updates accordingly
         operations = []
         for entry_id, data in data_mapping.items():
-            print("entry__id>>", entry_id)
             entry = entry_mapping.get(entry_id, None)
             if entry is None:
-                print("Create")
+                logger.debug("Creating entry %s", entry_id)
                 operations.append(self.child.create(data))
             else:
-                print("update")
+                logger.debug("Updating entry %s", entry_id)
                 operations.append(self.child.update(entry, data))
 
         # Perform deletions of all objects which are not in validated_data
         for entry_id, entry in entry_mapping.items():
             if entry_id not in data_mapping:
-                print("deleted >> ", entry_id)
+                logger.debug("Deleting entry %s", entry_id)
                 entry.status = "DELETE"
                 entry.save()
         return operations
@@ -143,10 +158,38 @@ class BaseModelListSerializer(BaseSerializer, serializers.ListSerializer):
             },
         }
 
+    def to_internal_value(self, data):
+        prefetch_added_by = getattr(self.child, "prefetch_added_by", None)
+        if callable(prefetch_added_by) and isinstance(data, list):
+            prefetch_added_by(data)
+        return super().to_internal_value(data)
+
+    def get_export_response(
+        self,
+        request: Request | None = None,
+        format: ExportFormatType | None = None,
+        filename: str | None = None,
+    ):
+        """
+        Streaming response of every row, instead of a page. Return it from the handler as is.
+        The format defaults to the `EXPORT_FORMAT_PARAM` query param (e.g. `?export=csv`).
+        """
+        if request is None:
+            request = getattr(self.child, "request")
+        if format is None:
+            format = get_export_format(
+                request.query_params.get(
+                    getattr(settings, "EXPORT_FORMAT_PARAM", "export"), "csv"
+                )
+            )
+        return get_export_response(self.child, format, filename)
+
     def to_representation(self, data):
-        return super().to_representation(
-            data.object_list if isinstance(data, Page) else data
-        )
+        data = data.object_list if isinstance(data, Page) else data
+        if getattr(self.child, "file_fields", None):
+            data = list(data.all() if isinstance(data, Manager) else data)
+            self.child.prefetch_file_urls(data)
+        return super().to_representation(data)
 
 
 class BaseModelSerializer(BaseSerializer, serializers.ModelSerializer):
@@ -219,7 +262,7 @@ class BaseModelSerializer(BaseSerializer, serializers.ModelSerializer):
         if self.search:
             field = self.request.query_params.get(settings.SEARCH_FIELD_PARAM, "")
             query = self.request.query_params.get(settings.SEARCH_QUERY_PARAM, "")
-            print(field, query)
+            logger.debug("Searching %s for %r", field, query)
             if field != "" and query != "":
                 if field in self.searchable_columns:
                     self.instance = self.search_field(field, query)
@@ -255,13 +298,12 @@ class BaseModelSerializer(BaseSerializer, serializers.ModelSerializer):
                 return self.instance
 
         lookup = self.generate_lookup(field, field_name)
-        print(lookup)
         if isinstance(field, serializers.CharField):
             lookup += "__icontains"
 
         if isinstance(field, serializers.DateTimeField):
             lookup += "__date"
-        print(self.instance.filter(**{lookup: query.strip()}), lookup)
+        logger.debug("Search lookup for %s: %s", field_name, lookup)
         try:
             return self.instance.filter(**{lookup: query.strip()})
         except:
@@ -330,13 +372,15 @@ class BaseModelSerializer(BaseSerializer, serializers.ModelSerializer):
             if getattr(self.fields.get(field_name), "source") != ""
             else field_name
         )
-        return recursive_parent_list(
-            getattr_recursive(
-                instance,
-                source,
-            ),
-            "id" if isinstance(field, str) else field.get("field"),
-        )
+        target = getattr_recursive(instance, source)
+        lookup = "id" if isinstance(field, str) else field.get("field")
+        # models can serve the chain from a cache, instead of walking `parent` row by row
+        cached_parent_list = getattr(target, "cached_parent_list", None)
+        if callable(cached_parent_list):
+            parents = cached_parent_list(lookup)
+            if parents is not None:
+                return parents
+        return recursive_parent_list(target, lookup)
 
     def generate_lookup(self, field, field_name):
         source = (
@@ -381,33 +425,10 @@ class BaseModelSerializer(BaseSerializer, serializers.ModelSerializer):
             if field_name in fields.keys():
                 parents = self.get_parent_list(instance, field, field_name)
                 fields[field_name] = parents[1:] if len(parents) > 0 else []
-        for field in self.file_fields:
-            isStr = isinstance(field, str)
-            field_name = field if isStr else field.get("name")
-            if field_name in fields.keys():
-                fields[field_name] = (
-                    {
-                        "url": getattr(
-                            getattr(
-                                getattr_recursive(
-                                    instance, field if isStr else field.get("field")
-                                ),
-                                "file",
-                            ),
-                            "url",
-                        ),
-                        "id": getattr(
-                            getattr_recursive(
-                                instance, field if isStr else field.get("field")
-                            ),
-                            "id",
-                        ),
-                    }
-                    if getattr_recursive(
-                        instance, field if isStr else field.get("field")
-                    )
-                    else None
-                )
+        if self.file_fields:
+            for field_name, upload in self.get_file_objects(instance).items():
+                if field_name in fields.keys():
+                    fields[field_name] = self.format_file(upload)
         for field in self.recursive:
             isStr = isinstance(field, str)
             field_name = field if isStr else field.get("name")
@@ -421,19 +442,50 @@ class BaseModelSerializer(BaseSerializer, serializers.ModelSerializer):
 
         return fields
 
+    def get_request_user_id(self) -> int | None:
+        "Id of the user of `request`, `None` without a request (e.g. a bulk import of a command)."
+        return getattr(getattr(self.request, "user", None), "id", None)
+
     def run_validation(self, data=...):
         if "added_by" in self.fields.keys():
             if not self.instance:
-                data["added_by"] = self.request.user.id
+                data["added_by"] = self.get_request_user_id()
             elif isinstance(self.instance, QuerySet):
                 id = self.Meta.model._meta.pk.name
-                instance = self.instance.filter(**{id: data.get(id, -1)}).first()
-                if instance is None:
-                    data["added_by"] = self.request.user.id
+                added_by = getattr(self, "_prefetched_added_by", None)
+                if added_by is not None:
+                    key = str(data.get(id, -1))
+                    data["added_by"] = (
+                        added_by[key] if key in added_by else self.get_request_user_id()
+                    )
                 else:
-                    data["added_by"] = instance.added_by
+                    instance = self.instance.filter(**{id: data.get(id, -1)}).first()
+                    if instance is None:
+                        data["added_by"] = self.get_request_user_id()
+                    else:
+                        data["added_by"] = instance.added_by
         return super(serializers.ModelSerializer, self).run_validation(data)
 
+    def prefetch_added_by(self, rows):
+        """
+        Load `added_by` of all the existing rows of a list in one query, used by `run_validation` instead of a query per row.
+        Called by `BaseModelListSerializer` before validating the rows.
+        """
+        if "added_by" not in self.fields.keys() or not isinstance(
+            self.instance, QuerySet
+        ):
+            return
+        id = self.Meta.model._meta.pk.name
+        ids = [
+            row[id] for row in rows if isinstance(row, dict) and row.get(id) is not None
+        ]
+        self._prefetched_added_by = {
+            str(key): value
+            for key, value in self.instance.filter(**{"%s__in" % id: ids}).values_list(
+                id, "added_by"
+            )
+        }
+
     def get_filtered_data(self, fields):
         initial_fields = self.fields
         if fields is not None:
@@ -451,19 +503,50 @@ class BaseModelSerializer(BaseSerializer, serializers.ModelSerializer):
             "This function is only callable when queryset is present and many=True is passed in the serializer"
         )
 
+    def get_export_response(self, *args, **kwargs):
+        raise AssertionError(
+            "This function is only callable when queryset is present and many=True is passed in the serializer"
+        )
+
+    def get_file_objects(self, instance) -> Dict[str, Any]:
+        "`UploadFile`s of the `file_fields` of a row, by field name, each resolved once."
+        objects = {}
+        for field in self.file_fields:
+            if isinstance(field, str):
+                objects[field] = getattr_recursive(instance, field)
+            else:
+                objects[field["name"]] = getattr_recursive(instance, field["field"])
+        return objects
+
+    def prefetch_file_urls(self, instances: Iterable[Any]) -> None:
+        "Compute the URLs of the `file_fields` of many rows (e.g. a page) at once, in one batch per storage."
+        files = defaultdict(list)
+        for instance in instances:
+            for upload in self.get_file_objects(instance).values():
+                if upload is not None and upload.file:
+                    files[upload.file.storage].append(self.get_file_ref(upload))
+        self._file_urls = {}
+        for storage, storage_files in files.items():
+            self._file_urls.update(get_urls(storage, storage_files))
+
+    def get_file_ref(self, upload) -> FileRefType:
+        # uploads of the same content share a blob, each is downloaded under its own filename
+        return (upload.file.name, getattr(upload, "filename", None) or None)
+
+    def format_file(self, upload) -> Dict[str, Any] | None:
+        if upload is None:
+            return None
+        file = self.get_file_ref(upload)
+        url = getattr(self, "_file_urls", {}).get(file)
+        if url is None:
+            url = get_urls(upload.file.storage, [file]).get(file, "")
+        return {"url": url, "id": upload.id}
+
     def set_formatted_file_objects(self, instance, column_names: List[str], fields):
         for column_name in column_names:
             if column_name in fields.keys():
-                fields[column_name] = (
-                    {
-                        "url": getattr(
-                            getattr(getattr_recursive(instance, column_name), "file"),
-                            "url",
-                        ),
-                        "id": getattr(getattr(instance, column_name), "id"),
-                    }
-                    if getattr(instance, column_name, None)
-                    else None
+                fields[column_name] = self.format_file(
+                    getattr_recursive(instance, column_name)
                 )
         return fields
 
@@ -0,0 +1,208 @@
+import hashlib
+import math
+import re
+import time
+from threading import Lock
+from typing import Dict, List, Tuple, cast
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import Throttled
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from kit.middleware.queries import get_endpoint
+
+from .types import ThrottleMethodType, ThrottleType
+
+UNITS = {
+    "s": 1,
+    "sec": 1,
+    "m": 60,
+    "min": 60,
+    "h": 3600,
+    "hour": 3600,
+    "d": 86400,
+    "day": 86400,
+}
+RATE_RE = re.compile(r"^(\d+)/(\d*)([a-z]+)$")
+METHODS = ThrottleMethodType.__optional_keys__
+
+# (count of the previous window, count of the current window)
+WindowType = Tuple[int, int]
+
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """Parse a rate such as "10/min" or "3/10min".
+
+    Returns:
+        Tuple[int, int]: number of allowed requests and length of the window in seconds
+    """
+    match = RATE_RE.match(rate.replace(" ", "").lower())
+    if match is None or match.group(3) not in UNITS:
+        raise ValueError("Invalid rate %s" % rate)
+    return int(match.group(1)), int(match.group(2) or 1) * UNITS[match.group(3)]
+
+
+class MemoryThrottleBackend:
+    "Per process counters, enough for a single worker (or as a per worker limit)."
+
+    def __init__(self, max_keys: int = 100000) -> None:
+        self.max_keys = max_keys
+        self._lock = Lock()
+        self._windows: Dict[str, Tuple[int, int, int]] = {}
+
+    def _shift(self, key: str, window: int) -> WindowType:
+        entry = self._windows.get(key)
+        if entry is None or entry[0] < window - 1:
+            return (0, 0)
+        if entry[0] == window - 1:
+            return (entry[2], 0)
+        return (entry[1], entry[2])
+
+    def incr(self, key: str, window: int, seconds: int, delta: int = 1) -> WindowType:
+        "Count a request, returns the counts including it."
+        with self._lock:
+            previous, current = self._shift(key, window)
+            self._windows[key] = (window, previous, current + delta)
+            if len(self._windows) > self.max_keys:
+                self._prune(window)
+            return (previous, current + delta)
+
+    def _prune(self, window: int) -> None:
+        for key in [k for k, v in self._windows.items() if v[0] < window - 1]:
+            del self._windows[key]
+        # still full of active keys, drop the oldest
+        while len(self._windows) > self.max_keys:
+            del self._windows[next(iter(self._windows))]
+
+
+class CacheThrottleBackend:
+    "Counters in the django cache (`CACHES`), shared by all workers when it is redis."
+
+    def _key(self, key: str, window: int) -> str:
+        return "throttle:%s:%s" % (key, window)
+
+    def incr(self, key: str, window: int, seconds: int, delta: int = 1) -> WindowType:
+        "Count a request, returns the counts including it. The increment is atomic with redis."
+        cache_key = self._key(key, window)
+        cache.add(cache_key, 0, timeout=seconds * 2)
+        try:
+            current = cache.incr(cache_key, delta)
+        except ValueError:  # evicted in between
+            current = max(delta, 0)
+            cache.set(cache_key, current, timeout=seconds * 2)
+        return (cache.get(self._key(key, window - 1), 0), current)
+
+
+_backend: MemoryThrottleBackend | CacheThrottleBackend | None = None
+
+
+def get_backend() -> MemoryThrottleBackend | CacheThrottleBackend:
+    "Backend of the `THROTTLE_BACKEND` setting, `memory` or `cache`."
+    global _backend
+    if _backend is None:
+        if getattr(settings, "THROTTLE_BACKEND", "memory") == "cache":
+            _backend = CacheThrottleBackend()
+        else:
+            _backend = MemoryThrottleBackend()
+    return _backend
+
+
+def get_wait(
+    limit: int, seconds: int, elapsed: float, counts: WindowType
+) -> float | None:
+    """Sliding window check of the counts of a key, including the request, against a rate.
+    The window is approximated by weighting the count of the previous fixed window, so each key costs two counters.
+
+    Returns:
+        float | None: seconds to wait, `None` if the request is allowed
+    """
+    previous, current = counts
+    if previous * (1 - elapsed / seconds) + current <= limit:
+        return None
+    # a throttled request is not counted
+    taken = current - 1
+    if taken >= limit:
+        # the current window becomes the previous one, whose weight has to decay enough
+        return seconds - elapsed + seconds * max(1 - (limit - 1) / max(taken, 1), 0)
+    # the weight of the previous window has to decay enough
+    return seconds * (1 - (limit - taken - 1) / previous) - elapsed
+
+
+def check_rate(key: str, rate: str) -> None:
+    """Count a request of `key` against `rate`, for limits that can not be declared on the view.
+
+    Raises:
+        Throttled: handled by `kit.views.exceptions.exception_handler`, with a `Retry-After` header
+    """
+    check_rates([(key, rate)])
+
+
+def check_rates(rates: List[Tuple[str, str]]) -> None:
+    """Same as `check_rate`, the request is counted only if all the rates allow it.
+    Requests are counted before they are checked, so concurrent requests can not all pass the last free slot.
+    The counts of a throttled request are taken back.
+    """
+    backend = get_backend()
+    now = time.time()
+    hits: List[Tuple[str, int, int]] = []
+    waits: List[float] = []
+    for key, rate in rates:
+        limit, seconds = parse_rate(rate)
+        window = int(now // seconds)
+        key = "%s:%s" % (key, seconds)
+        counts = backend.incr(key, window, seconds)
+        hits.append((key, window, seconds))
+        wait = get_wait(limit, seconds, now - window * seconds, counts)
+        if wait is not None:
+            waits.append(wait)
+    if waits:
+        for key, window, seconds in hits:
+            backend.incr(key, window, seconds, -1)
+        raise Throttled(wait=math.ceil(max(waits)))
+
+
+def get_ident(request: Request) -> str:
+    "Address of the client, `X-Forwarded-For` is only read behind the `NUM_PROXIES` of `REST_FRAMEWORK`."
+    if api_settings.NUM_PROXIES is None:
+        return request.META.get("REMOTE_ADDR", "")
+    return BaseThrottle().get_ident(request)
+
+
+def digest(value) -> str:
+    "Keys must not contain (or leak) the raw values, such as emails."
+    return hashlib.sha1(str(value).strip().lower().encode()).hexdigest()[:20]
+
+
+def throttle_request(view, request: Request) -> None:
+    "Check the `throttle` of a `kit.views.views.BaseAPIView` for the method of the request."
+    throttle = getattr(view, "throttle", None)
+    if throttle and set(throttle) & METHODS:
+        throttle = cast(ThrottleMethodType, throttle).get(
+            cast(str, request.method).lower()
+        )
+    if not throttle:
+        return
+
+    throttle = cast(ThrottleType, throttle)
+    # no whitespace, some cache backends reject such keys
+    endpoint = get_endpoint(request._request).replace(" ", "")
+    ident = get_ident(request)
+    rates: List[Tuple[str, str]] = []
+
+    if "ip" in throttle:
+        rates.append(("%s|ip:%s" % (endpoint, ident), throttle["ip"]))
+    if "user" in throttle:
+        user = request.user
+        value = user.pk if user and user.is_authenticated else "ip-%s" % ident
+        rates.append(("%s|user:%s" % (endpoint, value), throttle["user"]))
+    if "route" in throttle:
+        rates.append(("%s|route" % endpoint, throttle["route"]))
+    for field, rate in throttle.get("fields", {}).items():
+        value = request.data.get(field) if hasattr(request.data, "get") else None
+        if value:
+            rates.append(("%s|%s:%s" % (endpoint, field, digest(value)), rate))
+
+    check_rates(rates)
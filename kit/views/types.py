@@ -1,5 +1,5 @@
 from collections.abc import Callable
-from typing import Literal, TypeAlias, TypedDict, Union
+from typing import Any, Literal, TypeAlias, TypedDict, Union
 
 from pydantic import BaseModel
 from rest_framework.request import Request
@@ -21,6 +21,27 @@ class AuthenticationMethodType(TypedDict, total=False):
     delete: bool
 
 
+class ThrottleType(TypedDict, total=False):
+    """Rates (e.g. "10/min", "3/10min") of a single handler, keyed by what is counted.
+    - `ip`: per client ip
+    - `user`: per authenticated user, anonymous requests are counted per ip
+    - `route`: per route, shared by all clients
+    - `fields`: per value of a field in the request body (e.g. `{"email": "3/10min"}`)
+    """
+
+    ip: str
+    user: str
+    route: str
+    fields: dict[str, str]
+
+
+class ThrottleMethodType(TypedDict, total=False):
+    get: ThrottleType
+    post: ThrottleType
+    put: ThrottleType
+    delete: ThrottleType
+
+
 class DynamicKeysType(TypedDict):
     name: str
     source: str
@@ -36,6 +57,26 @@ class RecursiveType(CascaderType):
     index: int
 
 
+ExportFormatType: TypeAlias = Literal["csv", "ndjson", "json"]
+ImportFormatType: TypeAlias = Literal["csv", "ndjson"]
+
+
+class ImportErrorType(TypedDict):
+    row: int
+    errors: Any
+
+
+class ImportReportType(TypedDict):
+    """Outcome of a `kit.views.imports.BulkImporter` run.
+    - `errors`: per row validation errors (rows are numbered from 1), at most `max_errors` of them
+    """
+
+    total: int
+    created: int
+    failed: int
+    errors: list[ImportErrorType]
+
+
 class PaginationConfigType(TypedDict):
     run_before_pagination: str
     run_after_pagination: str
@@ -1,17 +1,33 @@
+import time
 from typing import Union, cast
 
+from django.http.response import HttpResponseBase
 from pydantic import BaseModel
 from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework.serializers import Serializer
+from rest_framework.serializers import BaseSerializer
 from rest_framework.views import APIView as OGAPIView
 
+from kit.db.routers import replica_state
+
 from .constants import STATUS_MAPPING
 from .decorators import extend_base_schema
 from .exceptions import CustomError, PermissionException
-from .permissions import APIAccessPermission, APIAuthenticationPermission
-from .types import APIAccessMethodType, APIAccessType, AuthenticationMethodType
+from .permissions import (
+    APIAccessPermission,
+    APIAuthenticationPermission,
+    is_authentication_required,
+)
+from .throttling import throttle_request
+from .types import (
+    APIAccessMethodType,
+    APIAccessType,
+    AuthenticationMethodType,
+    ThrottleMethodType,
+    ThrottleType,
+)
 
 
 class BaseAPIView(OGAPIView):
@@ -30,15 +46,34 @@ class BaseAPIView(OGAPIView):
         - this function must return True or False, to determine api access.
         - defaults to 'validate_view'
 
+    - `n_plus_one_threshold`: `int` | `None`
+        - number of repetitions of a query shape after which it is flagged as an N+1 candidate.
+        - used by `kit.middleware.queries.QueryInstrumentationMiddleware`, defaults to `QUERY_N_PLUS_ONE_THRESHOLD` setting.
+
+    - `replica_reads`: `bool`
+        - lets `GET` handlers read from the replicas of `DATABASE_REPLICAS`, see `kit.db.routers.ReplicaRouter`.
+        - clients that just wrote still read from the primary, set to `False` for handlers that always need fresh data.
+        - defaults to `True`
+
+    - `throttle`: `kit.views.types.ThrottleType` | `kit.views.types.ThrottleMethodType` | `None`
+        - sliding window rate limits per ip, user, route or request body field, checked by `kit.views.throttling`.
+        - counters are per process, or shared through the django cache with `THROTTLE_BACKEND = "cache"`.
+        - defaults to `None`, no limits
+
     Raises:
     - `PermissionException`: `kit.views.exception.PermissionException`
         - handled by `kit.views.views.exception_handler`.
         - raises `403`, `FORBIDDEN` by default (can be overridden by `message` and `code` on `rest_framework.permissions.BasePermission` class) if the user doesn't have permission to access the API.
+    - `Throttled`: `rest_framework.exceptions.Throttled`
+        - raises `429`, `TOO_MANY_REQUESTS` with a `Retry-After` header, if a `throttle` rate is exceeded.
     """
 
     permission_classes = [APIAuthenticationPermission, APIAccessPermission]
     authentication: Union[bool, AuthenticationMethodType] = True
     access_handler: Union[APIAccessType, APIAccessMethodType, None] = "validate_view"
+    n_plus_one_threshold: int | None = None
+    replica_reads: bool = True
+    throttle: Union[ThrottleType, ThrottleMethodType, None] = None
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
@@ -50,6 +85,35 @@ class BaseAPIView(OGAPIView):
                 handler = extend_base_schema(cls, handler)
                 setattr(cls, method, handler)
 
+    def initial(self, request: Request, *args, **kwargs):
+        "Hook the view specific configuration into the kit middlewares, before running the handler."
+        query_stats = getattr(request._request, "query_stats", None)
+        if query_stats is not None and self.n_plus_one_threshold is not None:
+            query_stats.threshold = self.n_plus_one_threshold
+        state = replica_state.get()
+        if (
+            state is not None
+            and self.replica_reads
+            and request.method in ("GET", "HEAD")
+        ):
+            state.reads = True
+        return super().initial(request, *args, **kwargs)
+
+    def perform_authentication(self, request: Request):
+        """
+        Credentials that fail (e.g. a stale `Bearer` token) only fail the request if the handler requires authentication,
+        public handlers (login, registration, ...) run with an anonymous user instead.
+        """
+        try:
+            super().perform_authentication(request)
+        except AuthenticationFailed:
+            if is_authentication_required(self, request):
+                raise
+
+    def check_throttles(self, request: Request):
+        super().check_throttles(request)
+        throttle_request(self, request)
+
     def permission_denied(self, request, message=None, code=None):
         """
         If request is not permitted, determine what kind of exception to raise.
@@ -75,10 +139,19 @@ class BaseAPIView(OGAPIView):
                 case _:
                     raise ValueError("Invalid response tuple length")
 
-            if isinstance(data, BaseModel):
-                data = data.model_dump()
-            elif isinstance(data, Serializer):
-                data = data.data
+            start = time.perf_counter()
+            try:
+                if isinstance(data, BaseModel):
+                    data = data.model_dump()
+                elif isinstance(data, BaseSerializer):
+                    data = data.data
+            except APIException as exc:
+                # raised while rendering, e.g. by a `kit.auth.tokens.TokenUser` whose user was deleted
+                return super().finalize_response(
+                    request, self.handle_exception(exc), *args, **kwargs
+                )
+            # reported by `kit.middleware.metrics.MetricsMiddleware`
+            setattr(request._request, "serializer_time", time.perf_counter() - start)
 
             default_response_code = (
                 STATUS_MAPPING.get(cast(str, request.method).lower())
@@ -88,7 +161,8 @@ class BaseAPIView(OGAPIView):
                 {"data": data, "message": message},
                 status=default_response_code if status_code is None else status_code,
             )
-        elif not isinstance(response, Response):
+        elif not isinstance(response, HttpResponseBase):
+            # e.g. `StreamingHttpResponse` of `kit.views.export`, passed through as is
             raise ValueError(
                 "Can only return Response or tuple of (data, message, status_code)!"
             )
@@ -0,0 +1,31 @@
+from rest_framework.request import Request
+
+from common.request import BaseRequest
+from kit.views.decorators import extend_schema
+from kit.views.serializers import BaseModelSerializer
+from kit.views.views import BaseAPIView
+from modules.circle.cache import CircleAccessCache
+from modules.circle.models import CircleMember
+
+url_prefix = "<int:circle>/members"
+
+
+class CircleMemberSerializer(BaseModelSerializer):
+    dynamic_keys = ["user.name"]
+
+    class Meta:
+        model = CircleMember
+        fields = ("id", "user", "role", "joined_date")
+
+
+class APIView(BaseAPIView):
+
+    def validate_view(self, request: Request):
+        "Members of the circle only, their roles come from `CircleAccessCache`."
+        return CircleAccessCache.has_role(request, self.kwargs["circle"])
+
+    @extend_schema(CircleMemberSerializer(many=True))
+    def get(self, request: BaseRequest, circle: int):
+        "Members of a circle."
+        members = CircleMember.objects.filter(circle_id=circle).select_related("user")
+        return (CircleMemberSerializer(members.order_by("id"), many=True),)
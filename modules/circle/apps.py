@@ -5,3 +5,9 @@ class BaseConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "modules.circle"
     label = "circle"
+
+    def ready(self):
+        from modules.circle.cache import CircleAccessCache
+        from modules.core.signals import rows_changed
+
+        CircleAccessCache.connect(rows_changed)
@@ -0,0 +1,53 @@
+from kit.benchmarks.runner import BenchmarkCase
+from kit.views.serializers import BaseModelSerializer
+from modules.circle.models import Circle, CircleMember
+from modules.circle.services.membership import CircleMembershipService
+from modules.core.benchmarks import seed_users
+
+
+class CircleMemberBenchmarkSerializer(BaseModelSerializer):
+    dynamic_keys = ["user.name", "circle.name"]
+
+    class Meta:
+        model = CircleMember
+        fields = ("id", "circle", "user", "role", "joined_date")
+
+
+class CircleMemberListBenchmark(BenchmarkCase):
+    name = "circle.serializer.member_list"
+
+    def setup(self) -> None:
+        users = seed_users(self.options["size"])
+        circles = Circle.objects.bulk_create(
+            [
+                Circle(name="bench-%s" % index)
+                for index in range(
+                    max(1, self.options["size"] // self.options["fan_out"])
+                )
+            ]
+        )
+        members = CircleMember.objects.bulk_create(
+            [
+                CircleMember(circle=circles[index % len(circles)], user=user)
+                for index, user in enumerate(users)
+            ]
+        )
+        self.users = users
+        self.queryset = CircleMember.objects.filter(
+            id__in=[member.id for member in members]
+        )
+
+    def run(self) -> None:
+        CircleMemberBenchmarkSerializer(self.queryset.all(), many=True).data
+
+
+class CircleMembershipBenchmark(CircleMemberListBenchmark):
+    "Circles of every seeded user, a single query regardless of `size`."
+
+    name = "circle.membership.circles_for_users"
+
+    def run(self) -> None:
+        CircleMembershipService.circles_for_users(users=self.users)
+
+
+benchmarks = [CircleMemberListBenchmark, CircleMembershipBenchmark]
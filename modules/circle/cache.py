@@ -0,0 +1,157 @@
+import time
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import router, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal
+from rest_framework.request import Request
+
+from modules.circle.choices import CircleRoleTypeChoices
+from modules.circle.models import Circle, CircleMember
+from modules.circle.services.membership import CircleMembershipService
+
+REQUEST_ATTRIBUTE = "circle_roles"
+
+
+class CircleAccessCache:
+    """Roles of the requesting user in their circles (circle id -> `CircleRoleTypeChoices`), for `access_handler`s.
+    - Loaded in one query, then kept on the request, so object level checks of list pages do not query again.
+    - Also kept per process for `CIRCLE_ACCESS_CACHE_TTL` seconds, keyed by user.
+    - Entries of a user are dropped when their memberships are saved or deleted, all entries on bulk writes.
+      They are dropped again once the transaction commits, roles loaded by other threads in between are not kept.
+      Other processes pick up changes within the TTL.
+
+    Example:
+    ```
+    def validate_view(self, request: Request):
+        return CircleAccessCache.has_role(
+            request, self.kwargs["circle"], CircleRoleTypeChoices.ADMIN
+        )
+    ```
+    """
+
+    _lock = Lock()
+    _entries: Dict[Any, Tuple[float, Dict[int, int]]] = {}
+
+    @classmethod
+    def get_roles(cls, request: Request) -> Dict[int, int]:
+        "Roles of the user of the request, empty for anonymous requests. Must not be mutated."
+        http_request = getattr(request, "_request", request)
+        roles = getattr(http_request, REQUEST_ATTRIBUTE, None)
+        if roles is not None:
+            return roles
+
+        user = request.user
+        if user is None or isinstance(user, AnonymousUser) or not user.is_authenticated:
+            roles = {}
+        else:
+            roles = cls._get(user.pk)
+            if roles is None:
+                roles = CircleMembershipService.roles_of_user(user=user)
+                cls._set(user.pk, roles)
+        setattr(http_request, REQUEST_ATTRIBUTE, roles)
+        return roles
+
+    @classmethod
+    def has_role(
+        cls,
+        request: Request,
+        circle: Circle | int,
+        *roles: CircleRoleTypeChoices,
+    ) -> bool:
+        "Whether the user is a member of the circle, with one of `roles` when given. Denied for ids that are not integers."
+        try:
+            circle_id = circle.pk if isinstance(circle, Circle) else int(circle)
+        except (TypeError, ValueError):
+            # e.g. a uuid or slug of the URL
+            return False
+        role = cls.get_roles(request).get(circle_id)
+        return role is not None and (not roles or role in roles)
+
+    @classmethod
+    def circle_ids(cls, request: Request, *roles: CircleRoleTypeChoices) -> List[int]:
+        "Circles of the user, with one of `roles` when given. Filters list pages, e.g. `circle__in=...`."
+        return [
+            circle_id
+            for circle_id, role in cls.get_roles(request).items()
+            if not roles or role in roles
+        ]
+
+    @classmethod
+    def filter_objects(
+        cls,
+        request: Request,
+        objects: Iterable[Any],
+        *roles: CircleRoleTypeChoices,
+        field: str = "circle_id",
+    ) -> List[Any]:
+        "Object level check of a page, keeps the objects whose circle (`field`) passes `has_role`."
+        return [
+            obj for obj in objects if cls.has_role(request, getattr(obj, field), *roles)
+        ]
+
+    @classmethod
+    def _get(cls, user_pk: Any) -> Dict[int, int] | None:
+        entry = cls._entries.get(user_pk)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            cls.invalidate(user_pk)
+            return None
+        return entry[1]
+
+    @classmethod
+    def _set(cls, user_pk: Any, roles: Dict[int, int]) -> None:
+        ttl = getattr(settings, "CIRCLE_ACCESS_CACHE_TTL", 30)
+        max_size = getattr(settings, "CIRCLE_ACCESS_CACHE_MAX_SIZE", 10000)
+        with cls._lock:
+            if len(cls._entries) >= max_size:
+                # oldest first, dicts preserve insertion order
+                cls._entries.pop(next(iter(cls._entries)), None)
+            cls._entries[user_pk] = (time.monotonic() + ttl, roles)
+
+    @classmethod
+    def invalidate(cls, user_pk: Any) -> None:
+        with cls._lock:
+            cls._entries.pop(user_pk, None)
+
+    @classmethod
+    def invalidate_member(cls, instance: CircleMember | None = None, **kwargs) -> None:
+        if instance is not None:
+            user_pk = instance.serializable_value("user")
+            cls.invalidate(user_pk)
+            transaction.on_commit(
+                lambda: cls.invalidate(user_pk),
+                using=router.db_for_write(CircleMember),
+            )
+
+    @classmethod
+    def clear(cls, **kwargs) -> None:
+        cls._clear()
+        transaction.on_commit(cls._clear, using=router.db_for_write(CircleMember))
+
+    @classmethod
+    def _clear(cls) -> None:
+        with cls._lock:
+            cls._entries.clear()
+
+    @classmethod
+    def connect(cls, *bulk_signals: Signal) -> None:
+        "Connect the invalidation receivers, `bulk_signals` are signals of bulk writes to `CircleMember`."
+        post_save.connect(
+            cls.invalidate_member,
+            sender=CircleMember,
+            dispatch_uid="circle:access_cache",
+        )
+        post_delete.connect(
+            cls.invalidate_member,
+            sender=CircleMember,
+            dispatch_uid="circle:access_cache",
+        )
+        for signal in bulk_signals:
+            signal.connect(
+                cls.clear, sender=CircleMember, dispatch_uid="circle:access_cache"
+            )
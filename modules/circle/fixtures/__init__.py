@@ -2,7 +2,7 @@ from pydantic import BaseModel
 
 
 class EmployeeFixtureDataType(BaseModel):
-    username: str
     email: str
+    name: str
     type: int
     password: str
@@ -1,25 +1,44 @@
+from typing import List
+
+from kit.auth.hashing import PasswordHashingPool
+from kit.fixtures.loader import load_rows
+from kit.fixtures.types import FixtureReportType
+from modules.circle.fixtures import EmployeeFixtureDataType
 from modules.core.choices import UserTypeChoices
 from modules.core.models import User
-from modules.hr.base.fixtures import EmployeeFixtureDataType
 
 employee_data = [
     EmployeeFixtureDataType(
-        username="007",
         email="core@kubejen.com",
-        type=UserTypeChoices.EMPLOYEE,
+        name="007",
+        type=UserTypeChoices.USER,
         password="ERP@123",
     )
 ]
 
 
-def add_employee_data():
-    for employee in employee_data:
-        (_user, _) = User.objects.update_or_create(
-            username=employee.username,
-            defaults={
-                "email": employee.email,
-                "type": employee.type,
-            },
+def add_employee_data() -> FixtureReportType:
+    """
+    Create the missing employees and update the name and type of existing ones (matched by email).
+    Passwords are only set on creation, so loading the fixtures on every deploy neither pays
+    for hashing nor resets passwords changed since (which would also revoke their tokens).
+    """
+    passwords = {employee.email: employee.password for employee in employee_data}
+
+    def set_passwords(users: List[User]) -> None:
+        hashed = PasswordHashingPool.make_passwords(
+            [passwords[user.email] for user in users]
         )
-        _user.set_password(employee.password)
-        _user.save()
+        for user, password in zip(users, hashed):
+            user.password = password
+
+    return load_rows(
+        User,
+        [employee.model_dump(exclude={"password"}) for employee in employee_data],
+        key="email",
+        update_fields=("name", "type"),
+        before_create=set_passwords,
+    )
+
+
+fixtures = [add_employee_data]
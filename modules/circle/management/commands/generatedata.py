@@ -0,0 +1,267 @@
+import random
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+
+from kit.fixtures.copy import RowWriter
+from modules.circle.choices import CircleRoleTypeChoices
+from modules.circle.fixtures import EmployeeFixtureDataType
+from modules.circle.models import Circle, CircleMember
+from modules.core.choices import StatusChoices, UserTypeChoices
+from modules.core.fixtures import MasterDropdownFixtureDataType
+from modules.core.models import MasterDropdown, UploadFile, User
+
+DISTRIBUTIONS = ("uniform", "pareto")
+# shape of the 80/20 rule, most circles are small and a few are very large
+PARETO_ALPHA = 1.16
+
+
+def parse_range(value: str) -> Tuple[int, int]:
+    "`n` or `low:high`, inclusive."
+    try:
+        low, _, high = value.partition(":")
+        bounds = (int(low), int(high or low))
+    except ValueError:
+        raise CommandError("Invalid range %r, expected n or low:high." % value)
+    if bounds[0] < 0 or bounds[0] > bounds[1]:
+        raise CommandError("Invalid range %r." % value)
+    return bounds
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users, circles, members, upload files and dropdown trees for load tests. "
+        "Deterministic by seed (run against an empty database), rows are loaded with COPY on PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument(
+            "--profile-image-ratio",
+            type=float,
+            default=0.5,
+            help="Share of users with a profile image (an UploadFile each).",
+        )
+        parser.add_argument("--circles", type=int, default=1000)
+        parser.add_argument(
+            "--members",
+            type=parse_range,
+            default=(2, 200),
+            help="Members per circle, n or low:high.",
+        )
+        parser.add_argument(
+            "--members-distribution",
+            choices=DISTRIBUTIONS,
+            default="pareto",
+            help="pareto: most circles are near the low bound, a few near the high one.",
+        )
+        parser.add_argument(
+            "--admin-ratio", type=float, default=0.05, help="Share of admin members."
+        )
+        parser.add_argument(
+            "--deleted-ratio",
+            type=float,
+            default=0.02,
+            help="Share of soft deleted members, exercising the live row filters.",
+        )
+        parser.add_argument("--trees", type=int, default=1, help="Dropdown trees.")
+        parser.add_argument("--depth", type=int, default=5, help="Dropdown tree depth.")
+        parser.add_argument(
+            "--fan-out",
+            type=parse_range,
+            default=(2, 6),
+            help="Children per dropdown node, n or low:high.",
+        )
+        parser.add_argument(
+            "--password",
+            default="password",
+            help="Password of every user, hashed once.",
+        )
+        parser.add_argument(
+            "--start",
+            type=datetime.fromisoformat,
+            default=datetime(2024, 1, 1),
+            help="Rows are created over the year after this date (ISO format).",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=50000, help="Rows per COPY statement."
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.start = options["start"].replace(tzinfo=dt_timezone.utc)
+        if User.objects.filter(email__endswith=self.email_domain).exists():
+            raise CommandError(
+                "Data of seed %s was already generated, use another --seed."
+                % options["seed"]
+            )
+
+        self.first_ids: Dict[Any, int] = {}
+        self.load(UploadFile, self.files)
+        users = self.load(User, self.users)
+        # member counts are known before the circles are written, from a dry run of the members
+        self.first_ids[Circle] = RowWriter(Circle).next_id()
+        self.member_counts = Counter(
+            row["circle_id"]
+            for row in self.members(0)
+            if row["status"] != StatusChoices.DELETE
+        )
+        self.load(Circle, self.circles)
+        self.load(CircleMember, self.members)
+        self.load(MasterDropdown, self.dropdowns)
+        self.stdout.write(self.style.SUCCESS("Generated data of %s users." % users))
+
+    @property
+    def email_domain(self) -> str:
+        return "@seed-%s.example.com" % self.options["seed"]
+
+    def rng(self, name: str) -> random.Random:
+        "Random generator per kind of rows, so that changing the volume of one kind does not change the others."
+        return random.Random("%s:%s" % (self.options["seed"], name))
+
+    def common(self, rng: random.Random, id: int) -> Dict[str, Any]:
+        created_at = self.start + timedelta(seconds=rng.randrange(365 * 24 * 60 * 60))
+        return {
+            "id": id,
+            "uuid": uuid.UUID(int=rng.getrandbits(128), version=4),
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+    def load(self, model, rows) -> int:
+        "Write the rows of a model, with ids following the existing ones."
+        writer = RowWriter(model, chunk_size=self.options["chunk_size"])
+        self.first_ids.setdefault(model, writer.next_id())
+        started = time.perf_counter()
+        count = writer.write(rows(self.first_ids[model]))
+        writer.reset_sequence()
+        self.stdout.write(
+            "%s: %s rows in %.2fs"
+            % (model._meta.label, count, time.perf_counter() - started)
+        )
+        return count
+
+    def has_image(self) -> Iterable[bool]:
+        "Which users have a profile image, the same sequence for users and files."
+        rng = self.rng("images")
+        ratio = self.options["profile_image_ratio"]
+        return (rng.random() < ratio for _ in range(self.options["users"]))
+
+    def users(self, first_id: int) -> Iterable[Dict[str, Any]]:
+        rng = self.rng("users")
+        seed = self.options["seed"]
+        password = make_password(self.options["password"], salt="generated%s" % seed)
+        next_file_id = self.first_ids[UploadFile]
+        for index, has_image in enumerate(self.has_image()):
+            employee = EmployeeFixtureDataType.model_construct(
+                email="user-%s%s" % (index, self.email_domain),
+                name="User %s" % index,
+                type=UserTypeChoices.USER,
+                password=password,
+            )
+            row = self.common(rng, first_id + index)
+            row.update(employee.model_dump())
+            if has_image:
+                row["profile_image_id"] = next_file_id
+                next_file_id += 1
+            yield row
+
+    def files(self, first_id: int) -> Iterable[Dict[str, Any]]:
+        rng = self.rng("files")
+        files = (index for index, has_image in enumerate(self.has_image()) if has_image)
+        for index, user_index in enumerate(files):
+            row = self.common(rng, first_id + index)
+            row["file"] = "uploads/generated/%s/%s.png" % (user_index, row["uuid"])
+            yield row
+
+    def circles(self, first_id: int) -> Iterable[Dict[str, Any]]:
+        rng = self.rng("circles")
+        for index in range(self.options["circles"]):
+            row = self.common(rng, first_id + index)
+            row.update(
+                name="Circle %s" % index,
+                created_date=row["created_at"].date(),
+                member_count=self.member_counts[row["id"]],
+            )
+            yield row
+
+    def member_count(self, rng: random.Random) -> int:
+        low, high = self.options["members"]
+        if self.options["members_distribution"] == "uniform":
+            count = rng.randint(low, high)
+        else:
+            count = min(high, int(max(low, 1) * rng.paretovariate(PARETO_ALPHA)))
+            count = max(low, count)
+        return min(count, self.options["users"])
+
+    def members(self, first_id: int) -> Iterable[Dict[str, Any]]:
+        rng = self.rng("members")
+        first_user_id = self.first_ids[User]
+        users = range(first_user_id, first_user_id + self.options["users"])
+        next_id = first_id
+        for index in range(self.options["circles"]):
+            for user_id in rng.sample(users, self.member_count(rng)):
+                row = self.common(rng, next_id)
+                row.update(
+                    circle_id=self.first_ids[Circle] + index,
+                    user_id=user_id,
+                    joined_date=row["created_at"].date(),
+                    role=(
+                        CircleRoleTypeChoices.ADMIN
+                        if rng.random() < self.options["admin_ratio"]
+                        else CircleRoleTypeChoices.MEMBER
+                    ),
+                    status=(
+                        StatusChoices.DELETE
+                        if rng.random() < self.options["deleted_ratio"]
+                        else StatusChoices.CREATE
+                    ),
+                )
+                next_id += 1
+                yield row
+
+    def dropdowns(self, first_id: int) -> Iterable[Dict[str, Any]]:
+        "Trees breadth first, so that parents are written before their children."
+        rng = self.rng("dropdowns")
+        depth = self.options["depth"]
+        low, high = self.options["fan_out"]
+        next_id = first_id
+        for tree in range(self.options["trees"]):
+            level: List[Tuple[int | None, MasterDropdownFixtureDataType]] = [
+                (
+                    None,
+                    MasterDropdownFixtureDataType.model_construct(
+                        label="Tree %s" % tree, children=[], max_level=depth, config=0
+                    ),
+                )
+            ]
+            for level_index in range(depth + 1):
+                next_level = []
+                for parent_id, dropdown in level:
+                    row = self.common(rng, next_id)
+                    row.update(dropdown.model_dump(exclude={"children"}))
+                    row["parent_id"] = parent_id
+                    next_id += 1
+                    yield row
+                    if level_index == depth:
+                        continue
+                    for child in range(rng.randint(low, high)):
+                        next_level.append(
+                            (
+                                row["id"],
+                                MasterDropdownFixtureDataType.model_construct(
+                                    label="%s.%s" % (dropdown.label, child),
+                                    children=[],
+                                    max_level=depth - level_index - 1,
+                                    config=0,
+                                ),
+                            )
+                        )
+                level = next_level
@@ -3,13 +3,19 @@ from django.db import models
 
 from common.constants import DEFAULT_ON_DELETE
 from modules.circle.choices import CircleRoleTypeChoices
+from modules.core.choices import StatusChoices
 from modules.core.models.base import ModelBase
 from modules.core.models.user import User
 
+# rows that are not soft deleted, the ones `BaseManager` returns
+LIVE_ROWS = ~models.Q(status=StatusChoices.DELETE)
+
 
 class Circle(ModelBase):
     name = models.CharField(max_length=50)
     created_date = models.DateField(null=True)
+    # live members, maintained by `modules.circle.services.membership.CircleMembershipService`
+    member_count = models.PositiveIntegerField(default=0)
 
 
 class CircleMember(ModelBase):
@@ -28,3 +34,22 @@ class CircleMember(ModelBase):
         default=CircleRoleTypeChoices.MEMBER,
     )
     joined_date = models.DateField(null=True)
+
+    class Meta(ModelBase.Meta):
+        indexes = [
+            *ModelBase.Meta.indexes,
+            # "circles of a user", the unique constraint covers "members of a circle"
+            models.Index(
+                fields=["user", "circle", "role"],
+                condition=LIVE_ROWS,
+                name="circle_member_user_idx",
+            ),
+        ]
+        constraints = [
+            # a user is a member of a circle once, removed members can join again
+            models.UniqueConstraint(
+                fields=["circle", "user"],
+                condition=LIVE_ROWS,
+                name="circle_member_unique_live",
+            ),
+        ]
@@ -0,0 +1,187 @@
+from typing import Dict, Iterable, List
+
+from django.db import router, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from kit.auth.tokens import TokenUser
+from kit.views.exceptions import CustomError
+from modules.circle.choices import CircleRoleTypeChoices
+from modules.circle.models import Circle, CircleMember
+from modules.core.models.user import User
+
+
+class CircleMembershipService:
+    """
+    Membership writes keep `Circle.member_count` in step with the live `CircleMember` rows,
+    reads are batched, a single query whatever the number of users or circles.
+    """
+
+    @classmethod
+    def add_members(
+        cls,
+        *,
+        circle: Circle,
+        users: Iterable[User],
+        role: CircleRoleTypeChoices = CircleRoleTypeChoices.MEMBER,
+        added_by: User | TokenUser | None = None,
+    ) -> List[CircleMember]:
+        """
+        Add users to a circle, users who already are members are left as they are.
+
+        Returns:
+            List[CircleMember]: the new members
+        """
+        user_ids = {user.pk for user in users}
+        with cls._atomic():
+            # concurrent writes to the same circle queue up here, keeping the count exact
+            cls._lock(circle)
+            existing = set(
+                CircleMember.objects.filter(
+                    circle=circle, user_id__in=user_ids
+                ).values_list("user_id", flat=True)
+            )
+            today = timezone.now().date()
+            members = CircleMember.objects.bulk_create(
+                [
+                    CircleMember(
+                        circle=circle,
+                        user_id=user_id,
+                        role=role,
+                        joined_date=today,
+                        # a `TokenUser` is not a model instance, only its id is known
+                        added_by_id=getattr(added_by, "pk", None),
+                    )
+                    for user_id in sorted(user_ids - existing)
+                ]
+            )
+            cls._add_to_count(circle, len(members))
+        return members
+
+    @classmethod
+    def remove_members(cls, *, circle: Circle, users: Iterable[User]) -> int:
+        """
+        Soft delete the memberships of the users in a circle.
+
+        Returns:
+            int: number of removed members
+        """
+        with cls._atomic():
+            cls._lock(circle)
+            removed = CircleMember.objects.filter(
+                circle=circle, user__in=[user.pk for user in users]
+            ).delete()
+            cls._add_to_count(circle, -removed)
+        return removed
+
+    @classmethod
+    def set_role(
+        cls, *, circle: Circle, user: User, role: CircleRoleTypeChoices
+    ) -> None:
+        if not CircleMember.objects.filter(circle=circle, user=user).update(role=role):
+            raise CustomError("User is not a member of this circle.")
+
+    @classmethod
+    def circles_for_users(cls, *, users: Iterable[User]) -> Dict[int, List[int]]:
+        """
+        Circle ids of each user, users without circles are mapped to an empty list.
+
+        Returns:
+            Dict[int, List[int]]: user id -> circle ids
+        """
+        circles: Dict[int, List[int]] = {user.pk: [] for user in users}
+        rows = (
+            CircleMember.objects.filter(user_id__in=list(circles))
+            .order_by("user_id", "circle_id")
+            .values_list("user_id", "circle_id")
+        )
+        for user_id, circle_id in rows:
+            circles[user_id].append(circle_id)
+        return circles
+
+    @classmethod
+    def roles_of_user(
+        cls, *, user: User | TokenUser, circles: Iterable[Circle | int] | None = None
+    ) -> Dict[int, int]:
+        """
+        Roles of a user in their circles, limited to `circles` when given.
+
+        Returns:
+            Dict[int, int]: circle id -> `CircleRoleTypeChoices`
+        """
+        members = CircleMember.objects.filter(user_id=user.pk)
+        if circles is not None:
+            members = members.filter(circle_id__in=cls._pks(circles))
+        return dict(members.values_list("circle_id", "role"))
+
+    @classmethod
+    def is_member_of_any(
+        cls,
+        *,
+        user: User,
+        circles: Iterable[Circle | int],
+        roles: Iterable[CircleRoleTypeChoices] | None = None,
+    ) -> bool:
+        "Whether the user is a member of at least one of the circles, with one of `roles` when given."
+        members = CircleMember.objects.filter(
+            user_id=user.pk, circle_id__in=cls._pks(circles)
+        )
+        if roles is not None:
+            members = members.filter(role__in=list(roles))
+        return members.exists()
+
+    @classmethod
+    def recount(cls, *, circles: Iterable[Circle | int] | None = None) -> int:
+        """
+        Recompute `member_count` from the live members, in a single `UPDATE`.
+        Repairs counts after writes that bypassed this service (e.g. raw `CircleMember` bulk writes).
+
+        Returns:
+            int: number of updated circles
+        """
+        live_members = (
+            CircleMember.objects.filter(circle=OuterRef("pk"))
+            .order_by()
+            .values("circle")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        queryset = Circle.objects.all()
+        if circles is not None:
+            queryset = queryset.filter(pk__in=cls._pks(circles))
+        return queryset.update(
+            member_count=Coalesce(
+                Subquery(live_members, output_field=IntegerField()), 0
+            )
+        )
+
+    @classmethod
+    def _atomic(cls) -> transaction.Atomic:
+        "Transaction on the database of the circles, which may not be the default one (see `DATABASE_MODULES`)."
+        return transaction.atomic(using=router.db_for_write(Circle))
+
+    @classmethod
+    def _pks(cls, circles: Iterable[Circle | int]) -> List[int]:
+        return [
+            circle.pk if isinstance(circle, Circle) else int(circle)
+            for circle in circles
+        ]
+
+    @classmethod
+    def _lock(cls, circle: Circle) -> None:
+        "Lock the circle row, refreshing `member_count` of the instance."
+        circle.member_count = (
+            Circle.objects.select_for_update()
+            .values_list("member_count", flat=True)
+            .get(pk=circle.pk)
+        )
+
+    @classmethod
+    def _add_to_count(cls, circle: Circle, delta: int) -> None:
+        if not delta:
+            return
+        Circle.objects.filter(pk=circle.pk).update(
+            member_count=F("member_count") + delta
+        )
+        circle.member_count += delta
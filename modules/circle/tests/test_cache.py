@@ -0,0 +1,78 @@
+from django.test import RequestFactory, TestCase
+from rest_framework.test import APIClient
+
+from modules.circle.cache import CircleAccessCache
+from modules.circle.choices import CircleRoleTypeChoices
+from modules.circle.models import Circle, CircleMember
+from modules.core.models import User
+
+
+class CircleAccessCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password=None, name="User"
+        )
+        self.circle = Circle.objects.create(name="Circle")
+        CircleAccessCache.clear()
+
+    def get_request(self):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        return request
+
+    def test_has_role(self):
+        CircleMember.objects.create(
+            circle=self.circle, user=self.user, role=CircleRoleTypeChoices.ADMIN
+        )
+        request = self.get_request()
+        self.assertTrue(CircleAccessCache.has_role(request, self.circle))
+        self.assertTrue(
+            CircleAccessCache.has_role(
+                request, str(self.circle.pk), CircleRoleTypeChoices.ADMIN
+            )
+        )
+        self.assertFalse(CircleAccessCache.has_role(request, self.circle.pk + 1))
+
+    def test_has_role_of_invalid_ids(self):
+        request = self.get_request()
+        self.assertFalse(CircleAccessCache.has_role(request, "not-an-id"))
+        self.assertFalse(CircleAccessCache.has_role(request, None))
+
+    def test_roles_loaded_before_the_commit_are_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            CircleMember.objects.create(
+                circle=self.circle, user=self.user, role=CircleRoleTypeChoices.ADMIN
+            )
+            # another request loads the roles before the commit
+            CircleAccessCache._set(self.user.pk, {})
+        self.assertTrue(CircleAccessCache.has_role(self.get_request(), self.circle))
+
+
+class CircleMembersAPITestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password=None, name="User"
+        )
+        self.circle = Circle.objects.create(name="Circle")
+        CircleMember.objects.create(circle=self.circle, user=self.user)
+        CircleAccessCache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_roles_are_loaded_once(self):
+        url = "/v1/circle/%s/members/" % self.circle.pk
+        # roles, members
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]), 1)
+        # roles are kept per process
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_non_members_are_denied(self):
+        other = Circle.objects.create(name="Other")
+        response = self.client.get("/v1/circle/%s/members/" % other.pk)
+        self.assertEqual(response.status_code, 451)
@@ -0,0 +1,41 @@
+from typing import List, Tuple
+
+from django.test import TestCase
+from rest_framework import serializers
+
+from kit.views.export import iter_rows
+from kit.views.serializers import BaseModelSerializer
+from modules.circle.models import Circle
+
+
+class CircleExportSerializer(BaseModelSerializer):
+    position = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Circle
+        fields = ("id", "name", "position")
+
+    def run_before_pagination(self, instance):
+        self.pages: List[Tuple[int, int]] = []
+
+    def run_after_pagination(self, instance):
+        self.pages.append((instance.number, len(instance)))
+        for position, circle in enumerate(instance):
+            setattr(circle, "position", position)
+
+    def get_position(self, instance: Circle) -> int:
+        return getattr(instance, "position")
+
+
+class ExportTestCase(TestCase):
+
+    def test_pagination_hooks_run_per_chunk(self):
+        for index in range(5):
+            Circle.objects.create(name="Circle %s" % index)
+        serializer = CircleExportSerializer(
+            Circle.objects.order_by("id"), many=True
+        ).child
+
+        rows = list(iter_rows(serializer, chunk_size=2))
+        self.assertEqual([row["position"] for row in rows], [0, 1, 0, 1, 0])
+        self.assertEqual(serializer.pages, [(1, 2), (2, 2), (3, 1)])
@@ -0,0 +1,71 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+
+from kit.views.imports import BulkImporter
+from kit.views.serializers import BaseModelSerializer
+from modules.circle.models import Circle, CircleMember
+from modules.circle.services.membership import CircleMembershipService
+from modules.core.models import User
+
+
+class CircleMemberImportSerializer(BaseModelSerializer):
+
+    class Meta:
+        model = CircleMember
+        fields = ("circle", "user", "role", "added_by")
+
+
+class BulkImporterTestCase(TestCase):
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                email="user-%s@example.com" % index, password=None, name="User"
+            )
+            for index in range(5)
+        ]
+        self.circle = Circle.objects.create(name="Circle")
+        CircleMembershipService.add_members(circle=self.circle, users=self.users[:1])
+
+    def rows(self):
+        return [
+            {"circle": self.circle.pk, "user": user.pk, "role": 2}
+            for user in self.users
+        ]
+
+    def test_import(self):
+        rows = self.rows()[1:] + [{"circle": self.circle.pk, "user": 0}, None]
+        report = BulkImporter(CircleMemberImportSerializer, chunk_size=2).run(rows)
+        self.assertEqual(report["total"], 6)
+        self.assertEqual(report["created"], 4)
+        self.assertEqual(
+            [error["row"] for error in report["errors"]],
+            [5, 6],
+        )
+        self.assertEqual(CircleMember.objects.filter(circle=self.circle).count(), 5)
+
+    def test_constraint_violations_are_reported(self):
+        # the first user already is a live member of the circle
+        report = BulkImporter(CircleMemberImportSerializer, chunk_size=2).run(
+            self.rows()
+        )
+        self.assertEqual(report["created"], 4)
+        self.assertEqual(report["failed"], 1)
+        self.assertEqual(report["errors"][0]["row"], 1)
+        self.assertEqual(CircleMember.objects.filter(circle=self.circle).count(), 5)
+
+    def test_all_or_nothing(self):
+        report = BulkImporter(
+            CircleMemberImportSerializer, chunk_size=2, all_or_nothing=True
+        ).run(self.rows())
+        self.assertEqual(report["created"], 0)
+        self.assertEqual(report["failed"], 1)
+        self.assertEqual(CircleMember.objects.filter(circle=self.circle).count(), 1)
+
+    def test_serializers_with_create_are_refused(self):
+        class Serializer(CircleMemberImportSerializer):
+            def create(self, validated_data):
+                return super().create(validated_data)
+
+        with self.assertRaises(ImproperlyConfigured):
+            BulkImporter(Serializer).run(self.rows())
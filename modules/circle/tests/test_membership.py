@@ -0,0 +1,113 @@
+from django.test import TestCase
+
+from kit.auth.tokens import TokenUser, issue_token, verify_token
+from kit.views.exceptions import CustomError
+from modules.circle.choices import CircleRoleTypeChoices
+from modules.circle.models import Circle, CircleMember
+from modules.circle.services.membership import CircleMembershipService
+from modules.core.models import User
+
+
+class CircleMembershipTestCase(TestCase):
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                email="user-%s@example.com" % index, password=None, name="User"
+            )
+            for index in range(4)
+        ]
+        self.circle = Circle.objects.create(name="Circle")
+        self.other = Circle.objects.create(name="Other")
+
+    def test_add_members(self):
+        token = issue_token(self.users[0], "access")
+        admin = TokenUser(verify_token(token, "access"))
+        members = CircleMembershipService.add_members(
+            circle=self.circle, users=self.users[:3], added_by=admin
+        )
+        self.assertEqual(len(members), 3)
+        self.assertEqual(self.circle.member_count, 3)
+        self.assertEqual(members[0].added_by_id, self.users[0].pk)
+
+        # existing members are left as they are
+        members = CircleMembershipService.add_members(
+            circle=self.circle, users=self.users
+        )
+        self.assertEqual(len(members), 1)
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.member_count, 4)
+
+    def test_remove_members(self):
+        CircleMembershipService.add_members(circle=self.circle, users=self.users)
+        removed = CircleMembershipService.remove_members(
+            circle=self.circle, users=self.users[:2]
+        )
+        self.assertEqual(removed, 2)
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.member_count, 2)
+
+        # removed members can join again
+        CircleMembershipService.add_members(circle=self.circle, users=self.users[:1])
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.member_count, 3)
+
+    def test_roles(self):
+        CircleMembershipService.add_members(circle=self.circle, users=self.users[:2])
+        CircleMembershipService.add_members(
+            circle=self.other,
+            users=self.users[:1],
+            role=CircleRoleTypeChoices.ADMIN,
+        )
+        user = self.users[0]
+        self.assertEqual(
+            CircleMembershipService.roles_of_user(user=user),
+            {
+                self.circle.pk: CircleRoleTypeChoices.MEMBER,
+                self.other.pk: CircleRoleTypeChoices.ADMIN,
+            },
+        )
+        self.assertEqual(
+            CircleMembershipService.roles_of_user(user=user, circles=[self.other.pk]),
+            {self.other.pk: CircleRoleTypeChoices.ADMIN},
+        )
+        self.assertTrue(
+            CircleMembershipService.is_member_of_any(
+                user=self.users[1], circles=[self.circle, self.other.pk]
+            )
+        )
+        self.assertFalse(
+            CircleMembershipService.is_member_of_any(
+                user=self.users[1],
+                circles=[self.circle],
+                roles=[CircleRoleTypeChoices.ADMIN],
+            )
+        )
+        self.assertEqual(
+            CircleMembershipService.circles_for_users(users=self.users[:3]),
+            {
+                self.users[0].pk: [self.circle.pk, self.other.pk],
+                self.users[1].pk: [self.circle.pk],
+                self.users[2].pk: [],
+            },
+        )
+
+    def test_set_role_of_non_member(self):
+        with self.assertRaises(CustomError):
+            CircleMembershipService.set_role(
+                circle=self.circle,
+                user=self.users[0],
+                role=CircleRoleTypeChoices.ADMIN,
+            )
+
+    def test_recount(self):
+        CircleMembershipService.add_members(circle=self.circle, users=self.users)
+        # a write bypassing the service
+        CircleMember.objects.filter(circle=self.circle, user=self.users[0]).delete()
+
+        self.assertEqual(
+            CircleMembershipService.recount(circles=[self.circle, self.other.pk]), 2
+        )
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.member_count, 3)
+        self.assertEqual(CircleMembershipService.recount(), 2)
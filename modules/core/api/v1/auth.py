@@ -2,26 +2,44 @@ import base64
 
 from django.contrib.auth import login
 from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import OpenApiExample, OpenApiParameter
+from drf_spectacular.utils import (
+    OpenApiExample,
+    OpenApiParameter,
+    extend_schema_field,
+)
 from rest_framework import serializers
 
 from common.request import BaseRequest
 from kit.views.decorators import extend_schema
+from kit.views.throttling import check_rate, digest
 from kit.views.views import BaseAPIView
 from modules.core.services.auth import AuthService
 
 
+class TokenPairSerializer(serializers.Serializer):
+    access = serializers.CharField()
+    refresh = serializers.CharField()
+    expires_in = serializers.IntegerField(help_text="Lifetime of `access` in seconds.")
+
+
 class UserLoginDetailSerializer(serializers.Serializer):
-    username = serializers.CharField()
+    username = serializers.CharField(source="get_username")
+    tokens = serializers.SerializerMethodField()
+
+    @extend_schema_field(TokenPairSerializer(allow_null=True))
+    def get_tokens(self, _):
+        "Only present on login, when requested with `?tokens=true`."
+        return self.context.get("tokens")
 
 
 class APIView(BaseAPIView):
     authentication = {"post": False}
+    throttle = {"post": {"ip": "20/min"}}
 
     @extend_schema(UserLoginDetailSerializer())
     def get(self, request: BaseRequest):
         "Retrieve user details for the logged in user."
-        return UserLoginDetailSerializer(request.user)
+        return (UserLoginDetailSerializer(request.user),)
 
     @extend_schema(
         UserLoginDetailSerializer(),
@@ -41,15 +59,32 @@ class APIView(BaseAPIView):
                     )
                 ],
             ),
+            OpenApiParameter(
+                name="tokens",
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                description="Also issue signed access & refresh tokens, for `Authorization: Bearer <access>`.",
+            ),
         ],
     )
     def post(self, request: BaseRequest):
         "Login the user with the provided credentials."
         credentials = self.decrypt_auth(request)
+        # credentials are sent in a header, so they can not be declared in `throttle`
+        check_rate(
+            "core.auth|username:%s" % digest(credentials["username"]), "10/10min"
+        )
         user = AuthService.login(credentials=credentials)
         if user is not None:
             login(request, user)
-            return UserLoginDetailSerializer(request.user)
+            tokens = (
+                AuthService.issue_tokens(user=user)
+                if request.query_params.get("tokens") in ("true", "1")
+                else None
+            )
+            return (
+                UserLoginDetailSerializer(request.user, context={"tokens": tokens}),
+            )
 
         self.fail("Credentials were incorrect!")
 
@@ -0,0 +1,34 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse
+
+from common.request import BaseRequest
+from kit.views.decorators import extend_schema
+from kit.views.views import BaseAPIView
+from modules.core.services.upload import UploadService
+
+
+class APIView(BaseAPIView):
+    authentication = False
+    # the signed token grants access, links are opened outside of the app (e.g. in a new tab)
+    authentication_classes = []
+
+    @extend_schema(
+        responses={
+            200: OpenApiResponse(
+                OpenApiTypes.BINARY,
+                description="The file, or a redirect to it.",
+            )
+        },
+        parameters=[
+            OpenApiParameter(
+                name="token",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=True,
+                description="Signed token of the download URL of a file.",
+            ),
+        ],
+    )
+    def get(self, request: BaseRequest):
+        "Download a file of the local storage, through a signed (expiring) URL."
+        return UploadService.download(token=request.query_params.get("token", ""))
@@ -23,6 +23,7 @@ class RegisterPostSerializer(BaseModelSerializer):
 
 class APIView(BaseAPIView):
     authentication = False
+    throttle = {"ip": "10/min", "fields": {"email": "5/10min"}}
 
     @extend_schema(request=RegisterPostSerializer)
     def post(self, request: BaseRequest):
@@ -16,6 +16,8 @@ class SendOTPPostBodySerializer(BaseModelSerializer):
 
 class APIView(BaseAPIView):
     authentication = False
+    # every call writes an otp and sends a mail
+    throttle = {"ip": "10/min", "fields": {"email": "3/10min"}}
 
     @extend_schema(request=SendOTPPostBodySerializer)
     def post(self, request: BaseRequest):
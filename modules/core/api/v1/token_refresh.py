@@ -0,0 +1,28 @@
+from rest_framework import serializers
+
+from common.request import BaseRequest
+from kit.views.decorators import extend_schema
+from kit.views.status import StatusCode
+from kit.views.views import BaseAPIView
+from modules.core.api.v1.auth import TokenPairSerializer
+from modules.core.services.auth import AuthService
+
+
+class TokenRefreshPostSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
+
+
+class APIView(BaseAPIView):
+    authentication = False
+    # the access token is usually expired by now, it must not fail the request
+    authentication_classes = []
+
+    @extend_schema(TokenPairSerializer(), request=TokenRefreshPostSerializer)
+    def post(self, request: BaseRequest):
+        "Exchange a refresh token for a new pair of tokens."
+        input_data = TokenRefreshPostSerializer(data=request.data)
+        input_data.is_valid(raise_exception=True)
+
+        tokens = AuthService.refresh_tokens(**input_data.validated_data)
+
+        return TokenPairSerializer(tokens), StatusCode.X_CREATE_SUCCESSFUL("token")
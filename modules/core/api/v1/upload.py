@@ -0,0 +1,44 @@
+from rest_framework import serializers
+from rest_framework.parsers import MultiPartParser
+
+from common.request import BaseRequest
+from kit.views.decorators import extend_schema
+from kit.views.serializers import BaseModelSerializer
+from kit.views.status import StatusCode
+from kit.views.views import BaseAPIView
+from modules.core.models import UploadFile
+from modules.core.services.upload import UploadService
+
+
+class UploadPostBodySerializer(serializers.Serializer):
+    file = serializers.FileField()
+
+
+class UploadFileSerializer(BaseModelSerializer):
+    url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadFile
+        fields = ("id", "uuid", "url", "filename", "size", "sha256")
+
+    def get_url(self, instance: UploadFile) -> str:
+        file = self.format_file(instance)
+        return file["url"] if file is not None else ""
+
+
+class APIView(BaseAPIView):
+    parser_classes = [MultiPartParser]
+    # every call writes a file
+    throttle = {"user": "60/min"}
+
+    @extend_schema(UploadFileSerializer(), request=UploadPostBodySerializer)
+    def post(self, request: BaseRequest):
+        "Upload a file (`multipart/form-data`), to be referenced by id from other records."
+        input_data = UploadPostBodySerializer(data=request.data)
+        input_data.is_valid(raise_exception=True)
+
+        upload = UploadService.upload(
+            file=input_data.validated_data["file"], added_by=request.user
+        )
+
+        return UploadFileSerializer(upload), StatusCode.X_CREATE_SUCCESSFUL("file")
@@ -13,3 +13,10 @@ class CoreConfig(AppConfig):
     def ready(self):
         parser = cast(ConfigParser, settings.BERSERK_CONFIG_PARSER)
         parser.populate_url_patterns()
+
+        from kit.auth.cache import UserCache
+        from modules.core.services.dropdown import DropdownService
+        from modules.core.signals import rows_changed
+
+        DropdownService.connect()
+        UserCache.connect(rows_changed)
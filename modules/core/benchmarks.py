@@ -0,0 +1,299 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from common.request import BaseRequest
+from kit.auth.hashing import PasswordHashingPool
+from kit.benchmarks.runner import BenchmarkCase
+from kit.views.serializers import BaseModelSerializer
+from kit.views.views import BaseAPIView
+from modules.core.models import MasterDropdown, UploadFile, User
+from modules.core.services.auth import AuthService
+from modules.core.services.otp import OTPService
+
+BENCHMARK_PASSWORD = "Bench@123"
+
+request_factory = APIRequestFactory()
+
+
+def seed_dropdown_tree(depth: int, fan_out: int, limit: int) -> List[MasterDropdown]:
+    """Seed a `MasterDropdown` tree level by level, with at most `limit` nodes per level.
+
+    Returns:
+        List[MasterDropdown]: nodes of the deepest level
+    """
+    level = MasterDropdown.objects.bulk_create(
+        [MasterDropdown(label="bench-0-0", max_level=depth)]
+    )
+    for depth_index in range(1, depth + 1):
+        count = min(len(level) * fan_out, limit)
+        level = MasterDropdown.objects.bulk_create(
+            [
+                MasterDropdown(
+                    label="bench-%s-%s" % (depth_index, index),
+                    parent=level[index % len(level)],
+                    max_level=depth - depth_index,
+                )
+                for index in range(count)
+            ]
+        )
+    return level
+
+
+def seed_users(count: int) -> List[User]:
+    "Seed users with a profile image each, sharing a single precomputed password hash."
+    password = make_password(BENCHMARK_PASSWORD)
+    files = UploadFile.objects.bulk_create(
+        [UploadFile(file="uploads/bench/%s.png" % index) for index in range(count)]
+    )
+    return User.objects.bulk_create(
+        [
+            User(
+                email="bench-%s@example.com" % index,
+                name="Bench User %s" % index,
+                password=password,
+                profile_image=files[index],
+            )
+            for index in range(count)
+        ]
+    )
+
+
+class DropdownBenchmarkSerializer(BaseModelSerializer):
+    root_id: serializers.Field = serializers.PrimaryKeyRelatedField(
+        source="parent", read_only=True
+    )
+
+    dynamic_keys = [
+        "parent.label",
+        {"name": "parent_id_key", "source": "parent.id", "type": "int"},
+    ]
+    cascader = ["parent"]
+    recursive = [{"name": "root_id", "field": "id", "index": 1}]
+
+    class Meta:
+        model = MasterDropdown
+        fields = ("id", "label", "parent", "root_id", "max_level", "config")
+
+
+class DropdownUpdateBenchmarkSerializer(BaseModelSerializer):
+    id = serializers.IntegerField()
+
+    class Meta:
+        model = MasterDropdown
+        fields = ("id", "label")
+
+
+class UserBenchmarkSerializer(BaseModelSerializer):
+    file_fields = ["profile_image"]
+
+    class Meta:
+        model = User
+        fields = ("id", "email", "name", "profile_image")
+
+
+class BenchmarkAPIView(BaseAPIView):
+    authentication = False
+    queryset = MasterDropdown.objects.none()
+
+    def get(self, request: BaseRequest):
+        return DropdownBenchmarkSerializer(self.queryset.all(), many=True), "ok"
+
+
+class DropdownTreeBenchmark(BenchmarkCase):
+    "Base for the cases rendering the leaves of a deep dropdown tree."
+
+    def setup(self) -> None:
+        leaves = seed_dropdown_tree(
+            self.options["depth"], self.options["fan_out"], self.options["size"]
+        )
+        self.queryset = MasterDropdown.objects.filter(
+            id__in=[leaf.pk for leaf in leaves]
+        )
+
+
+class FinalizeResponseBenchmark(DropdownTreeBenchmark):
+    name = "core.finalize_response"
+
+    def setup(self) -> None:
+        super().setup()
+        self.view = BenchmarkAPIView.as_view(queryset=self.queryset)
+
+    def run(self) -> None:
+        self.view(request_factory.get("/")).render()
+
+
+class DropdownListBenchmark(DropdownTreeBenchmark):
+    name = "core.serializer.dropdown_list"
+
+    def run(self) -> None:
+        DropdownBenchmarkSerializer(self.queryset.all(), many=True).data
+
+
+class PaginatedResponseBenchmark(DropdownTreeBenchmark):
+    name = "core.serializer.paginated_response"
+
+    def setup(self) -> None:
+        super().setup()
+        self.request = Request(request_factory.get("/", {"limit": 50, "page": 2}))
+
+    def run(self) -> None:
+        DropdownBenchmarkSerializer(
+            self.queryset.all(), many=True, request=self.request
+        ).get_paginated_response()
+
+
+class SearchSortBenchmark(DropdownTreeBenchmark):
+    name = "core.serializer.search_sort"
+
+    def setup(self) -> None:
+        super().setup()
+        self.request = Request(
+            request_factory.get(
+                "/", {"search_field": "label", "search": "bench", "sort": "-label"}
+            )
+        )
+
+    def run(self) -> None:
+        DropdownBenchmarkSerializer(
+            self.queryset.all(),
+            many=True,
+            request=self.request,
+            search=True,
+            sort=True,
+        ).data
+
+
+class UpdateListBenchmark(DropdownTreeBenchmark):
+    name = "core.serializer.update_list"
+
+    def run(self) -> None:
+        serializer = DropdownUpdateBenchmarkSerializer(
+            self.queryset.all(),
+            data=[
+                {"id": dropdown_id, "label": "bench-updated-%s" % dropdown_id}
+                for dropdown_id in self.queryset.values_list("id", flat=True)
+            ],
+            many=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+
+class FileFieldsBenchmark(BenchmarkCase):
+    name = "core.serializer.file_fields"
+
+    def setup(self) -> None:
+        users = seed_users(self.options["size"])
+        self.queryset = User.objects.filter(id__in=[user.pk for user in users])
+
+    def run(self) -> None:
+        UserBenchmarkSerializer(self.queryset.all(), many=True).data
+
+
+class LoginBenchmark(BenchmarkCase):
+    name = "core.login"
+    iterations = 5
+
+    def setup(self) -> None:
+        (user,) = seed_users(1)
+        self.credentials = {"username": user.email, "password": BENCHMARK_PASSWORD}
+
+    def run(self) -> None:
+        if AuthService.login(credentials=self.credentials) is None:
+            raise AssertionError("Benchmark user could not login!")
+
+    def teardown(self, timings: List[float]) -> None:
+        # logins run one after another, see `PasswordHashingBenchmark` for the throughput of the pool
+        self.extra["logins_per_sec"] = len(timings) / sum(timings)
+
+
+class PasswordHashingBenchmark(BenchmarkCase):
+    "Concurrent password checks through `PasswordHashingPool`, one per pool worker per iteration."
+
+    name = "core.password_hashing"
+    iterations = 5
+
+    def setup(self) -> None:
+        self.encoded = make_password(BENCHMARK_PASSWORD)
+        self.cores = getattr(settings, "PASSWORD_HASHING_WORKERS", 0) or 1
+        self.threads = ThreadPoolExecutor(max_workers=self.cores)
+
+    def run(self) -> None:
+        checks = self.threads.map(
+            PasswordHashingPool.verify_password,
+            [BENCHMARK_PASSWORD] * self.cores,
+            [self.encoded] * self.cores,
+        )
+        if not all(is_correct for is_correct, _ in checks):
+            raise AssertionError("Benchmark password could not be verified!")
+
+    def teardown(self, timings: List[float]) -> None:
+        self.threads.shutdown()
+        self.extra["logins_per_sec"] = self.cores * len(timings) / sum(timings)
+        self.extra["logins_per_sec_per_core"] = (
+            self.extra["logins_per_sec"] / self.cores
+        )
+
+
+class ConnectionSetupBenchmark(BenchmarkCase):
+    """A request on a new connection (what every request pays with `CONN_MAX_AGE = 0` and no pool),
+    compared to a request on a reused connection. With `db_pool`, new connections are taken from the pool.
+    """
+
+    name = "core.connection_setup"
+
+    def run(self) -> None:
+        new_connection = connections.create_connection(DEFAULT_DB_ALIAS)
+        try:
+            with new_connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        finally:
+            new_connection.close()
+
+    def teardown(self, timings: List[float]) -> None:
+        reused: List[float] = []
+        for _ in range(len(timings)):
+            start = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            reused.append(time.perf_counter() - start)
+        self.extra["reused_ms"] = statistics.median(reused) * 1000
+        self.extra["setup_ms"] = (
+            statistics.median(timings) - statistics.median(reused)
+        ) * 1000
+
+
+class OTPFlowBenchmark(BenchmarkCase):
+    name = "core.otp_flow"
+
+    def setup(self) -> None:
+        self.counter = 0
+
+    def run(self) -> None:
+        self.counter += 1
+        email = "bench-otp-%s@example.com" % self.counter
+        otp = OTPService.generate_otp(email=email)
+        OTPService.verify_otp(email=email, otp=otp)
+
+
+benchmarks = [
+    FinalizeResponseBenchmark,
+    DropdownListBenchmark,
+    PaginatedResponseBenchmark,
+    SearchSortBenchmark,
+    UpdateListBenchmark,
+    FileFieldsBenchmark,
+    LoginBenchmark,
+    PasswordHashingBenchmark,
+    ConnectionSetupBenchmark,
+    OTPFlowBenchmark,
+]
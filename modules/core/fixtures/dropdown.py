@@ -1,3 +1,5 @@
+from kit.fixtures.loader import load_tree
+from kit.fixtures.types import FixtureReportType
 from modules.core.enums import ConfigEnum, MasterDropdownEnum
 from modules.core.fixtures import MasterDropdownFixtureDataType
 from modules.core.models import MasterDropdown
@@ -23,21 +25,23 @@ master_dropdown_data = [
 ]
 
 
-def add_master_dropdown_data():
-    def helper(parent: MasterDropdown | None, dropdown: MasterDropdownFixtureDataType):
-        max_level = dropdown.max_level or (parent.max_level - 1 if parent else 0)
-        config = dropdown.config or (parent.config if parent else 0)
-        (_dropdown, _) = MasterDropdown.objects.update_or_create(
-            parent=parent,
-            label=dropdown.label,
-            create_defaults={
-                "max_level": max_level,
-                "config": config,
-            },
-        )
-
-        for child in dropdown.children:
-            helper(_dropdown, child)
-
-    for dropdown in master_dropdown_data:
-        helper(None, dropdown)
+def add_master_dropdown_data() -> FixtureReportType:
+    "Create the missing dropdowns, existing ones (matched by parent and label) are left as they are."
+
+    def values(dropdown: MasterDropdownFixtureDataType, parent: MasterDropdown | None):
+        return {
+            "label": dropdown.label,
+            "max_level": dropdown.max_level or (parent.max_level - 1 if parent else 0),
+            "config": dropdown.config or (parent.config if parent else 0),
+        }
+
+    return load_tree(
+        MasterDropdown,
+        master_dropdown_data,
+        key="label",
+        values=values,
+        children=lambda dropdown: dropdown.children,
+    )
+
+
+fixtures = [add_master_dropdown_data]
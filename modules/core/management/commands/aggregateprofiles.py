@@ -0,0 +1,70 @@
+import fnmatch
+import json
+import os
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Aggregate the profiles stored by the sampling profiler middleware "
+        "into folded stacks, ready for flamegraph.pl or speedscope."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dir",
+            default=getattr(settings, "PROFILER_DIR", os.path.join("logs", "profiles")),
+            help="Folder containing the profiles.",
+        )
+        parser.add_argument(
+            "--route",
+            default=None,
+            help="Glob pattern to select profiles by route template.",
+        )
+        parser.add_argument(
+            "--min-duration",
+            type=float,
+            default=0,
+            help="Only aggregate profiles slower than this (in ms).",
+        )
+        parser.add_argument(
+            "--output", default=None, help="Write the folded stacks to this file."
+        )
+
+    def handle(self, *args, **options):
+        stacks: Counter = Counter()
+        profiles = 0
+        directory = options["dir"]
+
+        for item in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+            if not item.endswith(".json"):
+                continue
+            with open(os.path.join(directory, item), "r") as file:
+                profile = json.load(file)
+
+            meta = profile["meta"]
+            if options["route"] is not None and not fnmatch.fnmatch(
+                meta["route"] or "", options["route"]
+            ):
+                continue
+            if meta["duration_ms"] < options["min_duration"]:
+                continue
+
+            profiles += 1
+            stacks.update(profile["stacks"])
+
+        output = "".join(
+            "%s %d\n" % (stack, count) for stack, count in stacks.most_common()
+        )
+        if options["output"] is not None:
+            with open(options["output"], "w") as file:
+                file.write(output)
+        else:
+            self.stdout.write(output, ending="")
+
+        self.stderr.write(
+            "Aggregated %s profiles into %s distinct stacks." % (profiles, len(stacks))
+        )
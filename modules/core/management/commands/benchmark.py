@@ -0,0 +1,100 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, teardown_databases
+
+from kit.benchmarks.runner import BenchmarkRunner, compare
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the benchmarks of all the modules against a throwaway local database, "
+        "and write a machine readable report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size", type=int, default=200, help="Rows rendered per benchmark."
+        )
+        parser.add_argument(
+            "--depth", type=int, default=5, help="Depth of the seeded dropdown trees."
+        )
+        parser.add_argument(
+            "--fan-out",
+            type=int,
+            default=4,
+            help="Children per dropdown node, and members per circle.",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=None,
+            help="Timed iterations per benchmark. Defaults to the benchmark's own.",
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=2, help="Untimed iterations per benchmark."
+        )
+        parser.add_argument(
+            "--filter", default=None, help="Glob pattern to select benchmarks by name."
+        )
+        parser.add_argument(
+            "--output", default=None, help="Write the JSON report to this file."
+        )
+        parser.add_argument(
+            "--compare", default=None, help="A previous JSON report to compare with."
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.1,
+            help="Allowed slow down ratio when comparing reports.",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Preserve the benchmark database between runs.",
+        )
+
+    def handle(self, *args, **options):
+        runner = BenchmarkRunner(
+            {
+                "size": options["size"],
+                "depth": options["depth"],
+                "fan_out": options["fan_out"],
+                "iterations": options["iterations"],
+                "warmup": options["warmup"],
+            },
+            options["filter"],
+        )
+
+        # same as the test runner, i.e. a `test_` prefixed database on the configured server
+        old_config = setup_databases(
+            options["verbosity"],
+            interactive=False,
+            keepdb=options["keepdb"],
+        )
+        try:
+            report = runner.run()
+        finally:
+            teardown_databases(
+                old_config, verbosity=options["verbosity"], keepdb=options["keepdb"]
+            )
+
+        output = json.dumps(report, indent=2)
+        if options["output"] is not None:
+            with open(options["output"], "w") as file:
+                file.write(output)
+        else:
+            self.stdout.write(output)
+
+        if options["compare"] is not None:
+            with open(options["compare"], "r") as file:
+                previous = json.load(file)
+            regressions = compare(previous, report, options["threshold"])
+            for regression in regressions:
+                self.stderr.write(
+                    "%(name)s: %(metric)s %(previous).3f -> %(current).3f (+%(change).1f%%)"
+                    % {**regression, "change": regression["change"] * 100}
+                )
+            if regressions:
+                raise CommandError("%s benchmark regressions found." % len(regressions))
@@ -2,10 +2,9 @@
 
 import logging
 
-import psycopg2
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db import DEFAULT_DB_ALIAS, connections
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +22,19 @@ class Command(BaseCommand):
                 "database."
             ),
         )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Create every database with AUTO_CREATE (primary & module databases).",
+        )
 
     def handle(self, *args: tuple, **options: str) -> None:
+        if options["all"]:
+            for database, database_config in settings.DATABASES.items():
+                if database_config.get("AUTO_CREATE"):
+                    self.create_db(database)
+            return
+
         selected_database = options["database"]
         database_config = settings.DATABASES[selected_database]
 
@@ -39,28 +49,31 @@ class Command(BaseCommand):
             database_config = settings.DATABASES[database]
             try:
                 db_name = database_config["NAME"]
-                db = psycopg2.connect(
-                    dbname="postgres",
-                    host=database_config.get("HOST"),
-                    user=database_config.get("USER"),
-                    password=database_config.get("PASSWORD"),
-                )
-                db.autocommit = True
+                connection = connections[database]
+                # a short lived connection to the "postgres" database, with the same settings (and driver) as the app,
+                # outside of any pool or persistent connection
+                with connection._nodb_cursor() as cursor:
+                    cursor.execute(
+                        "SELECT 1 FROM pg_database WHERE datname = %s;", [db_name]
+                    )
+                    if not cursor.fetchone():
+                        cursor.execute(
+                            "CREATE DATABASE %s;" % connection.ops.quote_name(db_name)
+                        )
 
-                cursor = db.cursor()
-                cursor.execute(
-                    "SELECT 1 FROM pg_database WHERE datname = '{}';".format(db_name)
-                )
-
-                if not cursor.fetchone():
-                    cursor.execute("CREATE DATABASE {};".format(db_name))
-
-                cursor.close()
-                db.close()
                 self.stdout.write(
                     "Auto-created database '{}'".format(database_config.get("NAME"))
                 )
+
+                schema = database_config.get("SCHEMA")
+                if schema:
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            "CREATE SCHEMA IF NOT EXISTS %s;"
+                            % connection.ops.quote_name(schema)
+                        )
+                    self.stdout.write("Auto-created schema '{}'".format(schema))
                 return True
 
-            except psycopg2.Error as err:
-                self.stderr("Something went wrong: {}".format(err))
+            except DatabaseError as err:
+                self.stderr.write("Something went wrong: {}".format(err))
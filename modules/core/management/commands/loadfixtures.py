@@ -0,0 +1,48 @@
+import fnmatch
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from kit.fixtures.runner import discover
+
+
+class Command(BaseCommand):
+    help = (
+        "Load the fixtures of all the modules. Idempotent, meant to be run on every deploy: "
+        "missing rows are created and changed rows updated in bulk, in one transaction per fixture."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "fixtures",
+            nargs="*",
+            help="Glob patterns of fixture names (e.g. core.dropdown, circle.*). Defaults to all.",
+        )
+
+    def handle(self, *args, **options):
+        loaders = discover()
+        names = [
+            name
+            for name in loaders
+            if not options["fixtures"]
+            or any(fnmatch.fnmatch(name, pattern) for pattern in options["fixtures"])
+        ]
+        if not names:
+            raise CommandError("No fixtures match %s." % ", ".join(options["fixtures"]))
+
+        for name in names:
+            for loader in loaders[name]:
+                start = time.perf_counter()
+                report = loader()
+                self.stdout.write(
+                    "%s.%s: %s created, %s updated, %s unchanged in %.2fs"
+                    % (
+                        name,
+                        loader.__name__,
+                        report["created"],
+                        report["updated"],
+                        report["unchanged"],
+                        time.perf_counter() - start,
+                    )
+                )
+        self.stdout.write(self.style.SUCCESS("Loaded %s fixtures." % len(names)))
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Migrate every configured database (primary & module databases). "
+        "Routers decide which models end up in which database, replicas are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--noinput",
+            "--no-input",
+            action="store_false",
+            dest="interactive",
+            help="Do not prompt the user for input of any kind.",
+        )
+
+    def handle(self, *args, **options):
+        replicas = getattr(settings, "DATABASE_REPLICAS", [])
+        for database in settings.DATABASES:
+            if database in replicas:
+                continue
+            self.stdout.write(self.style.MIGRATE_HEADING("Database %s:" % database))
+            call_command(
+                "migrate",
+                database=database,
+                interactive=options["interactive"],
+                verbosity=options["verbosity"],
+            )
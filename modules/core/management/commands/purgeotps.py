@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from modules.core.models.common import UserOTP
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired OTPs of the database OTP store. "
+        "Meant to be run periodically (e.g. from cron), redis and memory stores expire OTPs on their own."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace",
+            type=int,
+            default=60,
+            help="Keep OTPs for this many minutes after they expired.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows deleted per statement, to keep locks short.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options["grace"])
+        expired = UserOTP.unfiltered_objects.filter(expiry_time__lt=cutoff)
+        total = 0
+        while True:
+            ids = list(expired.values_list("id", flat=True)[: options["batch_size"]])
+            if not ids:
+                break
+            total += UserOTP.unfiltered_objects.filter(id__in=ids).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS("Purged %s expired OTPs." % total))
@@ -0,0 +1,52 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from modules.core.services.outbox import OutboxService
+
+
+class Command(BaseCommand):
+    help = (
+        "Relay the outbox to the task broker, in batches. "
+        "Several relays can run side by side, each picks different rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=100, help="Rows published per batch."
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait, when the outbox is empty.",
+        )
+        parser.add_argument(
+            "--retention",
+            type=int,
+            default=7,
+            help="Delete rows published more than this many days ago, when idle.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the outbox is empty, instead of polling it.",
+        )
+
+    def handle(self, *args, **options):
+        retention = timedelta(days=options["retention"])
+        total = 0
+        try:
+            while True:
+                published = OutboxService.relay(batch_size=options["batch_size"])
+                total += published
+                if published:
+                    continue
+                OutboxService.purge(retention=retention)
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS("Relayed %s outbox rows." % total))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from kit.tasks.brokers import get_broker
+from kit.tasks.worker import discover, execute
+
+
+class Command(BaseCommand):
+    help = "Run a worker consuming the background tasks of the configured task broker."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once the queue is empty, instead of waiting for new tasks.",
+        )
+
+    def handle(self, *args, **options):
+        discover()
+        broker = get_broker()
+        self.stdout.write("Consuming tasks from %s..." % type(broker).__name__)
+        try:
+            broker.consume(execute, burst=options["burst"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS("Worker stopped."))
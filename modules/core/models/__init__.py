@@ -1,6 +1,9 @@
 from .base import DropdownBase, ModelBase
 from .common import (
+    CacheVersion,
     MasterDropdown,
+    Outbox,
+    UploadBlob,
     UploadFile,
 )
 from .user import User
@@ -5,6 +5,7 @@ from django.utils import timezone
 
 from common.constants import DEFAULT_ON_DELETE
 from modules.core.choices import StatusChoices
+from modules.core.signals import rows_changed
 
 
 class BaseQuerySet(QuerySet):
@@ -34,9 +35,23 @@ class BaseQuerySet(QuerySet):
         kwargs.setdefault("status", StatusChoices.UPDATE)
         kwargs.setdefault("updated_at", timezone.now())
 
-        return super().update(
+        rows = super().update(
             **kwargs,
         )
+        rows_changed.send(sender=self.model)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Bulk create and notify `modules.core.signals.rows_changed` listeners."""
+        objs = super().bulk_create(objs, *args, **kwargs)
+        rows_changed.send(sender=self.model)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """Bulk update and notify `modules.core.signals.rows_changed` listeners."""
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        rows_changed.send(sender=self.model)
+        return rows
 
 
 _BaseManager = models.Manager.from_queryset(BaseQuerySet)
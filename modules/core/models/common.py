@@ -1,20 +1,122 @@
 from __future__ import annotations
 
-from django.db import models
+import secrets
+from collections import Counter, defaultdict
+from typing import Dict, List, cast
 
-from .base import DropdownBase, ModelBase
+from django.db import models, router, transaction
+from django.utils.text import get_valid_filename
+
+from common.constants import DEFAULT_ON_DELETE
+
+from .base import BaseManager, BaseQuerySet, DropdownBase, ModelBase
+
+
+class UploadBlob(ModelBase):
+    """The stored content of uploads, one per distinct content, shared by the `UploadFile`s of that content.
+    - `sha256`: hex digest of the content, the blob is stored under a name derived from it
+    - `ref_count`: live `UploadFile`s referencing the blob. Blobs are kept at zero, only their file is removed,
+      so that a new upload of the content and the removal serialize on the row lock.
+    """
+
+    file = models.FileField(max_length=255)
+    size = models.BigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, unique=True)
+    ref_count = models.PositiveIntegerField(default=0)
+
+    @staticmethod
+    def get_name(sha256: str) -> str:
+        "Content addressed name, the same content is always stored under the same name."
+        return "blobs/{0}/{1}".format(sha256[:2], sha256)
+
+    @classmethod
+    def delete_unreferenced(cls, ids: List[int]) -> None:
+        "Remove the files of released blobs, unless their content was uploaded again in the meantime."
+        using = router.db_for_write(cls)
+        storage = cast(models.FileField, cls._meta.get_field("file")).storage
+        with transaction.atomic(using=using):
+            # uploads of the same content wait for the lock, and write the file again afterwards
+            names = (
+                cls.objects.using(using)
+                .select_for_update()
+                .filter(pk__in=ids, ref_count=0)
+                .values_list("file", flat=True)
+            )
+            for name in names:
+                storage.delete(name)
+
+
+class UploadFileQuerySet(BaseQuerySet):
+
+    def delete(self):
+        """Perform soft delete, releasing the reference of each file to its blob.
+        Blobs referenced by no file anymore are removed after the commit.
+
+        Returns:
+            int: The number of records that were updated.
+        """
+        with transaction.atomic(using=self.db):
+            # locks the rows, so that concurrent deletes release a file once
+            files = list(
+                self.model.objects.using(self.db)
+                .select_for_update()
+                .filter(pk__in=list(self.values_list("pk", flat=True)))
+                .values_list("pk", "blob_id")
+            )
+            rows = BaseQuerySet.delete(
+                self.model.objects.using(self.db).filter(pk__in=[pk for pk, _ in files])
+            )
+
+            references = Counter(blob_id for _, blob_id in files if blob_id is not None)
+            blobs: Dict[int, List[int]] = defaultdict(list)
+            for blob_id, count in references.items():
+                blobs[count].append(blob_id)
+            for count, ids in blobs.items():
+                UploadBlob.objects.using(self.db).filter(pk__in=ids).update(
+                    ref_count=models.F("ref_count") - count
+                )
+            released = list(
+                UploadBlob.objects.using(self.db)
+                .filter(pk__in=list(references), ref_count=0)
+                .values_list("pk", flat=True)
+            )
+            if released:
+                transaction.on_commit(
+                    lambda: UploadBlob.delete_unreferenced(released), using=self.db
+                )
+        return rows
+
+
+UploadFileManager = BaseManager.from_queryset(UploadFileQuerySet)
 
 
 class UploadFile(ModelBase):
+    """A file of the default storage (`kit.storage.backends`), written by `modules.core.services.upload.UploadService`.
+    Every upload has its own `UploadFile`, uploads of the same content share its `UploadBlob`.
+    - `filename`: name of the uploaded file, downloads use it
+    - `size`: bytes
+    - `sha256`: hex digest of the content, computed while the upload is streamed to the storage
+    - `blob`: stored content, `None` for files written without `UploadService` (e.g. generated ones)
+    """
 
     def upload_file(instance: UploadFile, filename: str):
-        folder = (
-            instance.added_by.uuid if instance.added_by is not None else "__anonymous__"
+        # random, so that paths can not be guessed or enumerated. Uploads are streamed here until their content is hashed
+        token = secrets.token_urlsafe(18)
+        return "uploads/{0}/{1}/{2}".format(
+            token[:2], token, get_valid_filename(filename)[-100:]
         )
-        # TODO: randomize filename
-        return "uploads/{0}/{1}".format(folder, filename)
 
-    file = models.FileField(upload_to=upload_file)
+    file = models.FileField(upload_to=upload_file, max_length=255)
+    filename = models.CharField(max_length=255, blank=True)
+    size = models.BigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True)
+    blob = models.ForeignKey(
+        UploadBlob,
+        on_delete=DEFAULT_ON_DELETE,
+        null=True,
+        related_name="upload_files",
+    )
+    objects = UploadFileManager()
 
 
 # MasterDropdown Models
@@ -23,6 +125,14 @@ class MasterDropdown(DropdownBase):
     class Meta(DropdownBase.Meta):
         db_table = "core_dropdown"
 
+    def cached_parent_list(self, field: str = "id"):
+        """Ancestors chain served from `modules.core.services.dropdown.DropdownService`.
+        Used by `kit.views.serializers.BaseModelSerializer` for `cascader` and `recursive` fields.
+        """
+        from modules.core.services.dropdown import DropdownService
+
+        return DropdownService.get_parent_list(self.pk, field)
+
 
 class UserOTP(ModelBase):
 
@@ -30,3 +140,53 @@ class UserOTP(ModelBase):
     otp = models.CharField(max_length=6)
     is_verified = models.BooleanField(default=False)
     expiry_time = models.DateTimeField()
+
+    class Meta(ModelBase.Meta):
+        indexes = [
+            *ModelBase.Meta.indexes,
+            # verification only looks for pending OTPs
+            models.Index(
+                fields=["email", "otp"],
+                condition=models.Q(is_verified=False),
+                name="core_userotp_pending_idx",
+            ),
+            # purge of expired OTPs
+            models.Index(fields=["expiry_time"], name="core_userotp_expiry_idx"),
+        ]
+
+
+class Outbox(ModelBase):
+    """Side effects (background tasks of `kit.tasks`) written in the same transaction as the change causing them.
+    Published to the task broker by `modules.core.services.outbox.OutboxService.relay`, at least once.
+    """
+
+    task = models.CharField(max_length=200)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    published_at = models.DateTimeField(null=True)
+
+    class Meta(ModelBase.Meta):
+        db_table = "core_outbox"
+        indexes = [
+            *ModelBase.Meta.indexes,
+            # the relay only scans pending rows, in order
+            models.Index(
+                fields=["id"],
+                condition=models.Q(published_at__isnull=True),
+                name="core_outbox_pending_idx",
+            ),
+            # purge of published rows
+            models.Index(fields=["published_at"], name="core_outbox_published_idx"),
+        ]
+
+
+class CacheVersion(models.Model):
+    """Change counters of `kit.cache.lookup.LookupTableCache`s.
+    Plain model on purpose, counters are neither soft deleted nor audited.
+    """
+
+    name = models.CharField(max_length=200, unique=True)
+    version = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "core_cache_version"
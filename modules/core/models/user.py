@@ -3,6 +3,7 @@ from django.contrib.auth.models import UserManager as OGUserManager
 from django.db import models
 
 from common.constants import DEFAULT_ON_DELETE
+from kit.auth.hashing import PasswordHashingPool
 from modules.core.choices import UserTypeChoices
 
 from .base import BaseManager, ModelBase
@@ -14,7 +15,13 @@ class UserManager(BaseManager, OGUserManager):
 
     def create_user(self, **fields):
         user = self.model(**fields)
-        user.set_password(fields.get("password"))
+        password = fields.get("password")
+        if password is None:
+            user.set_unusable_password()
+        else:
+            user.password = PasswordHashingPool.make_password(password)
+            # same as `set_password`, password validators are notified of the change on save
+            user._password = password
         user.save()
         return user
 
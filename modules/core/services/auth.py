@@ -2,6 +2,9 @@ from typing import cast
 
 from django.contrib.auth import authenticate
 
+from kit.auth.tokens import InvalidToken, issue_token_pair, refresh_token_pair
+from kit.auth.types import TokenPairType
+from kit.views.exceptions import CustomError
 from modules.core.models import User
 
 
@@ -14,6 +17,18 @@ class AuthService:
             return cast(User, user)
         return None
 
+    @classmethod
+    def issue_tokens(cls, *, user: User) -> TokenPairType:
+        "Signed access & refresh tokens, for clients using `kit.auth.authentication.TokenAuthentication`."
+        return issue_token_pair(user)
+
+    @classmethod
+    def refresh_tokens(cls, *, refresh: str) -> TokenPairType:
+        try:
+            return refresh_token_pair(refresh)
+        except InvalidToken as exc:
+            raise CustomError(str(exc))
+
     @classmethod
     def generate_random_password(cls) -> str:
         """
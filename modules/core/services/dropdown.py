@@ -0,0 +1,228 @@
+import copy
+import time
+from threading import Lock, local
+from typing import Any, Dict, List, Tuple, cast
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+
+from modules.core.choices import StatusChoices
+from modules.core.models import MasterDropdown
+from modules.core.signals import rows_changed
+from modules.core.types import DropdownNodeType, SerializedDropdownType
+
+DropdownRowType = Tuple[int, str, int | None, int, int, int]
+
+
+class DropdownForest:
+    """Compact, read only structure of all `MasterDropdown` trees.
+    Ancestors and children are precomputed, so every lookup is O(1).
+
+    Attributes:
+    - `version`: version of the shared cache this forest was built from, `None` if built inside a transaction
+    - `nodes`: id -> `DropdownNodeType`, includes soft deleted nodes (same as walking `parent`)
+    - `roots`: root label (e.g. `MasterDropdownEnum.MODULES`) -> id of the live root node
+    """
+
+    version: int | None
+    nodes: Dict[int, DropdownNodeType]
+    roots: Dict[str, int]
+
+    def __init__(self, version: int | None, rows: List[DropdownRowType]) -> None:
+        self.version = version
+        self.nodes = {}
+        self.roots = {}
+        self._serialized: Dict[int, SerializedDropdownType] = {}
+
+        children: Dict[int, List[int]] = {}
+        for id, label, parent_id, max_level, config, status in rows:
+            if parent_id is not None and status != StatusChoices.DELETE:
+                children.setdefault(parent_id, []).append(id)
+
+        rows_by_id = {row[0]: row for row in rows}
+        ancestors: Dict[int, Tuple[int, ...]] = {}
+
+        def get_ancestors(id: int) -> Tuple[int, ...]:
+            if id not in ancestors:
+                chain: List[int] = []
+                parent_id = rows_by_id[id][2]
+                # iterative, trees can be deep enough to hit the recursion limit
+                while (
+                    parent_id is not None
+                    and parent_id in rows_by_id
+                    and len(chain) < len(rows_by_id)  # guards against cycles
+                ):
+                    if parent_id in ancestors:
+                        chain.extend(reversed((*ancestors[parent_id], parent_id)))
+                        break
+                    chain.append(parent_id)
+                    parent_id = rows_by_id[parent_id][2]
+                ancestors[id] = tuple(reversed(chain))
+            return ancestors[id]
+
+        for id, label, parent_id, max_level, config, status in rows:
+            self.nodes[id] = DropdownNodeType(
+                id,
+                label,
+                parent_id,
+                max_level,
+                config,
+                status,
+                get_ancestors(id),
+                tuple(children.get(id, ())),
+            )
+            if parent_id is None and status != StatusChoices.DELETE:
+                self.roots[label] = id
+
+    def serialize(self, id: int) -> SerializedDropdownType:
+        "Nested representation of the subtree of a node, memoized."
+        if id not in self._serialized:
+            node = self.nodes[id]
+            self._serialized[id] = {
+                "id": node.id,
+                "label": node.label,
+                "max_level": node.max_level,
+                "config": node.config,
+                "children": [self.serialize(child) for child in node.children],
+            }
+        return self._serialized[id]
+
+
+class DropdownService:
+    """Two tier cache of `MasterDropdown` trees.
+    - First tier: a `DropdownForest` per process.
+    - Second tier: the rows in the django cache (`CACHES`, redis in production), shared by all processes.
+
+    Any write to `MasterDropdown` (save, delete, soft delete, `BaseQuerySet.update` and bulk writes) clears the first tier
+    and, after the transaction commits, bumps a version in the django cache.
+    Other processes notice the new version within `VERSION_CHECK_INTERVAL` seconds.
+    Until the commit, the thread that wrote builds its own forests, which may contain uncommitted rows and are never shared.
+    """
+
+    CACHE_PREFIX = "core:dropdown"
+    CACHE_TIMEOUT = 60 * 60 * 24
+    VERSION_CHECK_INTERVAL = 1.0  # seconds
+
+    _lock = Lock()
+    _forest: DropdownForest | None = None
+    _checked_at = 0.0
+    # whether the transaction of the thread wrote to `MasterDropdown`
+    _local = local()
+
+    @classmethod
+    def is_dirty(cls) -> bool:
+        "Whether the thread wrote to `MasterDropdown` in a transaction that is still open."
+        if getattr(cls._local, "dirty", False):
+            if connection.in_atomic_block:
+                return True
+            # rolled back
+            cls._local.dirty = False
+        return False
+
+    @classmethod
+    def get_forest(cls) -> DropdownForest:
+        if cls.is_dirty():
+            # not memoized, a savepoint rollback would go unnoticed
+            return DropdownForest(None, cls._query_rows())
+
+        forest = cls._forest
+        now = time.monotonic()
+        if forest is not None and now - cls._checked_at < cls.VERSION_CHECK_INTERVAL:
+            return forest
+
+        version = cast(int, cache.get_or_set("%s:version" % cls.CACHE_PREFIX, 1, None))
+        cls._checked_at = now
+        if forest is not None and forest.version == version:
+            return forest
+
+        with cls._lock:
+            if cls._forest is None or cls._forest.version != version:
+                cls._forest = DropdownForest(version, cls._load_rows(version))
+            return cls._forest
+
+    @classmethod
+    def _load_rows(cls, version: int) -> List[DropdownRowType]:
+        key = "%s:rows:%s" % (cls.CACHE_PREFIX, version)
+        rows = cache.get(key)
+        if rows is None:
+            rows = cls._query_rows()
+            cache.set(key, rows, cls.CACHE_TIMEOUT)
+        return rows
+
+    @classmethod
+    def _query_rows(cls) -> List[DropdownRowType]:
+        return list(
+            MasterDropdown.unfiltered_objects.order_by("id").values_list(
+                "id", "label", "parent_id", "max_level", "config", "status"
+            )
+        )
+
+    @classmethod
+    def get_tree(cls, label: str) -> SerializedDropdownType | None:
+        "Serialized tree of a root label, such as `MasterDropdownEnum.MODULES`. A copy, the forest memoizes it."
+        forest = cls.get_forest()
+        root = forest.roots.get(label)
+        return copy.deepcopy(forest.serialize(root)) if root is not None else None
+
+    @classmethod
+    def get_node(cls, id: int) -> DropdownNodeType | None:
+        return cls.get_forest().nodes.get(id)
+
+    @classmethod
+    def get_children(cls, id: int) -> List[DropdownNodeType]:
+        forest = cls.get_forest()
+        node = forest.nodes.get(id)
+        return [forest.nodes[child] for child in node.children] if node else []
+
+    @classmethod
+    def get_ancestors(cls, id: int) -> List[DropdownNodeType]:
+        "Ancestors of a node, root first."
+        forest = cls.get_forest()
+        node = forest.nodes.get(id)
+        return [forest.nodes[parent] for parent in node.ancestors] if node else []
+
+    @classmethod
+    def get_parent_list(cls, id: int, field: str = "id") -> List[Any] | None:
+        """Same as `common.functions.recursive_parent_list`, without walking `parent` row by row.
+
+        Returns:
+            List[Any] | None: `field` of every ancestor and the node itself,
+            `None` if the node is not cached or the thread has uncommitted writes (a forest would be built per call)
+        """
+        if cls.is_dirty():
+            return None
+        forest = cls.get_forest()
+        node = forest.nodes.get(id)
+        if node is None or field not in DropdownNodeType._fields:
+            return None
+        return [getattr(forest.nodes[parent], field) for parent in node.ancestors] + [
+            getattr(node, field)
+        ]
+
+    @classmethod
+    def invalidate(cls, **kwargs) -> None:
+        cls._forest = None
+        if connection.in_atomic_block:
+            cls._local.dirty = True
+        transaction.on_commit(cls._bump_version)
+
+    @classmethod
+    def _bump_version(cls) -> None:
+        key = "%s:version" % cls.CACHE_PREFIX
+        try:
+            cache.incr(key)
+        except ValueError:  # missing or evicted
+            cache.set(key, int(time.time()), None)
+        cls._forest = None
+        cls._local.dirty = False
+
+    @classmethod
+    def connect(cls) -> None:
+        "Connect the invalidation receivers, called from `modules.core.apps.CoreConfig.ready`."
+        for signal in (post_save, post_delete, rows_changed):
+            signal.connect(
+                cls.invalidate,
+                sender=MasterDropdown,
+                dispatch_uid="%s:invalidate" % cls.CACHE_PREFIX,
+            )
@@ -1,45 +1,43 @@
-from datetime import timedelta
 from random import randint
 
-from django.utils import timezone
+from django.db import transaction
 
 from kit.views.exceptions import CustomError
-from modules.core.models.common import UserOTP
 from modules.core.models.user import User
+from modules.core.services.outbox import OutboxService
+from modules.core.stores import get_otp_store
+from modules.core.tasks import send_otp_email
 
 
 class OTPService:
     EXPIRY_TIME = 5  # minutes
 
     @classmethod
-    def generate_otp(cls, *, email: str) -> UserOTP:
+    def generate_otp(cls, *, email: str) -> str:
         """
-        Generate a 6-digit OTP and save it to the database.
+        Generate a 6-digit OTP and save it to the OTP store, replacing any previous OTP of the email.
+        The email is sent in the background, through the outbox.
         """
         if User.objects.filter(email=email).exists():
             raise CustomError("User with this email already exists.")
 
         otp = str(randint(100000, 999999))
-        expiry_time = timezone.now() + timedelta(minutes=cls.EXPIRY_TIME)
-
-        UserOTP.objects.filter(email=email).delete()
-        user_otp = UserOTP.objects.create(email=email, otp=otp, expiry_time=expiry_time)
-        return user_otp
+        with transaction.atomic():
+            get_otp_store().save(email, otp, cls.EXPIRY_TIME * 60)
+            OutboxService.publish(
+                send_otp_email, email=email, expiry_time=cls.EXPIRY_TIME
+            )
+        return otp
 
     @classmethod
     def verify_otp(cls, *, email: str, otp: str) -> bool:
         """
-        Verify the OTP for the given email.
+        Verify the OTP for the given email, an OTP can only be verified once.
         """
-        try:
-            user_otp = UserOTP.objects.get(email=email, otp=otp, is_verified=False)
-        except UserOTP.DoesNotExist:
+        result = get_otp_store().consume(email, otp)
+        if result == "invalid":
             raise CustomError("Invalid OTP or email.")
-
-        if timezone.now() > user_otp.expiry_time:
+        if result == "expired":
             raise CustomError("OTP has expired.")
 
-        user_otp.is_verified = True
-        user_otp.save()
-
         return True
@@ -0,0 +1,82 @@
+import logging
+from datetime import timedelta
+from typing import List
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from kit.tasks.brokers import get_broker
+from kit.tasks.tasks import Task, TaskResult, store_state
+from kit.tasks.types import TaskMessageType
+from modules.core.models import Outbox
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxService:
+
+    @classmethod
+    def publish(cls, task: Task, *args, **kwargs) -> TaskResult:
+        """
+        Record a task in the outbox, committed (or rolled back) along with the surrounding transaction.
+        With `OUTBOX_DISPATCH_ON_COMMIT`, the row is relayed right after the commit, otherwise by the `relayoutbox` command.
+        """
+        row = Outbox.objects.create(task=task.name, args=list(args), kwargs=kwargs)
+        message = cls.get_message(row)
+        store_state(message, "pending")
+        if getattr(settings, "OUTBOX_DISPATCH_ON_COMMIT", False):
+            transaction.on_commit(lambda: cls.relay(ids=[row.pk]))
+        return TaskResult(message["id"])
+
+    @classmethod
+    def get_message(cls, row: Outbox) -> TaskMessageType:
+        # the uuid of the row identifies the message, so consumers can detect redeliveries
+        return {
+            "id": str(row.uuid),
+            "name": row.task,
+            "args": row.args,
+            "kwargs": row.kwargs,
+            "attempt": 0,
+        }
+
+    @classmethod
+    def relay(cls, *, batch_size: int = 100, ids: List[int] | None = None) -> int:
+        """
+        Publish a batch of pending rows to the task broker, and mark them as published.
+        Rows are locked with `SKIP LOCKED`, so that concurrent relays never pick the same rows.
+        A crash between publishing and committing republishes the rows, delivery is at least once.
+
+        Returns:
+            int: number of published rows
+        """
+        with transaction.atomic():
+            pending = Outbox.objects.select_for_update(skip_locked=True).filter(
+                published_at__isnull=True
+            )
+            if ids is not None:
+                pending = pending.filter(id__in=ids)
+            rows = list(pending.order_by("id")[:batch_size])
+
+            published: List[int] = []
+            broker = get_broker()
+            for row in rows:
+                try:
+                    broker.publish(cls.get_message(row))
+                except Exception:
+                    # keep the order, the rest of the batch is retried on the next run
+                    logger.exception("Could not publish outbox row %s.", row.id)
+                    break
+                published.append(row.id)
+
+            if published:
+                Outbox.objects.filter(id__in=published).update(
+                    published_at=timezone.now()
+                )
+        return len(published)
+
+    @classmethod
+    def purge(cls, *, retention: timedelta) -> int:
+        "Delete rows published more than `retention` ago."
+        cutoff = timezone.now() - retention
+        return Outbox.unfiltered_objects.filter(published_at__lt=cutoff).delete()[0]
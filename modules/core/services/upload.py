@@ -0,0 +1,100 @@
+from typing import cast
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.uploadedfile import UploadedFile
+from django.db import IntegrityError, models, router, transaction
+from django.db.models import F
+from django.http.response import HttpResponseBase
+from django.utils.text import get_valid_filename
+
+from kit.auth.tokens import TokenUser
+from kit.storage.backends import LocalStorage, get_storage
+from kit.storage.types import StoredFileType
+from kit.views.exceptions import CustomError
+from modules.core.models import UploadBlob, UploadFile, User
+
+
+class UploadService:
+
+    @classmethod
+    def upload(
+        cls, *, file: UploadedFile, added_by: User | TokenUser | None = None
+    ) -> UploadFile:
+        """
+        Stream an uploaded file to the default storage chunk by chunk, hashing it on the way.
+        The file is never read into memory as a whole, large uploads are spooled to disk by django and copied from there.
+        A content is stored once (see `UploadBlob`), but every upload gets its own `UploadFile`,
+        so the id, filename and `added_by` of an upload do not tell whether someone else uploaded the same content.
+        """
+        max_size = getattr(settings, "UPLOAD_MAX_SIZE", None)
+        if max_size is not None and file.size > max_size:
+            raise CustomError("File is larger than %s MB." % (max_size // 2**20))
+
+        storage = get_storage()
+        # the name is only known once the content was hashed, it is streamed under a random one first
+        filename = get_valid_filename(file.name or "file")[-100:]
+        field = cast(models.FileField, UploadFile._meta.get_field("file"))
+        name = field.generate_filename(UploadFile(), filename)
+        stored = storage.save_stream(name, file)
+
+        moved = False
+        try:
+            with transaction.atomic(using=router.db_for_write(UploadBlob)):
+                # the blob row is locked until the commit, a release of the same content waits for it,
+                # and finds the new reference once it removes unreferenced blobs
+                blob = cls.acquire_blob(stored)
+                if blob.ref_count == 1:
+                    # new content, or a released one whose file is removed
+                    storage.move(name, blob.file.name)
+                    moved = True
+                return UploadFile.objects.create(
+                    file=blob.file.name,
+                    filename=filename,
+                    blob=blob,
+                    size=stored["size"],
+                    sha256=stored["sha256"],
+                    # a `TokenUser` is not a model instance, only its id is known
+                    added_by_id=getattr(added_by, "pk", None),
+                )
+        finally:
+            if not moved:
+                storage.delete(name)
+
+    @classmethod
+    def acquire_blob(cls, stored: StoredFileType) -> UploadBlob:
+        "Take a reference of the blob of a content, locking its row. Must run in a transaction."
+        blobs = UploadBlob.objects.select_for_update()
+        blob = blobs.filter(sha256=stored["sha256"]).first()
+        if blob is None:
+            try:
+                with transaction.atomic(using=blobs.db):
+                    return UploadBlob.objects.create(
+                        file=UploadBlob.get_name(stored["sha256"]),
+                        size=stored["size"],
+                        sha256=stored["sha256"],
+                        ref_count=1,
+                    )
+            except IntegrityError:
+                # the same content was uploaded concurrently
+                blob = blobs.get(sha256=stored["sha256"])
+        blobs.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+        blob.ref_count += 1
+        return blob
+
+    @classmethod
+    def download(cls, *, token: str) -> HttpResponseBase:
+        """
+        Serve the file of a signed download URL of the local storage, with the web server when `sendfile` is set.
+        Files of s3 are downloaded from the bucket directly, through presigned URLs.
+        """
+        storage = get_storage()
+        if not isinstance(storage, LocalStorage):
+            raise CustomError("Link is invalid or has expired.")
+        try:
+            name, filename = storage.verify_token(token)
+        except signing.BadSignature:
+            raise CustomError("Link is invalid or has expired.")
+        if not storage.exists(name):
+            raise CustomError("File does not exist.")
+        return storage.download_response(name, filename)
@@ -1,5 +1,9 @@
+from django.db import transaction
+
 from kit.views.exceptions import CustomError
 from modules.core.models.user import User
+from modules.core.services.outbox import OutboxService
+from modules.core.tasks import send_welcome_email
 
 
 class UserService:
@@ -16,10 +20,12 @@ class UserService:
         if User.objects.filter(email=email).exists():
             raise CustomError("A user with this email already exists!")
 
-        user = User.objects.create_user(
-            email=email,
-            password=password,
-            name=name,
-        )
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email=email,
+                password=password,
+                name=name,
+            )
+            OutboxService.publish(send_welcome_email, email=email, name=name)
 
         return user
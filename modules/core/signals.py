@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent by `modules.core.models.base.BaseQuerySet` for bulk writes, which bypass `post_save`/`post_delete`.
+# i.e. `update` (including soft `delete`), `bulk_create` and `bulk_update`, with the model class as sender.
+rows_changed = Signal()
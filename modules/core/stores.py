@@ -0,0 +1,120 @@
+import time
+from datetime import timedelta
+from threading import Lock
+from typing import Dict, Literal, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+from kit.cache.redis import get_redis_client
+from modules.core.models.common import UserOTP
+
+OTPCheckType = Literal["valid", "invalid", "expired"]
+
+
+class MemoryOTPStore:
+    "Expiring map of email -> otp, for a single process (e.g. local development)."
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._otps: Dict[str, Tuple[str, float]] = {}
+
+    def save(self, email: str, otp: str, ttl: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for key in [k for k, v in self._otps.items() if v[1] <= now]:
+                del self._otps[key]
+            self._otps[email] = (otp, now + ttl)
+
+    def get(self, email: str) -> str | None:
+        with self._lock:
+            entry = self._otps.get(email)
+        return entry[0] if entry is not None and entry[1] > time.monotonic() else None
+
+    def consume(self, email: str, otp: str) -> OTPCheckType:
+        with self._lock:
+            entry = self._otps.get(email)
+            if entry is None or not constant_time_compare(entry[0], otp):
+                return "invalid"
+            del self._otps[email]
+            return "expired" if entry[1] <= time.monotonic() else "valid"
+
+
+class RedisOTPStore:
+    """OTPs as redis keys with a native TTL, shared by all processes.
+    Expired OTPs disappear on their own, so they are reported as invalid.
+    An OTP is consumed by the first verification, right or wrong.
+    """
+
+    PREFIX = "otp:"
+
+    def __init__(self, url: str) -> None:
+        self.client = get_redis_client(url)
+
+    def save(self, email: str, otp: str, ttl: int) -> None:
+        self.client.set(self.PREFIX + email, otp, ex=ttl)
+
+    def get(self, email: str) -> str | None:
+        stored = self.client.get(self.PREFIX + email)
+        return stored.decode() if stored is not None else None
+
+    def consume(self, email: str, otp: str) -> OTPCheckType:
+        # atomic, so an otp saved in between is never deleted,
+        # and only one of concurrent verifications gets the stored otp
+        stored = self.client.getdel(self.PREFIX + email)
+        if stored is None or not constant_time_compare(stored.decode(), otp):
+            return "invalid"
+        return "valid"
+
+
+class DatabaseOTPStore:
+    """OTPs as `UserOTP` rows, when there is no redis.
+    Lookups use the partial index of pending OTPs, expired rows are removed by the `purgeotps` command.
+    """
+
+    def save(self, email: str, otp: str, ttl: int) -> None:
+        # previous OTPs can never be verified again, no need to keep them around
+        UserOTP.unfiltered_objects.filter(email=email).delete()
+        UserOTP.objects.create(
+            email=email, otp=otp, expiry_time=timezone.now() + timedelta(seconds=ttl)
+        )
+
+    def get(self, email: str) -> str | None:
+        return (
+            UserOTP.objects.filter(
+                email=email, is_verified=False, expiry_time__gte=timezone.now()
+            )
+            .values_list("otp", flat=True)
+            .last()
+        )
+
+    def consume(self, email: str, otp: str) -> OTPCheckType:
+        pending = UserOTP.objects.filter(email=email, otp=otp, is_verified=False)
+        # single statement, so that concurrent verifications can not both succeed
+        if pending.filter(expiry_time__gte=timezone.now()).update(is_verified=True):
+            return "valid"
+        return "expired" if pending.exists() else "invalid"
+
+
+_store: MemoryOTPStore | RedisOTPStore | DatabaseOTPStore | None = None
+
+
+def get_otp_store() -> MemoryOTPStore | RedisOTPStore | DatabaseOTPStore:
+    "Store of the `OTP_STORE` setting: `memory`, `redis` (at `OTP_STORE_URL`) or `database`."
+    global _store
+    if _store is None:
+        backend = getattr(settings, "OTP_STORE", "database")
+        if backend == "memory":
+            _store = MemoryOTPStore()
+        elif backend == "redis":
+            url = getattr(settings, "OTP_STORE_URL", None)
+            if url is None:
+                raise ImproperlyConfigured(
+                    "`OTP_STORE_URL` must be set to use the redis otp store."
+                )
+            _store = RedisOTPStore(url)
+        else:
+            _store = DatabaseOTPStore()
+    return _store
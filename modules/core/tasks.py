@@ -0,0 +1,29 @@
+from django.core.mail import send_mail
+
+from kit.tasks.tasks import task
+from modules.core.stores import get_otp_store
+
+
+@task(max_retries=5)
+def send_otp_email(*, email: str, expiry_time: int) -> None:
+    # the otp is read from the store, it is never written to the outbox or the broker
+    otp = get_otp_store().get(email)
+    if otp is None:  # verified or expired in the meantime
+        return
+    send_mail(
+        subject="Your Berserk verification code",
+        message="Your verification code is %s, it expires in %s minutes."
+        % (otp, expiry_time),
+        from_email=None,
+        recipient_list=[email],
+    )
+
+
+@task(max_retries=5)
+def send_welcome_email(*, email: str, name: str) -> None:
+    send_mail(
+        subject="Welcome to Berserk",
+        message="Hi %s, your Berserk account is ready." % name,
+        from_email=None,
+        recipient_list=[email],
+    )
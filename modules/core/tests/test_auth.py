@@ -0,0 +1,70 @@
+import base64
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from kit.auth.tokens import issue_token
+from modules.core.models import User
+
+AUTH_URL = "/v1/core/auth/"
+SEND_OTP_URL = "/v1/core/send_otp/"
+
+
+class AuthTokensTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="secret", name="User"
+        )
+        self.client = APIClient()
+
+    def login(self, password: str = "secret", **params):
+        credentials = base64.b64encode(b"user@example.com:%s" % password.encode())
+        return self.client.post(
+            AUTH_URL,
+            QUERY_STRING="&".join("%s=%s" % item for item in params.items()),
+            HTTP_AUTHORIZATION="Basic %s" % credentials.decode(),
+        )
+
+    def test_login(self):
+        response = self.login()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["data"]["username"], "user@example.com")
+        self.assertIsNone(response.json()["data"]["tokens"])
+
+    def test_login_with_tokens(self):
+        response = self.login(tokens="true")
+        self.assertEqual(response.status_code, 201)
+        tokens = response.json()["data"]["tokens"]
+        self.assertEqual(set(tokens), {"access", "refresh", "expires_in"})
+
+        client = APIClient()
+        response = client.get(
+            AUTH_URL, HTTP_AUTHORIZATION="Bearer %s" % tokens["access"]
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["username"], "user@example.com")
+
+    def test_login_with_wrong_password(self):
+        response = self.login(password="wrong")
+        self.assertEqual(response.status_code, 409)
+
+    def test_invalid_token(self):
+        response = self.client.get(AUTH_URL, HTTP_AUTHORIZATION="Bearer invalid")
+        self.assertEqual(response.status_code, 401)
+
+    def test_stale_token_on_public_endpoints(self):
+        # a refresh token is never a valid access token
+        stale = "Bearer %s" % issue_token(self.user, "refresh")
+        self.client.credentials(HTTP_AUTHORIZATION=stale)
+        response = self.client.post(
+            SEND_OTP_URL, {"email": "user@example.com"}, format="json"
+        )
+        # refused by the handler (the email is taken), not by the authentication
+        self.assertEqual(response.status_code, 409)
+
+    def test_token_of_deleted_user(self):
+        token = "Bearer %s" % issue_token(self.user, "access")
+        User.objects.filter(pk=self.user.pk).delete()
+        response = self.client.get(AUTH_URL, HTTP_AUTHORIZATION=token)
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.test import TestCase
+
+from modules.core.models import MasterDropdown
+from modules.core.services.dropdown import DropdownService
+
+
+class DropdownServiceTestCase(TestCase):
+
+    def setUp(self):
+        self.root = MasterDropdown.objects.create(label="ROOT")
+        self.child = MasterDropdown.objects.create(label="child", parent=self.root)
+
+    def test_get_tree(self):
+        tree = DropdownService.get_tree("ROOT")
+        self.assertEqual([child["label"] for child in tree["children"]], ["child"])
+        self.assertIsNone(DropdownService.get_tree("MISSING"))
+
+    def test_get_tree_returns_copies(self):
+        DropdownService.get_tree("ROOT")["children"].clear()
+        self.assertEqual(len(DropdownService.get_tree("ROOT")["children"]), 1)
+
+    def test_uncommitted_rows_are_not_shared(self):
+        DropdownService.get_forest()
+        with transaction.atomic():
+            node = MasterDropdown.objects.create(label="new", parent=self.root)
+            self.assertIn(node.pk, DropdownService.get_forest().nodes)
+            # other threads keep building their forest from the committed rows
+            self.assertIsNot(DropdownService._forest, DropdownService.get_forest())
+            transaction.set_rollback(True)
+        self.assertNotIn(node.pk, DropdownService.get_forest().nodes)
+
+    def test_parent_list_falls_back_while_dirty(self):
+        # `setUp` wrote inside the transaction of the test case
+        with self.assertNumQueries(0):
+            self.assertIsNone(DropdownService.get_parent_list(self.child.pk))
+        DropdownService._local.dirty = False
+        self.assertEqual(
+            DropdownService.get_parent_list(self.child.pk),
+            [self.root.pk, self.child.pk],
+        )
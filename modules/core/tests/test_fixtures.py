@@ -0,0 +1,76 @@
+from django.test import TestCase
+
+from kit.fixtures.loader import load_rows, load_tree
+from modules.core.models import MasterDropdown, User
+
+
+def get_tree(depth: int, fan_out: int, prefix: str = "node"):
+    return [
+        {
+            "label": "%s-%s" % (prefix, index),
+            "children": (
+                get_tree(depth - 1, fan_out, "%s-%s" % (prefix, index))
+                if depth > 1
+                else []
+            ),
+        }
+        for index in range(fan_out)
+    ]
+
+
+def load(tree):
+    return load_tree(
+        MasterDropdown,
+        tree,
+        key="label",
+        values=lambda node, parent: {"label": node["label"]},
+        children=lambda node: node["children"],
+    )
+
+
+class LoadTreeTestCase(TestCase):
+
+    def test_is_idempotent(self):
+        tree = get_tree(depth=3, fan_out=3)
+        self.assertEqual(load(tree), {"created": 39, "updated": 0, "unchanged": 0})
+        self.assertEqual(load(tree), {"created": 0, "updated": 0, "unchanged": 39})
+        self.assertEqual(MasterDropdown.objects.count(), 39)
+
+    def test_queries_per_level(self):
+        tree = get_tree(depth=4, fan_out=3)
+        # per level, a select and a bulk insert, whatever the number of nodes (plus the savepoint)
+        with self.assertNumQueries(4 * 2 + 2):
+            load(tree)
+        # per level, a select
+        with self.assertNumQueries(4 + 2):
+            load(tree)
+
+
+class LoadRowsTestCase(TestCase):
+
+    def test_before_create_runs_for_new_rows(self):
+        User.objects.create_user(email="old@example.com", password=None, name="Old")
+        created = []
+
+        def before_create(users):
+            created.extend(user.email for user in users)
+
+        rows = [
+            {"email": "old@example.com", "name": "Renamed"},
+            {"email": "new@example.com", "name": "New"},
+        ]
+        report = load_rows(
+            User,
+            rows,
+            key="email",
+            update_fields=["name"],
+            before_create=before_create,
+        )
+        self.assertEqual(report, {"created": 1, "updated": 1, "unchanged": 0})
+        self.assertEqual(created, ["new@example.com"])
+        self.assertEqual(User.objects.get(email="old@example.com").name, "Renamed")
+
+        created.clear()
+        report = load_rows(User, rows, key="email", before_create=before_create)
+        self.assertEqual(report, {"created": 0, "updated": 0, "unchanged": 2})
+        self.assertEqual(created, [])
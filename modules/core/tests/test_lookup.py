@@ -0,0 +1,33 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from kit.cache.lookup import LookupTableCache
+from modules.core.models import MasterDropdown
+
+
+class LookupTableCacheTestCase(TestCase):
+
+    def get_cache(self, model: str = "core.MasterDropdown") -> LookupTableCache:
+        return LookupTableCache(
+            model,
+            fields=("label", "id"),
+            key=lambda row: row["label"],
+            value=lambda row: row["id"],
+            check_interval=0,
+        )
+
+    def test_reload_on_bump(self):
+        cache = self.get_cache()
+        self.assertEqual(dict(cache), {})
+        dropdown = MasterDropdown.objects.create(label="ROOT")
+        cache.bump()
+        self.assertEqual(dict(cache), {"ROOT": dropdown.pk})
+
+    def test_fallback_is_retried(self):
+        cache = self.get_cache()
+        with mock.patch.object(cache, "_load", return_value=None):
+            self.assertEqual(dict(cache), {})
+        dropdown = MasterDropdown.objects.create(label="ROOT")
+        # the counter did not move, the table is loaded anyway
+        self.assertEqual(dict(cache), {"ROOT": dropdown.pk})
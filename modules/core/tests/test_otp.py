@@ -0,0 +1,43 @@
+from django.core import mail
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from modules.core.models import Outbox
+from modules.core.services.otp import OTPService
+from modules.core.services.outbox import OutboxService
+from modules.core.stores import RedisOTPStore
+
+
+@override_settings(
+    OTP_STORE="database", TASK_BROKER="eager", OUTBOX_DISPATCH_ON_COMMIT=True
+)
+class OTPTestCase(TestCase):
+
+    def test_otp_is_mailed_but_not_kept_in_the_outbox(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            otp = OTPService.generate_otp(email="new@example.com")
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(otp, mail.outbox[0].body)
+        row = Outbox.unfiltered_objects.get()
+        self.assertIsNotNone(row.published_at)
+        self.assertNotIn(otp, str(row.kwargs))
+
+    def test_verified_otp_is_not_mailed(self):
+        otp = OTPService.generate_otp(email="new@example.com")
+        OTPService.verify_otp(email="new@example.com", otp=otp)
+
+        self.assertEqual(OutboxService.relay(), 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+
+class RedisOTPStoreTestCase(SimpleTestCase):
+
+    def test_consume(self):
+        store = RedisOTPStore("fake://otp-test")
+        store.save("a@example.com", "111111", ttl=60)
+        self.assertEqual(store.consume("a@example.com", "111111"), "valid")
+        self.assertEqual(store.consume("a@example.com", "111111"), "invalid")
+
+        store.save("a@example.com", "222222", ttl=60)
+        self.assertEqual(store.consume("a@example.com", "000000"), "invalid")
+        self.assertIsNone(store.get("a@example.com"))
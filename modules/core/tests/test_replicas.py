@@ -0,0 +1,50 @@
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from kit.db.routers import ReplicaRouter, ReplicaState, replica_state
+from kit.middleware.replicas import PIN_COOKIE, ReplicaRoutingMiddleware
+from modules.core.models import User
+
+
+class ReplicaRoutingTestCase(SimpleTestCase):
+
+    @override_settings(DATABASE_REPLICAS=["replica_0", "replica_1", "replica_2"])
+    def test_one_replica_per_request(self):
+        state = ReplicaState()
+        state.reads = True
+        token = replica_state.set(state)
+        try:
+            router = ReplicaRouter()
+            replicas = {router.db_for_read(User) for _ in range(20)}
+        finally:
+            replica_state.reset(token)
+        self.assertEqual(replicas, {state.replica})
+
+    def test_no_pin_without_replicas(self):
+        def view(request):
+            ReplicaRouter().db_for_write(User)
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(RequestFactory().post("/"))
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+        with override_settings(DATABASE_REPLICAS=["replica_0"]):
+            response = ReplicaRoutingMiddleware(view)(RequestFactory().post("/"))
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    def test_state_covers_streamed_bodies(self):
+        states = []
+
+        def rows():
+            for _ in range(2):
+                states.append(replica_state.get())
+                yield b"row"
+
+        def view(request):
+            return StreamingHttpResponse(rows())
+
+        response = ReplicaRoutingMiddleware(view)(RequestFactory().get("/"))
+        self.assertIsNone(replica_state.get())
+        self.assertEqual(b"".join(response.streaming_content), b"rowrow")
+        self.assertIsInstance(states[0], ReplicaState)
+        self.assertIs(states[0], states[1])
+        self.assertIsNone(replica_state.get())
@@ -0,0 +1,101 @@
+import time
+import uuid
+from typing import List
+
+from django.test import SimpleTestCase
+
+from kit.tasks import brokers
+from kit.tasks.brokers import LocalBroker
+from kit.tasks.tasks import TaskResult, task
+from kit.tasks.types import TaskMessageType
+from kit.tasks.worker import execute
+
+calls: List[str] = []
+
+
+@task("tests.record", max_retries=0)
+def record(value: str) -> str:
+    calls.append(value)
+    return value
+
+
+@task("tests.always_fails", max_retries=2, retry_delay=0)
+def always_fails() -> None:
+    calls.append("fail")
+    raise ValueError("always")
+
+
+@task("tests.fails_once", max_retries=2, retry_delay=60)
+def fails_once() -> None:
+    calls.append("fail")
+    if len(calls) == 1:
+        raise ValueError("once")
+
+
+def get_message(name: str, *args) -> TaskMessageType:
+    return {
+        "id": str(uuid.uuid4()),
+        "name": name,
+        "args": list(args),
+        "kwargs": {},
+        "attempt": 0,
+    }
+
+
+class LocalBrokerTestCase(SimpleTestCase):
+
+    def setUp(self):
+        calls.clear()
+        self.broker = LocalBroker()
+        # retries are published through `get_broker`
+        brokers._broker = self.broker
+        self.addCleanup(setattr, brokers, "_broker", None)
+
+    def test_messages_are_consumed_in_order(self):
+        self.broker.publish(get_message("tests.record", "later"), countdown=60)
+        for value in ("a", "b", "c"):
+            self.broker.publish(get_message("tests.record", value))
+
+        self.broker.consume(execute, burst=True)
+        self.assertEqual(calls, ["a", "b", "c"])
+        # the delayed message is still queued
+        self.assertEqual(len(self.broker), 1)
+
+    def test_retries_until_max_retries(self):
+        message = get_message("tests.always_fails")
+        self.broker.publish(message)
+
+        with self.assertLogs("kit.tasks.worker", "WARNING") as logs:
+            self.broker.consume(execute, burst=True)
+        self.assertEqual(calls, ["fail"] * 3)
+        self.assertEqual(
+            [record.levelname for record in logs.records],
+            ["WARNING", "WARNING", "ERROR"],
+        )
+        self.assertEqual(len(self.broker), 0)
+        state = TaskResult(message["id"]).state
+        self.assertEqual(state["status"], "failure")
+        self.assertEqual(state["attempts"], 3)
+        self.assertIn("always", state["error"])
+
+    def test_retries_are_delayed(self):
+        message = get_message("tests.fails_once")
+        self.broker.publish(message)
+
+        start = time.monotonic()
+        with self.assertLogs("kit.tasks.worker", "WARNING"):
+            self.broker.consume(execute, burst=True)
+        self.assertEqual(calls, ["fail"])
+        self.assertEqual(TaskResult(message["id"]).status, "retry")
+        # the retry waits for `retry_delay`, doubled on every further attempt
+        due, _, retry = self.broker._queue[0]
+        self.assertGreaterEqual(due - start, 60)
+        self.assertEqual(retry["attempt"], 1)
+        self.assertEqual(fails_once.get_retry_delay(2), 120)
+
+        self.broker._queue[0] = (start, *self.broker._queue[0][1:])
+        self.broker.consume(execute, burst=True)
+        self.assertEqual(calls, ["fail", "fail"])
+        state = TaskResult(message["id"]).state
+        self.assertEqual(state["status"], "success")
+        self.assertEqual(state["attempts"], 2)
@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import Throttled
+from rest_framework.test import APIRequestFactory
+
+from kit.views import throttling
+
+
+class ThrottlingTestCase(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(
+            throttling, "_backend", throttling.MemoryThrottleBackend()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def check(self, now: float, rate: str = "2/min"):
+        with mock.patch.object(throttling.time, "time", return_value=now):
+            throttling.check_rate("key", rate)
+
+    def test_limit(self):
+        self.check(0)
+        self.check(1)
+        with self.assertRaises(Throttled):
+            self.check(2)
+
+    def test_throttled_requests_are_not_counted(self):
+        for _ in range(4):
+            self.check(0, "4/min")
+        for _ in range(3):
+            with self.assertRaises(Throttled):
+                self.check(1, "4/min")
+        # only the allowed requests weigh on the next window
+        self.check(90, "4/min")
+
+    def test_retry_after_at_the_end_of_a_window(self):
+        self.check(58)
+        self.check(59)
+        with self.assertRaises(Throttled) as context:
+            self.check(59.5)
+        wait = context.exception.wait
+        # retrying after the wait is allowed, retrying just before is not
+        with self.assertRaises(Throttled):
+            self.check(59.5 + wait - 2)
+        self.check(59.5 + wait)
+
+    def test_forwarded_for_is_not_trusted_without_proxies(self):
+        request = APIRequestFactory().get(
+            "/", HTTP_X_FORWARDED_FOR="1.1.1.1", REMOTE_ADDR="2.2.2.2"
+        )
+        with mock.patch.object(throttling.api_settings, "NUM_PROXIES", None):
+            self.assertEqual(throttling.get_ident(request), "2.2.2.2")
+        with mock.patch.object(throttling.api_settings, "NUM_PROXIES", 1):
+            self.assertEqual(throttling.get_ident(request), "1.1.1.1")
@@ -0,0 +1,129 @@
+import shutil
+import tempfile
+from urllib.parse import parse_qs, urlparse
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from kit.auth.tokens import issue_token
+from modules.core.models import UploadBlob, UploadFile, User
+
+UPLOAD_URL = "/v1/core/upload/"
+DOWNLOAD_URL = "/v1/core/download/"
+
+
+class UploadTestCase(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = override_settings(
+            MEDIA_ROOT=media_root,
+            STORAGES={
+                "default": {"BACKEND": "kit.storage.backends.LocalStorage"},
+                "staticfiles": {
+                    "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+                },
+            },
+            UPLOAD_MAX_SIZE=1024,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.user = User.objects.create_user(
+            email="user@example.com", password="secret", name="User"
+        )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer %s" % issue_token(self.user, "access")
+        )
+
+    def upload(self, name: str, content: bytes, client: APIClient | None = None):
+        return (client or self.client).post(
+            UPLOAD_URL, {"file": SimpleUploadedFile(name, content)}, format="multipart"
+        )
+
+    def download(self, url: str):
+        response = APIClient().get(DOWNLOAD_URL, parse_qs(urlparse(url).query))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_upload_and_download(self):
+        response = self.upload("report.txt", b"content")
+        self.assertEqual(response.status_code, 201)
+        data = response.json()["data"]
+        self.assertEqual(data["size"], 7)
+
+        upload = UploadFile.objects.get(pk=data["id"])
+        self.assertEqual(upload.added_by_id, self.user.pk)
+
+        url = urlparse(data["url"])
+        self.assertEqual(url.path, DOWNLOAD_URL)
+        response = APIClient().get(DOWNLOAD_URL, parse_qs(url.query))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"content")
+
+    def test_download_with_invalid_token(self):
+        response = APIClient().get(DOWNLOAD_URL, {"token": "invalid"})
+        self.assertEqual(response.status_code, 409)
+
+    def test_upload_too_large(self):
+        response = self.upload("large.bin", b"x" * 2048)
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(UploadFile.objects.exists())
+
+    def test_upload_unauthenticated(self):
+        response = APIClient().post(
+            UPLOAD_URL,
+            {"file": SimpleUploadedFile("report.txt", b"content")},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_same_content_is_uploaded_per_user(self):
+        other = User.objects.create_user(
+            email="other@example.com", password="secret", name="Other"
+        )
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION="Bearer %s" % issue_token(other, "access")
+        )
+        first = self.upload("a.txt", b"content").json()["data"]
+        second = self.upload("b.txt", b"content", client).json()["data"]
+
+        self.assertNotEqual(first["id"], second["id"])
+        self.assertEqual(second["filename"], "b.txt")
+        self.assertEqual(UploadFile.objects.get(pk=second["id"]).added_by_id, other.pk)
+        self.assertIn("b.txt", self.download(second["url"])["Content-Disposition"])
+
+        blob = UploadBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(
+            set(blob.upload_files.values_list("file", flat=True)), {blob.file.name}
+        )
+
+    def test_release_keeps_content_until_last_reference(self):
+        first = self.upload("a.txt", b"content").json()["data"]
+        second = self.upload("b.txt", b"content").json()["data"]
+        storage = UploadBlob._meta.get_field("file").storage
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UploadFile.objects.filter(pk=first["id"]).delete()
+        blob = UploadBlob.objects.get()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertTrue(storage.exists(blob.file.name))
+        self.download(second["url"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UploadFile.objects.filter(pk=second["id"]).delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 0)
+        self.assertFalse(storage.exists(blob.file.name))
+
+        third = self.upload("c.txt", b"content").json()["data"]
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertEqual(
+            b"".join(self.download(third["url"]).streaming_content), b"content"
+        )
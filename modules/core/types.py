@@ -1,3 +1,20 @@
-from typing import Dict
+from typing import List, NamedTuple, Tuple, TypedDict
 
-CachedRolesType = Dict[str, int] | None
+
+class DropdownNodeType(NamedTuple):
+    id: int
+    label: str
+    parent_id: int | None
+    max_level: int
+    config: int
+    status: int
+    ancestors: Tuple[int, ...]  # root first, excluding the node itself
+    children: Tuple[int, ...]  # live children only
+
+
+class SerializedDropdownType(TypedDict):
+    id: int
+    label: str
+    max_level: int
+    config: int
+    children: List["SerializedDropdownType"]